@@ -0,0 +1,98 @@
+"""Bytes per entity of the slotted GModel records compared with the previous ``__dict__`` based entities.
+
+Runs against the in-process fake Sheets backend of :mod:`fake_sheets`, no Google account is needed::
+
+    python benchmark/entity_memory.py [rows]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_sheets import FakeSheets, install
+from godm import LoadPolicy
+from godm.field import BooleanField, DecimalField, IntegerField, StringField
+from godm.model import GModel
+
+HEADERS = ["Name", "Age", "Score", "Family", "City"]
+
+
+class Users(GModel):
+	name = StringField(name="Name")
+	age = IntegerField(name="Age")
+	score = DecimalField(name="Score")
+	is_family = BooleanField(name="Family")
+	city = StringField(name="City")
+
+	class Meta:
+		sheet_name = "Benchmark"
+		tab_name = "Users"
+		header_index = 1
+		load_policy = LoadPolicy.LAZY
+		snapshot = True
+
+
+class DictEntity(object):
+	"""Layout of an entity before the slotted records: fields, id, the merged raw row dict and errors"""
+
+	def __init__(self, row_id, row, fields):
+		data_keys = {index: row[index] for index in range(len(HEADERS))}
+		data_index = {HEADERS[index]: row[index] for index in range(len(HEADERS))}
+		for field, field_val in list(fields.items()):
+			setattr(self, field, field_val)
+		self.id = row_id + 1
+		self._data = {**data_keys, **data_index}
+		self._errors = dict()
+
+
+def measure(build) -> float:
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	entities = build()
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return (after - before) / len(entities)
+
+
+def main(rows: int):
+	values = [HEADERS] + [
+		[f"user {index}", str(20 + index % 50), f"{index % 100}.5", "TRUE" if index % 2 else "FALSE", f"city {index % 12}"]
+		for index in range(rows)
+	]
+	sheets = FakeSheets()
+	sheets.add_spreadsheet("Benchmark", {"Users": values})
+	install(sheets)
+	Users.manager.initialise_model()
+
+	snapshot = Users._snapshot
+	row_ids = list(snapshot.row_ids())
+	attrs = list(Users._meta)
+
+	def dict_entities():
+		entities = []
+		for row_id in row_ids:
+			row = snapshot.row_values(row_id)
+			fields = {attr: Users.manager.decode_field(attr, row_id, row)[0] for attr in attrs}
+			entities.append(DictEntity(row_id, row, fields))
+		return entities
+
+	def lazy_entities():
+		return [Users.manager.get_entity_from_id(row_id) for row_id in row_ids]
+
+	def decoded_entities():
+		entities = lazy_entities()
+		for entity in entities:
+			for attr in attrs:
+				getattr(entity, attr)
+		return entities
+
+	print(f"rows: {rows}")
+	print(f"dict entity, all fields decoded:    {measure(dict_entities):8.1f} bytes/entity")
+	print(f"slotted entity, nothing decoded:    {measure(lazy_entities):8.1f} bytes/entity")
+	print(f"slotted entity, all fields decoded: {measure(decoded_entities):8.1f} bytes/entity")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,335 @@
+"""In-process, deterministic stand-in for the gspread surface godm uses, with configurable latency and call
+accounting. Nothing leaves the process and no Google account is needed::
+
+    sheets = FakeSheets(latency=0.05)
+    sheets.add_spreadsheet("Benchmark", {"Users": [["Name", "Age"], ["Anil", "35"]]})
+    install(sheets)
+    ...
+    sheets.calls  # Counter of the requests made, by gspread method name
+"""
+import re
+import time
+from collections import Counter
+
+from godm import _auth
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files/"
+_A1 = re.compile(r"^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$")
+
+
+def _column_number(letters: str) -> int:
+	number = 0
+	for letter in letters:
+		number = number * 26 + ord(letter) - 64
+	return number
+
+
+def _whole_tab(a1: str) -> bool:
+	"""Whether a range is a tab name alone, e.g. ``'Users'``"""
+	return "!" not in a1 and (a1.startswith("'") or not _A1.match(a1))
+
+
+def _trimmed(row: list) -> list:
+	end = len(row)
+	while end and row[end - 1] == "":
+		end -= 1
+	return row[:end]
+
+
+def _cell_text(value: dict) -> str:
+	"""Cell text of a ``userEnteredValue`` as Sheets would show it"""
+	if not value:
+		return ""
+	if "boolValue" in value:
+		return "TRUE" if value["boolValue"] else "FALSE"
+	if "numberValue" in value:
+		number = value["numberValue"]
+		return str(int(number)) if float(number).is_integer() else str(number)
+	return str(next(iter(value.values())))
+
+
+def _entered(value) -> str:
+	"""Cell text of a value written with ``USER_ENTERED``: a leading quote keeps the rest as text, numbers are
+	parsed and shown back the way Sheets formats them
+	"""
+	text = "" if value is None else str(value)
+	if text.startswith("'"):
+		return text[1:]
+	try:
+		number = float(text)
+	except ValueError:
+		return text
+	return _cell_text({"numberValue": number}) if text.strip() and number == number else text
+
+
+def _input(rows: list, value_input_option: str) -> list:
+	if value_input_option != "USER_ENTERED":
+		return rows
+	return [[_entered(value) for value in row] for row in rows]
+
+
+class FakeResponse(object):
+
+	def __init__(self, payload: dict):
+		self.payload = payload
+		self.ok = True
+		self.status_code = 200
+
+	def json(self) -> dict:
+		return self.payload
+
+
+class CallLog(object):
+	"""Counts the requests and makes each of them take ``latency`` seconds"""
+
+	def __init__(self, latency: float = 0.0):
+		self.latency = latency
+		self.counts = Counter()
+
+	def record(self, name: str):
+		self.counts[name] += 1
+		if self.latency:
+			time.sleep(self.latency)
+
+	def total(self) -> int:
+		return sum(self.counts.values())
+
+	def reset(self):
+		self.counts = Counter()
+
+
+class FakeWorksheet(object):
+
+	def __init__(self, spreadsheet: "FakeSpreadsheet", worksheet_id: int, title: str, rows: list):
+		self.spreadsheet = spreadsheet
+		self.id = worksheet_id
+		self.title = title
+		self.rows = rows
+
+	def _width(self) -> int:
+		return max((len(row) for row in self.rows), default=0)
+
+	def _bounds(self, a1: str) -> tuple:
+		"""(first row, first column, last row, last column) of an A1 range, 1-based and inclusive"""
+		if _whole_tab(a1):
+			return 1, 1, max(len(self.rows), 1), self._width()
+		match = _A1.match(a1.split("!")[-1].replace("'", ""))
+		start_col, start_row, end_col, end_row = match.groups()
+		start_row = int(start_row) if start_row else 1
+		start_col = _column_number(start_col) if start_col else 1
+		if ":" not in match.group(0):
+			return start_row, start_col, start_row, start_col
+		end_row = int(end_row) if end_row else max(len(self.rows), start_row)
+		end_col = _column_number(end_col) if end_col else self._width()
+		return start_row, start_col, end_row, end_col
+
+	def _values(self, a1: str) -> list:
+		"""Values of a range the way the API returns them: trailing empty cells and rows left out"""
+		start_row, start_col, end_row, end_col = self._bounds(a1)
+		values = [
+			_trimmed(self.rows[row_index - 1][start_col - 1:end_col])
+			for row_index in range(start_row, min(end_row, len(self.rows)) + 1)
+		]
+		while values and not values[-1]:
+			values.pop()
+		return values
+
+	def _write(self, start_row: int, start_col: int, values: list):
+		for row_offset, row in enumerate(values):
+			while len(self.rows) < start_row + row_offset:
+				self.rows.append([])
+			target = self.rows[start_row + row_offset - 1]
+			for col_offset, value in enumerate(row):
+				while len(target) < start_col + col_offset:
+					target.append("")
+				target[start_col + col_offset - 1] = "" if value is None else str(value)
+		self.spreadsheet.touch()
+
+	def _append(self, rows: list) -> str:
+		start = len(self.rows) + 1
+		self.rows.extend(["" if value is None else str(value) for value in row] for row in rows)
+		self.spreadsheet.touch()
+		return f"'{self.title}'!A{start}:Z{len(self.rows)}"
+
+	def row_values(self, row_index: int) -> list:
+		self.spreadsheet.calls.record("row_values")
+		return _trimmed(list(self.rows[row_index - 1])) if row_index <= len(self.rows) else []
+
+	def col_values(self, col_index: int) -> list:
+		self.spreadsheet.calls.record("col_values")
+		return _trimmed([row[col_index - 1] if col_index <= len(row) else "" for row in self.rows])
+
+	def get_all_values(self) -> list:
+		self.spreadsheet.calls.record("get_all_values")
+		width = self._width()
+		return [list(row) + [""] * (width - len(row)) for row in self.rows]
+
+	def get(self, range_name: str) -> list:
+		self.spreadsheet.calls.record("get")
+		return self._values(range_name)
+
+	def batch_get(self, ranges: list, **kwargs) -> list:
+		self.spreadsheet.calls.record("batch_get")
+		return [self._values(a1) for a1 in ranges]
+
+	def batch_update(self, data: list, value_input_option: str = "RAW", **kwargs):
+		self.spreadsheet.calls.record("batch_update")
+		for value_range in data:
+			start_row, start_col, _, _ = self._bounds(value_range["range"])
+			self._write(start_row, start_col, _input(value_range["values"], value_input_option))
+
+	def append_rows(self, values: list, value_input_option: str = "RAW", **kwargs) -> dict:
+		self.spreadsheet.calls.record("append_rows")
+		return {"updates": {"updatedRange": self._append(_input(values, value_input_option))}}
+
+
+class FakeSpreadsheet(object):
+
+	def __init__(self, client: "FakeSheets", title: str, key: str, tabs: dict):
+		self.client = client
+		self.title = title
+		self.id = key
+		self.version = 0
+		self.opened_version = 0
+		self.tabs = [
+			FakeWorksheet(self, index, tab_name, [list(row) for row in rows])
+			for index, (tab_name, rows) in enumerate(list(tabs.items()))
+		]
+
+	@property
+	def calls(self) -> CallLog:
+		return self.client.calls
+
+	def touch(self):
+		self.version += 1
+
+	@property
+	def lastUpdateTime(self) -> str:
+		"""Modified time read when the spreadsheet was opened, gspread never updates it afterwards"""
+		return str(self.opened_version)
+
+	def _tab(self, key) -> FakeWorksheet:
+		for worksheet in self.tabs:
+			if key in (worksheet.id, worksheet.title):
+				return worksheet
+		raise KeyError(key)
+
+	def _tab_of(self, a1: str) -> FakeWorksheet:
+		if "!" in a1 or _whole_tab(a1):
+			return self._tab(a1.split("!")[0].strip("'").replace("''", "'"))
+		return self.tabs[0]
+
+	def fetch_sheet_metadata(self, params: dict = None) -> dict:
+		self.calls.record("fetch_sheet_metadata")
+		return {
+			"spreadsheetId": self.id,
+			"properties": {"title": self.title},
+			"sheets": [
+				{"properties": {"sheetId": worksheet.id, "title": worksheet.title, "index": worksheet.id}}
+				for worksheet in self.tabs
+			],
+		}
+
+	def worksheets(self) -> list:
+		self.calls.record("worksheets")
+		return list(self.tabs)
+
+	def worksheet(self, title: str) -> FakeWorksheet:
+		self.calls.record("worksheet")
+		return self._tab(title)
+
+	def values_batch_get(self, ranges: list, params: dict = None) -> dict:
+		self.calls.record("values_batch_get")
+		return {"spreadsheetId": self.id, "valueRanges": [
+			{"range": a1, "majorDimension": "ROWS", "values": self._tab_of(a1)._values(a1)} for a1 in ranges
+		]}
+
+	def values_batch_update(self, body: dict) -> dict:
+		self.calls.record("values_batch_update")
+		for value_range in body["data"]:
+			worksheet = self._tab_of(value_range["range"])
+			start_row, start_col, _, _ = worksheet._bounds(value_range["range"])
+			worksheet._write(start_row, start_col, _input(value_range["values"], body.get("valueInputOption")))
+		return dict()
+
+	def batch_update(self, body: dict) -> dict:
+		self.calls.record("batch_update")
+		for request in body["requests"]:
+			if "deleteDimension" in request:
+				target = request["deleteDimension"]["range"]
+				del self._tab(target["sheetId"]).rows[target["startIndex"]:target["endIndex"]]
+			elif "updateCells" in request:
+				start = request["updateCells"]["start"]
+				values = [
+					[_cell_text(cell.get("userEnteredValue")) for cell in row.get("values", [])]
+					for row in request["updateCells"]["rows"]
+				]
+				self._tab(start["sheetId"])._write(start["rowIndex"] + 1, start["columnIndex"] + 1, values)
+			elif "appendCells" in request:
+				self._tab(request["appendCells"]["sheetId"])._append([
+					[_cell_text(cell.get("userEnteredValue")) for cell in row.get("values", [])]
+					for row in request["appendCells"]["rows"]
+				])
+			else:
+				raise NotImplementedError(f"Unsupported request {list(request)}")
+		self.touch()
+		return {"replies": []}
+
+
+class FakeSheets(object):
+	"""Client holding the fake spreadsheets
+
+	Args:
+		latency (float, optional): Seconds every request takes. Defaults to 0.
+	"""
+
+	def __init__(self, latency: float = 0.0):
+		self.calls = CallLog(latency)
+		self.spreadsheets = dict()
+
+	def add_spreadsheet(self, title: str, tabs: dict, key: str = None) -> FakeSpreadsheet:
+		"""Adds a spreadsheet
+
+		Args:
+			title (str): Spreadsheet name
+			tabs (dict): tab name -> rows, the header row included
+			key (str, optional): Spreadsheet key. Defaults to one derived from the title.
+		"""
+		spreadsheet = FakeSpreadsheet(self, title, key or f"fake-{len(self.spreadsheets)}", tabs)
+		self.spreadsheets[title] = spreadsheet
+		return spreadsheet
+
+	def _by_key(self, key: str) -> FakeSpreadsheet:
+		for spreadsheet in list(self.spreadsheets.values()):
+			if spreadsheet.id == key:
+				return spreadsheet
+		raise KeyError(key)
+
+	def open(self, title: str) -> FakeSpreadsheet:
+		self.calls.record("open")
+		spreadsheet = self.spreadsheets[title]
+		spreadsheet.opened_version = spreadsheet.version
+		return spreadsheet
+
+	def open_by_key(self, key: str) -> FakeSpreadsheet:
+		self.calls.record("open_by_key")
+		spreadsheet = self._by_key(key)
+		spreadsheet.opened_version = spreadsheet.version
+		return spreadsheet
+
+	def request(self, method: str, endpoint: str, params: dict = None, **kwargs) -> FakeResponse:
+		"""Answers the Drive ``files.get`` metadata request with the live modified time"""
+		if method != "get" or not endpoint.startswith(DRIVE_FILES_URL):
+			raise NotImplementedError(f"Unsupported request {method} {endpoint}")
+		self.calls.record("drive_files_get")
+		return FakeResponse({"modifiedTime": str(self._by_key(endpoint[len(DRIVE_FILES_URL):]).version)})
+
+
+def install(sheets: FakeSheets):
+	"""Makes godm use the fake client, forgetting the spreadsheets and worksheets opened before"""
+	with _auth._lock:
+		_auth._g_sheet = sheets
+		_auth._worksheets.clear()
+		_auth._spreadsheets.clear()
+		_auth._tabs.clear()
+		_auth._tab_ids.clear()
@@ -0,0 +1,162 @@
+"""Benchmark suite: wall time, Sheets API calls and peak memory of the main read paths, against the in-process
+fake Sheets backend of :mod:`fake_sheets`. No Google account is needed::
+
+    python benchmark/run.py [--rows 1000 100000 1000000] [--latency 0.05] [--cases filter get] [--no-memory]
+
+Every case runs on a freshly declared model, once without and once with ``snapshot = True``. Peak memory is
+measured with tracemalloc on a second run of the case, so it doesn't slow down the timed one.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_sheets import FakeSheets, install
+from godm import LoadPolicy, warmup
+from godm._columns import build_column
+from godm.field import BooleanField, DateField, DecimalField, IntegerField, ListField, StringField
+from godm.model import GModel
+
+HEADERS = ["Name", "Age", "Score", "Family", "Joined", "Tags", "City"]
+DEFAULT_ROWS = [1000, 100000]
+
+
+def sheet_rows(rows: int) -> list:
+	"""Deterministic tab content, with a few empty and invalid cells like real sheets have"""
+	values = [HEADERS]
+	for index in range(rows):
+		values.append([
+			f"user {index}",
+			str(18 + index % 60) if index % 97 else "NA",
+			f"{index % 100}.{index % 10}",
+			"TRUE" if index % 3 else "FALSE",
+			f"{index % 12 + 1:02d}/{index % 28 + 1:02d}/20{index % 24:02d}",
+			f"tag{index % 5},tag{index % 7}" if index % 11 else "",
+			f"city {index % 40}",
+		])
+	return values
+
+
+def declare_model(use_snapshot: bool) -> type:
+	"""A new model class, so every case loads from scratch"""
+
+	class Users(GModel):
+		name = StringField(name="Name")
+		age = IntegerField(name="Age", allow_empty_or_null=True)
+		score = DecimalField(name="Score")
+		is_family = BooleanField(name="Family")
+		joined = DateField(name="Joined")
+		tags = ListField(name="Tags", allow_empty_or_null=True)
+		city = StringField(name="City")
+
+		class Meta:
+			sheet_name = "Benchmark"
+			tab_name = "Users"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = use_snapshot
+
+	return Users
+
+
+def case_warmup(model: type, values: list):
+	warmup([model])
+
+
+def case_filter(model: type, values: list):
+	model.manager.initialise_model()
+	return len(list(model.manager.filter(age__gte=40, is_family=True, city="city 7")))
+
+
+def case_get(model: type, values: list):
+	model.manager.initialise_model()
+	return model.manager.get(name=f"user {(len(values) - 1) // 2}")
+
+
+def case_iterate(model: type, values: list):
+	"""Every entity with every field decoded"""
+	model.manager.initialise_model()
+	attrs = list(getattr(model, "_meta"))
+	count = 0
+	for entity in model.manager.query():
+		for attr in attrs:
+			getattr(entity, attr)
+		count += 1
+	return count
+
+
+def case_decode(model: type, values: list):
+	"""Field decoding alone: every column parsed from its raw cells"""
+	model.manager.initialise_model()
+	for field in list(getattr(model, "_meta").values()):
+		column_index = field._meta.get("index")
+		build_column(field, (row[column_index] for row in values[1:]))
+
+
+CASES = {
+	"warmup": case_warmup,
+	"filter": case_filter,
+	"get": case_get,
+	"iterate": case_iterate,
+	"decode": case_decode,
+}
+
+
+def run_case(case, values: list, snapshot: bool, latency: float, memory: bool) -> tuple:
+	"""Runs a case on fresh sheets and a fresh model
+
+	Returns:
+		tuple: (seconds, API calls, peak memory in bytes or None)
+	"""
+
+	def prepare() -> tuple:
+		sheets = FakeSheets(latency=latency)
+		sheets.add_spreadsheet("Benchmark", {"Users": values})
+		install(sheets)
+		return sheets, declare_model(snapshot)
+
+	sheets, model = prepare()
+	gc.collect()
+	started = time.perf_counter()
+	case(model, values)
+	seconds = time.perf_counter() - started
+	calls = sheets.calls.total()
+
+	peak = None
+	if memory:
+		_, model = prepare()
+		gc.collect()
+		tracemalloc.start()
+		case(model, values)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+
+	return seconds, calls, peak
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+	parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="tab sizes, e.g. 1000 1000000")
+	parser.add_argument("--latency", type=float, default=0.0, help="seconds every API call takes")
+	parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+	parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the peak memory runs")
+	args = parser.parse_args()
+
+	print(f"{'case':<10}{'rows':>10}  {'mode':<10}{'seconds':>10}{'calls':>8}{'peak MiB':>10}")
+	for rows in args.rows:
+		values = sheet_rows(rows)
+		for name in args.cases:
+			for snapshot in (False, True):
+				seconds, calls, peak = run_case(CASES[name], values, snapshot, args.latency, args.memory)
+				peak = f"{peak / 2 ** 20:10.1f}" if peak is not None else f"{'-':>10}"
+				mode = "snapshot" if snapshot else "live"
+				print(f"{name:<10}{rows:>10}  {mode:<10}{seconds:>10.3f}{calls:>8}{peak}")
+
+
+if __name__ == "__main__":
+	main()
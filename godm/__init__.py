@@ -1,7 +1,17 @@
 __version__ = "2.0"
 __author__ = "Devendra Pratap Singh"
 
-from . import exceptions, field, iterator, model, transformers
+from . import aggregates, backends, exceptions, field, instrumentation, iterator, model, query, transformers
+from ._async import AsyncGModelManager, aload
+from ._cache import set_cache_dir
+from ._loader import load_all
 from ._manager import LoadPolicy, GModelManager
+from ._scheduler import set_rate_limits
+from ._session import Session, session
+from ._warmup import warmup
+from .query import Q, QuerySet
 
-__all__ = ["exceptions", "field", "iterator", "model", "transformers", "LoadPolicy", "GModelManager"]
+__all__ = [
+	"aggregates", "backends", "exceptions", "field", "instrumentation", "iterator", "model", "query", "transformers", "LoadPolicy", "GModelManager",
+	"AsyncGModelManager", "aload", "load_all", "warmup", "set_cache_dir", "Session", "session", "set_rate_limits", "Q", "QuerySet"
+]
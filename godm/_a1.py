@@ -0,0 +1,65 @@
+import re
+
+_RANGE = re.compile(r"^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$")
+
+
+def column_letter(col_index: int) -> str:
+	"""Converts a 1-based column number into its A1 letters, e.g. ``28`` -> ``AB``"""
+	letters = ""
+	while col_index > 0:
+		col_index, remainder = divmod(col_index - 1, 26)
+		letters = chr(65 + remainder) + letters
+	return letters
+
+
+def cell(row_index: int, col_index: int) -> str:
+	return f"{column_letter(col_index)}{row_index}"
+
+
+def rows_range(start_row: int, end_row: int) -> str:
+	return f"{start_row}:{end_row}"
+
+
+def whole_tab(tab_name: str) -> str:
+	"""A1 notation of a whole tab, its quoted name, e.g. ``'My Tab'``"""
+	quoted = tab_name.replace("'", "''")
+	return f"'{quoted}'"
+
+
+def absolute(tab_name: str, a1: str) -> str:
+	"""Prefixes an A1 notation with its quoted tab name, e.g. ``'My Tab'!A1:B2``"""
+	return f"{whole_tab(tab_name)}!{a1}"
+
+
+def range_start_row(a1: str) -> int:
+	"""First row number of an A1 range like ``'Users'!A12:D15``"""
+	start = a1.split("!")[-1].split(":")[0]
+	digits = "".join(char for char in start if char.isdigit())
+	return int(digits) if digits else None
+
+
+def column_number(letters: str) -> int:
+	"""Converts A1 column letters into the 1-based column number, e.g. ``AB`` -> ``28``"""
+	number = 0
+	for letter in letters:
+		number = number * 26 + ord(letter) - 64
+	return number
+
+
+def parse_range(a1: str) -> tuple:
+	"""Bounds of an A1 range, tab name prefix allowed, e.g. ``B2:B`` -> ``(2, 2, None, 2)``
+
+	Returns:
+		tuple: (first row, first column, last row, last column), 1-based and inclusive, None for an open end
+	"""
+	match = _RANGE.match(a1.split("!")[-1].replace("$", ""))
+	if match is None:
+		raise ValueError(f"Unsupported A1 range {a1}")
+	start_col, start_row, end_col, end_row = match.groups()
+	start_row = int(start_row) if start_row else 1
+	start_col = column_number(start_col) if start_col else 1
+	if ":" not in a1.split("!")[-1]:
+		return start_row, start_col, start_row, start_col
+	return (
+		start_row, start_col, int(end_row) if end_row else None, column_number(end_col) if end_col else None,
+	)
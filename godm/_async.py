@@ -0,0 +1,56 @@
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING
+
+from ._loader import batches, load_batch
+
+if TYPE_CHECKING:
+	from ._manager import GModelManager
+	from .iterator import GIterator
+	from .model import GModel
+
+
+async def run_blocking(method, *args, **kwargs):
+	"""Runs a blocking godm/gspread call in the running loop's default executor"""
+	loop = asyncio.get_running_loop()
+	return await loop.run_in_executor(None, partial(method, *args, **kwargs))
+
+
+class AsyncGModelManager(object):
+	"""asyncio counterpart of :class:`godm.GModelManager`, available on every model as ``amanager``.
+
+	The Google Sheets calls are still made by gspread's synchronous client, but on executor threads, so the
+	event loop is not blocked and several models can load concurrently with :func:`asyncio.gather`.
+	"""
+
+	def __init__(self, manager: "GModelManager"):
+		self.manager = manager
+
+	async def load(self) -> None:
+		"""Loads the model (spreadsheet, worksheet, headers and snapshot) regardless of its load policy"""
+		await run_blocking(self.manager._setup_attrs)
+
+	async def initialise_model(self) -> None:
+		await run_blocking(self.manager.initialise_model)
+
+	async def reload_model(self) -> None:
+		await run_blocking(self.manager.reload_model)
+
+	async def get(self, **kwargs) -> "GModel":
+		return await run_blocking(self.manager.get, **kwargs)
+
+	async def filter(self, **kwargs) -> "GIterator":
+		return await run_blocking(self.manager.filter, **kwargs)
+
+	async def get_entity_from_id(self, row_index) -> "GModel":
+		return await run_blocking(self.manager.get_entity_from_id, row_index)
+
+
+async def aload(*models) -> None:
+	"""Loads several models concurrently, the models sharing a Google spreadsheet together, see
+	:func:`godm.load_all`
+
+	Args:
+		*models (GModel): Model classes to load
+	"""
+	await asyncio.gather(*(run_blocking(load_batch, batch) for batch in batches(models)))
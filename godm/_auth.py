@@ -1,53 +1,162 @@
 import json
 import os
+import threading
 
 import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+from ._cache import cache_dir, read_sheet_key, write_sheet_key
+from ._scheduler import ScheduledClient
+from .instrumentation import cache_lookup
 
 _g_sheet = None
+# spreadsheets by name and alias
 _worksheets = dict()
+# spreadsheets by key, worksheets by (spreadsheet key, worksheet id) and worksheet ids by (spreadsheet key, title)
+_spreadsheets = dict()
+_tabs = dict()
+_tab_ids = dict()
+
+_lock = threading.RLock()
+_open_locks = dict()
 
 ENV_SYSTEM_KEY_PATH = "GODM_AUTH_KEY_PATH"
+DEFAULT_POOL_SIZE = 10
+
+_pool_size = DEFAULT_POOL_SIZE
 
 
-def authenticate(key_object: object = None, key_path: str = None) -> None:
+class PooledClient(ScheduledClient):
+	"""Client with an HTTP session per thread, as ``requests.Session`` isn't safe to share between threads.
+	Every session keeps its connections alive, up to the configured pool size per host
+	"""
+
+	@property
+	def session(self):
+		local = self.__dict__.get("_local")
+		session = getattr(local, "session", None) if local is not None else None
+		if session is None:
+			session = AuthorizedSession(self.auth)
+			self.session = session
+		return session
+
+	@session.setter
+	def session(self, session):
+		with _lock:
+			local = self.__dict__.setdefault("_local", threading.local())
+		if session is not None:
+			adapter = HTTPAdapter(pool_connections=_pool_size, pool_maxsize=_pool_size)
+			session.mount("https://", adapter)
+		# the session gspread creates on init serves the thread that created the client
+		local.session = session
+
+
+def authenticate(key_object: object = None, key_path: str = None, pool_size: int = DEFAULT_POOL_SIZE) -> None:
 	"""Authenticates the access token against the Google Sheet API
 
 	Args:
 		key_object (object, optional): JSON Object contains the whole generated access key. Defaults to None.
 		key_path (str, optional): Path of the Access key file. Defaults to None.
+		pool_size (int, optional): Kept-alive connections per thread. Defaults to 10.
 
 	If none of the parameters are passed, it will look for ENV variable named GODM_AUTH_KEY_PATH to look for file path
 	"""
 
-	global _g_sheet
+	global _g_sheet, _pool_size
 
 	if not key_object or not isinstance(key_object, object):
 		if not key_path or not os.path.exists(key_path):
 			key_path = os.environ.get(ENV_SYSTEM_KEY_PATH)
 			key_object = json.load(open(key_path))
 
-	_g_sheet = gspread.service_account_from_dict(key_object)
+	_pool_size = pool_size
+	credentials = Credentials.from_service_account_info(key_object, scopes=gspread.auth.DEFAULT_SCOPES)
+	# built directly rather than through a gspread factory, every request of the client goes through the rate
+	# limiting scheduler
+	_g_sheet = PooledClient(auth=credentials)
+
+
+def _open(sheet_name: str):
+	"""Opens a spreadsheet by the key remembered in the disk cache when there is one, which avoids the Drive
+	search that opening by name performs
+	"""
+	sheet_key = read_sheet_key(sheet_name)
+	if cache_dir():
+		cache_lookup("sheet_key", bool(sheet_key), sheet=sheet_name)
+	if sheet_key:
+		try:
+			return _g_sheet.open_by_key(sheet_key)
+		except (gspread.exceptions.SpreadsheetNotFound, gspread.exceptions.APIError):
+			pass
+
+	spreadsheet = _g_sheet.open(sheet_name)
+	write_sheet_key(sheet_name, spreadsheet.id)
+	return spreadsheet
+
 
+def _open_lock(name: str) -> threading.Lock:
+	"""Lock per spreadsheet, so each is opened once while other spreadsheets open in parallel"""
+	with _lock:
+		return _open_locks.setdefault(name, threading.Lock())
 
-def get_sheet(sheet_name: str):
+
+def _remember(spreadsheet):
+	with _lock:
+		return _spreadsheets.setdefault(spreadsheet.id, spreadsheet)
+
+
+def get_sheet(sheet_name: str, sheet_key: str = None):
 	"""Fetches the Google Sheet object from already cached list or else creates the new object and store in catch
 
 	Args:
 		sheet_name (str): Sheet name
+		sheet_key (str, optional): Spreadsheet key, opens it without the Drive search by name. Defaults to None.
 
 	Returns:
 		:class:`gspread.models.Spreadsheet`: instance
 	"""
 
-	if not _g_sheet:
-		authenticate()
+	with _lock:
+		if not _g_sheet:
+			authenticate()
 
-	if not _worksheets.get(sheet_name, None):
-		_worksheets[sheet_name] = _g_sheet.open(sheet_name)
+	if sheet_key:
+		with _open_lock(sheet_key):
+			cache_lookup("spreadsheet", sheet_key in _spreadsheets, sheet=sheet_key)
+			if sheet_key not in _spreadsheets:
+				_remember(_g_sheet.open_by_key(sheet_key))
+		return _spreadsheets[sheet_key]
+
+	with _open_lock(sheet_name):
+		cache_lookup("spreadsheet", bool(_worksheets.get(sheet_name, None)), sheet=sheet_name)
+		if not _worksheets.get(sheet_name, None):
+			_worksheets[sheet_name] = _remember(_open(sheet_name))
 
 	return _worksheets.get(sheet_name)
 
 
+def get_worksheet(spreadsheet, title: str):
+	"""Fetches a worksheet from the cache. The first lookup in a spreadsheet caches all its worksheets with one
+	metadata request
+
+	Returns:
+		:class:`gspread.models.Worksheet`: instance
+	"""
+	with _open_lock(spreadsheet.id):
+		cache_lookup("worksheet", (spreadsheet.id, title) in _tab_ids, sheet=spreadsheet.id, tab=title)
+		if (spreadsheet.id, title) not in _tab_ids:
+			for worksheet in spreadsheet.worksheets():
+				_tabs[(spreadsheet.id, worksheet.id)] = worksheet
+				_tab_ids[(spreadsheet.id, worksheet.title)] = worksheet.id
+
+	worksheet_id = _tab_ids.get((spreadsheet.id, title))
+	if worksheet_id is None:
+		raise gspread.exceptions.WorksheetNotFound(title)
+	return _tabs[(spreadsheet.id, worksheet_id)]
+
+
 def load_sheet(sheet_name: str, alias: str = "default") -> None:
 	"""Load the Google Sheet object for later use. It creates the :class:`gspread.models.Spreadsheet` instance
 	and catches it along with alias name as well
@@ -56,10 +165,12 @@ def load_sheet(sheet_name: str, alias: str = "default") -> None:
 		sheet_name (str): Google Sheet Tab Name
 		alias (str, optional): Addition name to catch the instance. Defaults to "default".
 	"""
-	if not _g_sheet:
-		authenticate()
+	with _lock:
+		if not _g_sheet:
+			authenticate()
 
-	_worksheets[sheet_name] = _g_sheet.open(sheet_name)
+	with _open_lock(sheet_name):
+		_worksheets[sheet_name] = _remember(_open(sheet_name))
 
 	if alias:
 		_worksheets[alias] = _worksheets[sheet_name]
@@ -0,0 +1,128 @@
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+ENV_CACHE_DIR = "GODM_CACHE_DIR"
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files/{}"
+PICKLE_PROTOCOL = 5
+SHEET_KEYS_FILE = "sheet_keys.json"
+
+_cache_dir = None
+_lock = threading.Lock()
+
+
+def set_cache_dir(path: str = None) -> None:
+	"""Enables the on-disk snapshot cache. Snapshots are kept as pickle files, so only point it at a directory
+	that nobody else can write to
+
+	Args:
+		path (str, optional): Cache directory, ``None`` disables the cache. If it is never set, the ENV variable
+			named GODM_CACHE_DIR is used
+	"""
+	global _cache_dir
+
+	if path:
+		os.makedirs(path, exist_ok=True)
+	_cache_dir = path
+
+
+def cache_dir() -> str:
+	path = _cache_dir or os.environ.get(ENV_CACHE_DIR)
+	if path and not os.path.isdir(path):
+		os.makedirs(path, exist_ok=True)
+	return path
+
+
+def sheet_version(spreadsheet) -> str:
+	"""Cheap freshness probe: the spreadsheet's Drive ``modifiedTime``, one small metadata request. gspread's
+	``lastUpdateTime`` property is only read when the spreadsheet is opened, so it is never used
+
+	Returns:
+		str: modified time, or None when it can't be fetched
+	"""
+	try:
+		if hasattr(spreadsheet, "get_lastUpdateTime"):
+			return spreadsheet.get_lastUpdateTime()
+		response = spreadsheet.client.request(
+			"get", DRIVE_FILES_URL.format(spreadsheet.id), params={"fields": "modifiedTime"}
+		)
+		return response.json().get("modifiedTime")
+	# a failed probe only means the snapshot is fetched again
+	except Exception:
+		return None
+
+
+def _snapshot_path(directory: str, spreadsheet_id: str, worksheet_id, header_index: int) -> str:
+	return os.path.join(directory, f"{spreadsheet_id}-{worksheet_id}-{header_index}.snapshot")
+
+
+def read_snapshot(spreadsheet_id: str, worksheet_id, header_index: int, version: str):
+	"""Reads cached worksheet values. The version is stored ahead of the values, so a stale file is given up
+	without unpickling them
+
+	Returns:
+		list: worksheet values, or None when nothing fresh is cached for this version
+	"""
+	directory = cache_dir()
+	if not directory or version is None:
+		return None
+
+	path = _snapshot_path(directory, spreadsheet_id, worksheet_id, header_index)
+	try:
+		with open(path, "rb") as cache_file:
+			if pickle.load(cache_file) != version:
+				return None
+			return pickle.load(cache_file)
+	except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+		return None
+
+
+def write_snapshot(spreadsheet_id: str, worksheet_id, header_index: int, version: str, values: list) -> None:
+	directory = cache_dir()
+	if not directory or version is None:
+		return
+
+	path = _snapshot_path(directory, spreadsheet_id, worksheet_id, header_index)
+
+	# write aside and swap in, readers never see a half written file
+	file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+	try:
+		with os.fdopen(file_descriptor, "wb") as cache_file:
+			pickle.dump(version, cache_file, protocol=PICKLE_PROTOCOL)
+			pickle.dump(values, cache_file, protocol=PICKLE_PROTOCOL)
+		os.replace(temp_path, path)
+	except OSError:
+		if os.path.exists(temp_path):
+			os.remove(temp_path)
+
+
+def _read_sheet_keys(directory: str) -> dict:
+	try:
+		with open(os.path.join(directory, SHEET_KEYS_FILE)) as keys_file:
+			return json.load(keys_file)
+	except (OSError, ValueError):
+		return dict()
+
+
+def read_sheet_key(sheet_name: str) -> str:
+	"""Spreadsheet key remembered for a spreadsheet name, so it can be opened by key without a Drive search"""
+	directory = cache_dir()
+	if not directory:
+		return None
+	return _read_sheet_keys(directory).get(sheet_name)
+
+
+def write_sheet_key(sheet_name: str, key: str) -> None:
+	directory = cache_dir()
+	if not directory:
+		return
+
+	with _lock:
+		sheet_keys = _read_sheet_keys(directory)
+		if sheet_keys.get(sheet_name) == key:
+			return
+		sheet_keys[sheet_name] = key
+		with open(os.path.join(directory, SHEET_KEYS_FILE), "w") as keys_file:
+			json.dump(sheet_keys, keys_file)
@@ -0,0 +1,487 @@
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from ._decoder import decoder_for
+from .field import BooleanField, CustomField, DateField, DecimalField, IntegerField, ListField, StringField
+from .instrumentation import timed
+
+if TYPE_CHECKING:
+	from ._snapshot import Snapshot
+	from .field import Field
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# code of a lookup text that isn't in a categorical column's dictionary, it matches no row
+MISSING_CODE = -1
+
+# a StringField without ``categorical`` set is dictionary-encoded while its distinct values stay below this share
+# of its cells, checked on the first CATEGORICAL_SAMPLE cells and once the column is built
+CATEGORICAL_RATIO = 0.5
+CATEGORICAL_SAMPLE = 4096
+
+
+class Bitmap(object):
+	"""Growable bit array, one bit per row"""
+
+	__slots__ = ("bits", "size")
+
+	def __init__(self, size: int = 0):
+		self.bits = bytearray((size + 7) // 8)
+		self.size = size
+
+	def __len__(self):
+		return self.size
+
+	def __getitem__(self, index):
+		return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+	def __setitem__(self, index, value):
+		if value:
+			self.bits[index >> 3] |= 1 << (index & 7)
+		else:
+			self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+	def __iter__(self):
+		bits = self.bits
+		for index in range(self.size):
+			yield (bits[index >> 3] >> (index & 7)) & 1 == 1
+
+	def append(self, value):
+		if self.size & 7 == 0:
+			self.bits.append(0)
+		self.size += 1
+		if value:
+			self[self.size - 1] = True
+
+	def any(self):
+		return any(self.bits)
+
+
+class Column(object):
+	"""Parsed values of one field for every row of a snapshot.
+
+	Values of the field's own type are kept in ``values``. Rows whose value is missing, failed to parse or
+	is not of that type (e.g. a ``default_val`` of another type) are flagged in the ``nulls`` mask and their
+	value, if any, is kept aside in ``fallback``. Parse errors are kept per row in ``errors``.
+	"""
+
+	empty = None
+	numpy_dtype = None
+	operators = ("eq", "ct", "in")
+	# relative cost of scanning the column, the query planner evaluates cheap columns first
+	scan_cost = 3
+
+	def __init__(self, field: "Field"):
+		self.field = field
+		self.values = self._new_storage()
+		self.nulls = Bitmap()
+		self.fallback = dict()
+		self.errors = dict()
+
+	def _new_storage(self):
+		return []
+
+	def __len__(self):
+		return len(self.nulls)
+
+	def accepts(self, value) -> bool:
+		return value is not None
+
+	def to_storage(self, value):
+		return value
+
+	def from_storage(self, value):
+		return value
+
+	def to_search(self, value):
+		"""Converts a lookup value into the representation held in ``values``"""
+		return value
+
+	def fallback_search(self, value):
+		"""Converts a value kept in ``fallback`` like a lookup value, raising TypeError or ValueError when it can't
+		be, in which case it is compared as it is
+		"""
+		return self.to_search(value)
+
+	def scan_lookup(self, operator: str, search) -> tuple:
+		"""Lookup evaluated over ``values`` for a lookup on the column, for columns answering one through another
+
+		Returns:
+			tuple: (operator, lookup value)
+		"""
+		return operator, search
+
+	def append(self, value, error: str = None):
+		position = len(self.nulls)
+		if error is not None:
+			self.errors[position] = error
+
+		if self.accepts(value):
+			try:
+				self.values.append(self.to_storage(value))
+			except OverflowError:
+				pass
+			else:
+				self.nulls.append(False)
+				return
+
+		self.values.append(self.empty)
+		self.nulls.append(True)
+		if value is not None:
+			self.fallback[position] = value
+
+	def set(self, position: int, value, error: str = None):
+		self.fallback.pop(position, None)
+		self.errors.pop(position, None)
+		if error is not None:
+			self.errors[position] = error
+
+		if self.accepts(value):
+			try:
+				self.values[position] = self.to_storage(value)
+			except OverflowError:
+				pass
+			else:
+				self.nulls[position] = False
+				return
+
+		self.values[position] = self.empty
+		self.nulls[position] = True
+		if value is not None:
+			self.fallback[position] = value
+
+	def value(self, position: int):
+		if self.nulls[position]:
+			return self.fallback.get(position)
+		return self.from_storage(self.values[position])
+
+	def error(self, position: int):
+		return self.errors.get(position)
+
+
+class ListColumn(Column):
+	operators = ("eq", "ct")
+	scan_cost = 4
+
+	def __init__(self, field: "Field"):
+		super().__init__(field)
+		# every distinct item text is kept once, whatever the number of rows holding it
+		self.items = dict()
+
+	def to_storage(self, value):
+		if type(value) is not list:
+			return value
+		items = self.items
+		return [items.setdefault(item, item) if type(item) is str else item for item in value]
+
+	def from_storage(self, value):
+		# every entity gets its own list, so in-place edits can't leak into the store
+		return list(value)
+
+
+class Dictionary(object):
+	"""Distinct texts of a categorical column, by code. Codes are only ever added, so reloads of the column
+	share it and keep their codes
+	"""
+
+	__slots__ = ("texts", "codes")
+
+	def __init__(self):
+		self.texts = []
+		self.codes = dict()
+
+	def __len__(self):
+		return len(self.texts)
+
+	def encode(self, text: str) -> int:
+		code = self.codes.get(text)
+		if code is None:
+			# interned, so equal texts of all the models are one object
+			text = sys.intern(text)
+			code = self.codes[text] = len(self.texts)
+			self.texts.append(text)
+		return code
+
+
+class CategoricalColumn(Column):
+	"""Dictionary-encoded texts: ``values`` holds int codes into a :class:`Dictionary`, so each distinct text is
+	kept once and shared by every entity, and ``eq``/``in`` lookups compare codes. ``ct`` is evaluated on the
+	dictionary, then as an ``in`` lookup on the codes of the matching texts
+	"""
+
+	empty = MISSING_CODE
+	numpy_dtype = "int32"
+	scan_cost = 2
+
+	def __init__(self, field: "Field", dictionary: Dictionary = None):
+		super().__init__(field)
+		self.dictionary = dictionary if dictionary is not None else Dictionary()
+
+	def _new_storage(self):
+		return array("i")
+
+	def accepts(self, value) -> bool:
+		return type(value) is str
+
+	def append(self, value, error: str = None):
+		# the common case, a text already in the dictionary, without the generic checks
+		if error is None and type(value) is str:
+			code = self.dictionary.codes.get(value)
+			if code is not None:
+				self.values.append(code)
+				self.nulls.append(False)
+				return
+		super().append(value, error)
+
+	def to_storage(self, value):
+		return self.dictionary.encode(value)
+
+	def from_storage(self, value):
+		return self.dictionary.texts[value]
+
+	def to_search(self, value):
+		if isinstance(value, str):
+			return self.dictionary.codes.get(value, MISSING_CODE)
+		return MISSING_CODE
+
+	def fallback_search(self, value):
+		raise TypeError("values of another type have no code")
+
+	def scan_lookup(self, operator: str, search) -> tuple:
+		if operator == "ct":
+			if not isinstance(search, str):
+				return "in", []
+			return "in", [text for text in self.dictionary.texts if search in text]
+		return operator, search
+
+	def cardinality(self) -> int:
+		"""Number of distinct texts in the column"""
+		return len(set(self.values))
+
+	def decoded(self) -> Column:
+		"""The same values in a plain column"""
+		column = Column(self.field)
+		texts = self.dictionary.texts
+		column.values = [None if is_null else texts[code] for code, is_null in zip(self.values, self.nulls)]
+		column.nulls, column.fallback, column.errors = self.nulls, self.fallback, self.errors
+		return column
+
+
+class NumberColumn(Column):
+	operators = ("eq", "lt", "lte", "gt", "gte", "in", "range")
+	scan_cost = 2
+
+	def to_search(self, value):
+		if isinstance(value, str):
+			return float(value)
+		return value
+
+
+class IntegerColumn(NumberColumn):
+	empty = 0
+	numpy_dtype = "int64"
+
+	def _new_storage(self):
+		return array("q")
+
+	def accepts(self, value) -> bool:
+		return type(value) is int
+
+
+class DecimalColumn(NumberColumn):
+	empty = 0.0
+	numpy_dtype = "float64"
+
+	def _new_storage(self):
+		return array("d")
+
+	def accepts(self, value) -> bool:
+		return type(value) is float
+
+
+class BooleanColumn(Column):
+	empty = False
+	numpy_dtype = "bool"
+	operators = ("eq", "in")
+	scan_cost = 1
+
+	def _new_storage(self):
+		return Bitmap()
+
+	def accepts(self, value) -> bool:
+		return type(value) is bool
+
+	def to_search(self, value):
+		if isinstance(value, str):
+			return self.field.convert_to_val(value.lower())
+		return bool(value)
+
+
+class DateColumn(Column):
+	"""Dates are stored as microseconds since the epoch"""
+
+	empty = 0
+	numpy_dtype = "int64"
+	operators = ("eq", "lt", "lte", "gt", "gte", "in", "range")
+	scan_cost = 2
+
+	def _new_storage(self):
+		return array("q")
+
+	def accepts(self, value) -> bool:
+		return isinstance(value, datetime) and value.tzinfo is None
+
+	def to_storage(self, value):
+		return (value - EPOCH) // MICROSECOND
+
+	def from_storage(self, value):
+		return EPOCH + timedelta(microseconds=value)
+
+	def to_search(self, value):
+		if isinstance(value, str):
+			value = datetime.strptime(value, self.field._meta.get("date_format", DateField.MM_DD_YYYY))
+		elif isinstance(value, date) and not isinstance(value, datetime):
+			value = datetime(value.year, value.month, value.day)
+
+		if isinstance(value, datetime):
+			return self.to_storage(value.replace(tzinfo=None))
+		return value
+
+
+COLUMN_TYPES = (
+	(IntegerField, IntegerColumn),
+	(DecimalField, DecimalColumn),
+	(BooleanField, BooleanColumn),
+	(DateField, DateColumn),
+	(ListField, ListColumn),
+)
+
+
+def column_for(field: "Field", previous: Column = None, encoded: bool = True) -> Column:
+	"""Empty column of a field
+
+	Args:
+		field (Field): Field
+		previous (Column, optional): Column of the previous load, a categorical one shares its dictionary
+		encoded (bool, optional): False for a plain column even for a categorical field, e.g. when lookup values
+			are converted before the column is filled. Defaults to True.
+	"""
+	if encoded and isinstance(field, StringField) and field._meta.get("categorical") is not False:
+		return CategoricalColumn(field, previous.dictionary if isinstance(previous, CategoricalColumn) else None)
+
+	for field_type, column_type in COLUMN_TYPES:
+		if isinstance(field, field_type):
+			return column_type(field)
+	return Column(field)
+
+
+def parse_cell(field: "Field", cell_value):
+	"""Runs a single cell through the field
+
+	Returns:
+		tuple: (value, error message or None)
+	"""
+	try:
+		return decoder_for(field)(cell_value), None
+	# the field getters raise more than FieldException (e.g. ValueError from int())
+	except Exception as ex:
+		return None, str(ex)
+
+
+def _append_cells(column: Column, decode, cells):
+	append = column.append
+	for cell_value in cells:
+		try:
+			value = decode(cell_value)
+		except Exception as ex:
+			append(None, str(ex))
+		else:
+			append(value)
+
+
+def _settled(column: Column) -> Column:
+	"""An automatically encoded column, decoded back into a plain one once it has too many distinct texts"""
+	if isinstance(column, CategoricalColumn) and column.cardinality() > CATEGORICAL_RATIO * len(column):
+		return column.decoded()
+	return column
+
+
+def build_column(field: "Field", cells, previous: Column = None) -> Column:
+	"""Parses the cells of a field into its column
+
+	Args:
+		field (Field): Field
+		cells (iterable): Cell texts, one per row
+		previous (Column, optional): Column of the previous load, see :func:`column_for`
+	"""
+	column = column_for(field, previous)
+	decode = decoder_for(field)
+	with timed("decode", field_type=type(field).__name__, field=field.name) as attributes:
+		if isinstance(column, CategoricalColumn) and field._meta.get("categorical") is None:
+			cells = iter(cells)
+			_append_cells(column, decode, islice(cells, CATEGORICAL_SAMPLE))
+			column = _settled(column)
+			_append_cells(column, decode, cells)
+			column = _settled(column)
+		else:
+			_append_cells(column, decode, cells)
+		attributes["cells"] = len(column)
+	return column
+
+
+class CellColumns(dict):
+	"""Raw cells of several fields, keyed by field attribute. Each field is parsed into its column on first access"""
+
+	def __init__(self, fields: dict, cells: dict):
+		super().__init__()
+		self.fields = fields
+		self.cells = cells
+
+	def __missing__(self, attr: str) -> Column:
+		column = self[attr] = build_column(self.fields[attr], self.cells[attr])
+		return column
+
+	def parsed(self, attr: str) -> bool:
+		return dict.__contains__(self, attr)
+
+	def value(self, attr: str, position: int):
+		"""Value of one cell, parsing only that cell while the column isn't parsed"""
+		if self.parsed(attr):
+			return self[attr].value(position)
+		return parse_cell(self.fields[attr], self.cells[attr][position])[0]
+
+
+class ColumnStore(object):
+	"""Typed, pre-parsed columns of a snapshot, keyed by the model's field attribute.
+
+	:class:`godm.field.CustomField` works on the whole row, so it is never stored here and is still
+	computed per entity.
+	"""
+
+	def __init__(self, header_index: int):
+		self.header_index = header_index
+		self.columns = dict()
+
+	@classmethod
+	def build(cls, meta: dict, snapshot: "Snapshot", previous: "ColumnStore" = None) -> "ColumnStore":
+		store = cls(snapshot.header_index)
+		for attr, field in list(meta.items()):
+			if isinstance(field, CustomField):
+				continue
+
+			column_index = field._meta.get("index")
+			cells = (row[column_index] if column_index < len(row) else "" for row in snapshot.rows)
+			store.columns[attr] = build_column(field, cells, previous.get(attr) if previous is not None else None)
+
+		return store
+
+	def get(self, attr: str) -> Column:
+		return self.columns.get(attr)
+
+	def position(self, row_index: int) -> int:
+		"""Position inside the columns for a sheet row number"""
+		return row_index - self.header_index - 1
@@ -0,0 +1,223 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable
+
+from .exceptions import FieldException
+from .field import (
+	BooleanField, CustomField, DateField, DecimalField, Field, IntegerField, ListField, StringField,
+)
+from .transformers import transform_invalid_ref_to_none, transform_na_to_none
+
+NULL_MESSAGE = "null or empty was found and no default is set"
+
+# distinct texts each date field keeps parsed
+DATE_CACHE_SIZE = 4096
+
+
+def _na_to_none(value):
+	"""transform_invalid_ref_to_none and transform_na_to_none in one step"""
+	if not value or (isinstance(value, str) and value.lower() in ("#ref!", "na")):
+		return None
+	return value
+
+
+def _chain(transforms: list) -> Callable:
+	"""One callable running the transforms in order, None when there are none"""
+	transforms = list(transforms)
+	if transforms[:2] == [transform_invalid_ref_to_none, transform_na_to_none]:
+		transforms[:2] = [_na_to_none]
+
+	if not transforms:
+		return None
+	if len(transforms) == 1:
+		return transforms[0]
+
+	transforms = tuple(transforms)
+
+	def chained(value):
+		for transform in transforms:
+			value = transform(value)
+		return value
+
+	return chained
+
+
+# The body of each field's get_value, with its Meta options resolved once. A body gets the pre-transformed
+# value and the raw cell, and must raise exactly what get_value raises.
+
+def _string(field: StringField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val")
+
+	def body(value, raw):
+		if not value and not raw:
+			if allow_empty:
+				return default_val
+			raise FieldException(NULL_MESSAGE)
+
+		if not value and raw not in ("NA", "na", "#ref!", "#REF!"):
+			value = raw
+
+		if not value:
+			if allow_empty:
+				return default_val
+			raise FieldException(NULL_MESSAGE)
+		return str(value)
+
+	return body
+
+
+def _integer(field: IntegerField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val")
+
+	def body(value, raw):
+		if not value:
+			if allow_empty:
+				return default_val
+			raise FieldException(NULL_MESSAGE)
+		return int(float(value))
+
+	return body
+
+
+def _decimal(field: DecimalField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val")
+
+	def body(value, raw):
+		if not value and allow_empty:
+			return default_val
+		try:
+			return float(value)
+		except ValueError:
+			raise FieldException("Not a Number: {}".format(value))
+
+	return body
+
+
+def _boolean(field: BooleanField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val")
+	convert_to_val = field.convert_to_val
+
+	def body(value, raw):
+		if not value and allow_empty:
+			return default_val
+		return isinstance(value, str) and convert_to_val(value.lower())
+
+	return body
+
+
+def _date(field: DateField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val")
+	date_format = field._meta.get("date_format", DateField.MM_DD_YYYY)
+
+	# strptime dominates, and columns repeat the same dates a lot
+	@lru_cache(maxsize=DATE_CACHE_SIZE)
+	def parse(value):
+		return datetime.strptime(value, date_format)
+
+	def body(value, raw):
+		if not value and allow_empty:
+			return default_val
+		try:
+			return parse(value) if isinstance(value, str) else datetime.strptime(value, date_format)
+		except ValueError:
+			raise FieldException("Invalid Date Format: {}".format(value))
+
+	return body
+
+
+def _list(field: ListField) -> Callable:
+	allow_empty, default_val = field._meta.get("allow_empty_or_null"), field._meta.get("default_val", [])
+	delimiter = field._meta.get("delimiter", ",")
+	item_type = field._meta.get("item_type", str)
+
+	convert = str
+	if item_type is int:
+		convert = field._to_int
+	elif item_type is float:
+		convert = field._to_decimal
+
+	def body(value, raw):
+		if not value and allow_empty:
+			return default_val
+		return [convert(item.strip().strip('"\'')) for item in value.split(delimiter)]
+
+	return body
+
+
+# get_value implementation (the TransformDecorator itself, not the partial it binds to) -> body compiler.
+# A Field subclass overriding get_value gets the generic decoder
+COMPILERS = {
+	StringField.__dict__["get_value"]: _string,
+	IntegerField.__dict__["get_value"]: _integer,
+	DecimalField.__dict__["get_value"]: _decimal,
+	BooleanField.__dict__["get_value"]: _boolean,
+	DateField.__dict__["get_value"]: _date,
+	ListField.__dict__["get_value"]: _list,
+}
+
+
+def compile_field(field: Field) -> Callable:
+	"""Specialized ``cell text -> value`` of a field. It returns and raises what ``get_value`` does for a row
+	holding that cell, without the transform decorator's per call lookups and row dict
+	"""
+	compiler = COMPILERS.get(_get_value(type(field)))
+	if compiler is None or isinstance(field, CustomField):
+		name = field.name
+		return lambda raw: field.get_value({name: raw})
+
+	body = compiler(field)
+	pre = _chain(field._meta.get("pre_transform"))
+	post = _chain(field._meta.get("post_transform"))
+
+	if pre is not None and post is not None:
+		return lambda raw: post(body(pre(raw), raw))
+	if pre is not None:
+		return lambda raw: body(pre(raw), raw)
+	if post is not None:
+		return lambda raw: post(body(raw, raw))
+	return lambda raw: body(raw, raw)
+
+
+def _get_value(field_class: type):
+	for cls in field_class.__mro__:
+		if "get_value" in cls.__dict__:
+			return cls.__dict__["get_value"]
+	return None
+
+
+def decoder_for(field: Field) -> Callable:
+	"""Compiled decoder of a field, built on first use and again once the field is validated against new headers"""
+	decode = field._decode
+	if decode is None:
+		decode = field._decode = compile_field(field)
+	return decode
+
+
+class RowDecoder(object):
+	"""Per model decoder: the column index and compiled decoder of every field but the custom ones, built once
+	the model's headers are known
+
+	Args:
+		meta (dict): Validated fields of the model, by attribute
+	"""
+
+	def __init__(self, meta: dict):
+		self.attrs = tuple(attr for attr, field in list(meta.items()) if not isinstance(field, CustomField))
+		self.converters = tuple((meta[attr]._meta.get("index"), decoder_for(meta[attr])) for attr in self.attrs)
+		self._slots = {attr: slot for slot, attr in enumerate(self.attrs)}
+
+	def __contains__(self, attr: str) -> bool:
+		return attr in self._slots
+
+	def decode(self, attr: str, row) -> tuple:
+		"""Decodes one field of a raw row
+
+		Returns:
+			tuple: (value, error message or None)
+		"""
+		column_index, decode = self.converters[self._slots[attr]]
+		try:
+			return decode(row[column_index] if column_index < len(row) else ""), None
+		# the field getters raise more than FieldException (e.g. ValueError from int())
+		except Exception as ex:
+			return None, str(ex)
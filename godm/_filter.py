@@ -0,0 +1,224 @@
+import operator as _operator
+
+from ._columns import Bitmap, Column, column_for, parse_cell
+from .exceptions import FieldException
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+COMPARATORS = {
+	"eq": _operator.eq,
+	"lt": _operator.lt,
+	"lte": _operator.le,
+	"gt": _operator.gt,
+	"gte": _operator.ge,
+}
+
+
+def parse_lookup(key: str) -> tuple:
+	"""Splits a filter keyword like ``age__lt`` into the field attribute and the operator (``eq`` by default)"""
+	if "__" in key:
+		field_key, operator = key.split("__", 1)
+	else:
+		field_key, operator = key, "eq"
+	return field_key, operator
+
+
+def _members(values):
+	try:
+		return frozenset(values)
+	except TypeError:
+		return tuple(values)
+
+
+def predicate_for(operator: str, search):
+	"""Scalar version of a lookup, used by the pure Python path and for values kept outside the typed arrays"""
+	if operator in COMPARATORS:
+		compare = COMPARATORS[operator]
+		predicate = lambda value: compare(value, search)
+	elif operator == "ct":
+		predicate = lambda value: search in value
+	elif operator == "in":
+		members = _members(search)
+		predicate = lambda value: value in members
+	else:
+		low, high = search
+		predicate = lambda value: low <= value <= high
+
+	def safe_predicate(value):
+		try:
+			return bool(predicate(value))
+		except TypeError:
+			return False
+
+	return safe_predicate
+
+
+def check_operator(column: Column, operator: str):
+	if operator not in column.operators:
+		raise FieldException(f"Invalid operator passed {operator} for field {column.field.name}")
+
+
+def stored_search(column: Column, operator: str, search):
+	"""Converts a lookup value into the representation the column keeps its values in"""
+	try:
+		if operator == "in":
+			return [column.to_search(item) for item in search]
+		if operator == "range":
+			low, high = search
+			return column.to_search(low), column.to_search(high)
+		return column.to_search(search)
+	except (TypeError, ValueError) as ex:
+		raise FieldException(f"Invalid value {search!r} for {operator} lookup on field {column.field.name}: {ex}")
+
+
+def _unpack_bits(bitmap: Bitmap):
+	bits = numpy.frombuffer(bytes(bitmap.bits), dtype=numpy.uint8)
+	return numpy.unpackbits(bits, bitorder="little")[:len(bitmap)].astype(bool)
+
+
+def column_array(column: Column):
+	"""Typed values of a column as a NumPy array, sharing the column's buffer when possible"""
+	if isinstance(column.values, Bitmap):
+		return _unpack_bits(column.values)
+	return numpy.frombuffer(column.values, dtype=column.numpy_dtype)
+
+
+def null_array(column: Column):
+	if column.nulls.any():
+		return _unpack_bits(column.nulls)
+	return numpy.zeros(len(column), dtype=bool)
+
+
+def _numpy_mask(column: Column, operator: str, search):
+	values = column_array(column)
+
+	if operator in COMPARATORS:
+		mask = COMPARATORS[operator](values, search)
+	elif operator == "in":
+		mask = numpy.isin(values, list(search))
+	else:
+		low, high = search
+		mask = (values >= low) & (values <= high)
+
+	if column.nulls.any():
+		mask &= ~_unpack_bits(column.nulls)
+	return mask
+
+
+def column_mask(column: Column, operator: str, search):
+	"""Evaluates one lookup against a whole column
+
+	Args:
+		column (Column): Parsed column
+		operator (str): One of the column's ``operators``
+		search (object): Value given in the filter keyword
+
+	Returns:
+		Row mask, a boolean NumPy array when NumPy is installed or else a list of bools
+	"""
+	check_operator(column, operator)
+	scan_operator, scan_search = column.scan_lookup(operator, search)
+	stored_value = stored_search(column, scan_operator, scan_search)
+
+	if numpy is not None and column.numpy_dtype is not None and len(column):
+		mask = _numpy_mask(column, scan_operator, stored_value)
+	else:
+		predicate = predicate_for(scan_operator, stored_value)
+		if column.nulls.any():
+			mask = [not is_null and predicate(value) for value, is_null in zip(column.values, column.nulls)]
+		else:
+			mask = [predicate(value) for value in column.values]
+
+		if numpy is not None:
+			mask = numpy.array(mask, dtype=bool)
+
+	if column.fallback:
+		# values of another type (e.g. a default_val string on a DateField) are converted like the lookup value
+		# when possible, or else compared as they are
+		predicate = predicate_for(scan_operator, stored_value)
+		raw_predicate = predicate_for(operator, search)
+		for position, value in list(column.fallback.items()):
+			try:
+				mask[position] = predicate(column.fallback_search(value))
+			except (TypeError, ValueError):
+				mask[position] = raw_predicate(value)
+
+	return mask
+
+
+def row_predicate(column: Column, operator: str, search):
+	"""Per-row version of :func:`column_mask`, for evaluating a lookup on a few rows rather than the whole column
+
+	Returns:
+		callable: position -> bool
+	"""
+	check_operator(column, operator)
+	scan_operator, scan_search = column.scan_lookup(operator, search)
+	predicate = predicate_for(scan_operator, stored_search(column, scan_operator, scan_search))
+	raw_predicate = predicate_for(operator, search)
+	values, nulls, fallback = column.values, column.nulls, column.fallback
+
+	def matches(position: int) -> bool:
+		if not nulls[position]:
+			return predicate(values[position])
+		if position in fallback:
+			try:
+				return predicate(column.fallback_search(fallback[position]))
+			except (TypeError, ValueError):
+				return raw_predicate(fallback[position])
+		return False
+
+	return matches
+
+
+def cell_predicate(field, cells: list, operator: str, search):
+	"""Like :func:`row_predicate` over raw cells, parsing each cell only when it is checked"""
+	column = column_for(field, encoded=False)
+	matches = row_predicate(column, operator, search)
+
+	def cell_matches(position: int) -> bool:
+		column.append(*parse_cell(field, cells[position]))
+		return matches(len(column) - 1)
+
+	return cell_matches
+
+
+def all_rows(size: int):
+	if numpy is not None:
+		return numpy.ones(size, dtype=bool)
+	return [True] * size
+
+
+def combine(masks: list, size: int):
+	"""ANDs all the masks together"""
+	if not masks:
+		return all_rows(size)
+	if numpy is not None:
+		return numpy.logical_and.reduce(masks)
+	if len(masks) == 1:
+		return masks[0]
+	return [all(row) for row in zip(*masks)]
+
+
+def union(masks: list, size: int):
+	"""ORs all the masks together"""
+	if not masks:
+		return all_rows(size)
+	if numpy is not None:
+		return numpy.logical_or.reduce(masks)
+	return [any(row) for row in zip(*masks)]
+
+
+def negate(mask):
+	if numpy is not None:
+		return ~mask
+	return [not matched for matched in mask]
+
+
+def positions(mask) -> list:
+	if numpy is not None:
+		return numpy.flatnonzero(mask).tolist()
+	return [position for position, matched in enumerate(mask) if matched]
@@ -0,0 +1,241 @@
+from bisect import bisect_left, bisect_right, insort
+from math import inf
+from typing import TYPE_CHECKING
+
+from ._columns import ListColumn
+from ._filter import predicate_for
+
+if TYPE_CHECKING:
+	from ._columns import Column, ColumnStore
+
+# an index is rebuilt from scratch once more than this share of the rows changed on reload
+REBUILD_RATIO = 0.25
+
+_UNINDEXED = object()
+
+
+def index_key(column: "Column", position: int):
+	"""Key a row is indexed under. It matches what the filter engine compares against the lookup value"""
+	if not column.nulls[position]:
+		return column.values[position]
+	if position in column.fallback:
+		try:
+			return column.fallback_search(column.fallback[position])
+		except (TypeError, ValueError):
+			return _UNINDEXED
+	return None
+
+
+class Index(object):
+	operators = ()
+
+	def __init__(self, column: "Column"):
+		self.column = column
+		# rows holding a value that can't be converted to a key, checked one by one on lookup
+		self.residual = dict()
+		self.build(column)
+
+	def build(self, column: "Column"):
+		raise NotImplementedError
+
+	def add(self, position: int, key):
+		raise NotImplementedError
+
+	def remove(self, position: int, key):
+		raise NotImplementedError
+
+	def _add(self, position: int, key):
+		if key is _UNINDEXED:
+			self.residual[position] = self.column.fallback[position]
+		elif key is not None:
+			self.add(position, key)
+
+	def _remove(self, position: int, key):
+		if key is _UNINDEXED:
+			self.residual.pop(position, None)
+		elif key is not None:
+			self.remove(position, key)
+
+	def update(self, old_column: "Column", new_column: "Column"):
+		"""Patches the index for the rows that differ between the previous and the reloaded column"""
+		old_size, new_size = len(old_column), len(new_column)
+		changes = []
+		for position in range(max(old_size, new_size)):
+			old_key = index_key(old_column, position) if position < old_size else None
+			new_key = index_key(new_column, position) if position < new_size else None
+			if old_key is _UNINDEXED or new_key is _UNINDEXED or type(old_key) is not type(new_key) or old_key != new_key:
+				changes.append((position, old_key, new_key))
+
+		if len(changes) > REBUILD_RATIO * max(new_size, 1):
+			self.residual = dict()
+			self.column = new_column
+			self.build(new_column)
+			return
+
+		for position, old_key, _ in changes:
+			self._remove(position, old_key)
+		self.column = new_column
+		for position, _, new_key in changes:
+			self._add(position, new_key)
+
+	def _lookup(self, operator: str, search) -> list:
+		raise NotImplementedError
+
+	def lookup(self, operator: str, search, raw_search) -> list:
+		"""Positions matching the lookup, in ascending order
+
+		Args:
+			operator (str): Lookup operator, one of ``operators``
+			search (object): Lookup value converted to the column's representation
+			raw_search (object): Lookup value as given, for the residual rows
+		"""
+		found = self._lookup(operator, search)
+		if self.residual:
+			predicate = predicate_for(operator, raw_search)
+			found = found + [position for position, value in list(self.residual.items()) if predicate(value)]
+		return sorted(found)
+
+
+class HashIndex(Index):
+	"""Value -> rows mapping for ``eq`` and ``in`` lookups"""
+
+	operators = ("eq", "in")
+
+	def build(self, column: "Column"):
+		self.buckets = dict()
+		for position in range(len(column)):
+			self._add(position, index_key(column, position))
+
+	def add(self, position: int, key):
+		self.buckets.setdefault(key, []).append(position)
+
+	def remove(self, position: int, key):
+		bucket = self.buckets.get(key, [])
+		if position in bucket:
+			bucket.remove(position)
+		if not bucket:
+			self.buckets.pop(key, None)
+
+	def _lookup(self, operator: str, search) -> list:
+		if operator == "eq":
+			return list(self.buckets.get(search, []))
+
+		found = []
+		for key in set(search):
+			found.extend(self.buckets.get(key, []))
+		return found
+
+	def duplicates(self) -> list:
+		return [self.column.from_storage(key) for key, bucket in list(self.buckets.items()) if len(bucket) > 1]
+
+
+class SortedIndex(Index):
+	"""Rows sorted by value, searched with bisect for range lookups"""
+
+	operators = ("eq", "lt", "lte", "gt", "gte", "range")
+
+	def build(self, column: "Column"):
+		entries = []
+		for position in range(len(column)):
+			key = index_key(column, position)
+			if key is _UNINDEXED:
+				self.residual[position] = column.fallback[position]
+			elif key is not None:
+				entries.append((key, position))
+		entries.sort()
+		self.entries = entries
+
+	def add(self, position: int, key):
+		insort(self.entries, (key, position))
+
+	def remove(self, position: int, key):
+		at = bisect_left(self.entries, (key, position))
+		if at < len(self.entries) and self.entries[at] == (key, position):
+			del self.entries[at]
+
+	def _lookup(self, operator: str, search) -> list:
+		entries = self.entries
+		start, end = 0, len(entries)
+		if operator == "eq":
+			start, end = bisect_left(entries, (search, -inf)), bisect_right(entries, (search, inf))
+		elif operator == "lt":
+			end = bisect_left(entries, (search, -inf))
+		elif operator == "lte":
+			end = bisect_right(entries, (search, inf))
+		elif operator == "gt":
+			start = bisect_right(entries, (search, inf))
+		elif operator == "gte":
+			start = bisect_left(entries, (search, -inf))
+		else:
+			low, high = search
+			start, end = bisect_left(entries, (low, -inf)), bisect_right(entries, (high, inf))
+
+		return [position for _, position in entries[start:end]]
+
+
+class IndexSet(object):
+	"""Secondary indexes of a model, declared with ``indexed=True`` / ``unique=True`` on a field or listed in
+	``Meta.indexes``
+	"""
+
+	def __init__(self):
+		self.indexes = dict()
+		self.errors = dict()
+
+	@staticmethod
+	def declared(meta: dict, meta_indexes: list) -> list:
+		attrs = list(meta_indexes or [])
+		for attr, field in list(meta.items()):
+			field_meta = getattr(field, "_meta", {})
+			if (field_meta.get("indexed") or field_meta.get("unique")) and attr not in attrs:
+				attrs.append(attr)
+		return [attr for attr in attrs if attr in meta]
+
+	@classmethod
+	def build(cls, meta: dict, columns: "ColumnStore", meta_indexes: list = None, previous: "IndexSet" = None,
+	          previous_columns: "ColumnStore" = None) -> "IndexSet":
+		"""Builds the declared indexes over a column store. Indexes of a previous load are patched in place for
+		the rows that changed rather than rebuilt
+		"""
+		index_set = cls()
+		for attr in cls.declared(meta, meta_indexes):
+			column = columns.get(attr)
+			if column is None or isinstance(column, ListColumn):
+				index_set.errors[attr] = "index is not supported on this field type"
+				continue
+
+			index_types = [HashIndex]
+			if "lt" in column.operators:
+				index_types.append(SortedIndex)
+
+			old_indexes = previous.indexes.get(attr, []) if previous is not None else []
+			old_column = previous_columns.get(attr) if previous_columns is not None else None
+
+			attr_indexes = []
+			for index_type in index_types:
+				index = next((old for old in old_indexes if type(old) is index_type), None)
+				if index is not None and old_column is not None and type(old_column) is type(column):
+					index.update(old_column, column)
+				else:
+					index = index_type(column)
+				attr_indexes.append(index)
+			index_set.indexes[attr] = attr_indexes
+
+			if meta[attr]._meta.get("unique"):
+				duplicates = attr_indexes[0].duplicates()
+				if duplicates:
+					index_set.errors[attr] = f"unique index has duplicate values: {duplicates[:10]}"
+
+		return index_set
+
+	def patch(self, attr: str, position: int, old_key=None):
+		"""Re-indexes one row after its column value was set in place (``old_key`` is None for a new row)"""
+		for index in self.indexes.get(attr, []):
+			index._remove(position, old_key)
+			index._add(position, index_key(index.column, position))
+
+	def find(self, attr: str, operator: str):
+		for index in self.indexes.get(attr, []):
+			if operator in index.operators:
+				return index
+		return None
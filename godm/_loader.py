@@ -0,0 +1,136 @@
+"""Batch loading of the models sharing a spreadsheet. One metadata request finds all their worksheets, then one
+``values_batch_get`` reads the header rows and the snapshots of all their tabs, which is split between the models
+"""
+from contextlib import ExitStack
+
+from ._a1 import absolute, rows_range, whole_tab
+from ._auth import get_sheet, get_worksheet
+from ._cache import cache_dir, read_snapshot, sheet_version, write_snapshot
+from ._relations import _models
+from .backends import SheetsBackend, backend_for
+from .instrumentation import cache_lookup, timed
+
+
+class TabValues(object):
+	"""What a batch load read for one model, its setup uses it rather than reading the tab again
+
+	Attributes:
+		spreadsheet: Spreadsheet of the tab
+		worksheet: Worksheet of the tab
+		values (list): Whole tab values in snapshot mode, else the header row
+		version (str): Spreadsheet version the values were read at
+	"""
+
+	__slots__ = ("spreadsheet", "worksheet", "values", "version")
+
+	def __init__(self, spreadsheet, worksheet, values: list, version: str = None):
+		self.spreadsheet = spreadsheet
+		self.worksheet = worksheet
+		self.values = values
+		self.version = version
+
+
+def _batched(model) -> bool:
+	return isinstance(backend_for(getattr(model, "Meta")), SheetsBackend) and not model.manager.setup
+
+
+def batches(models: list) -> list:
+	"""Splits models into loads: the Google Sheets models not loaded yet by spreadsheet, any other model alone
+
+	Returns:
+		list: lists of model classes
+	"""
+	groups = dict()
+	single = []
+	for model in models:
+		if not _batched(model):
+			single.append([model])
+			continue
+
+		meta = getattr(model, "Meta")
+		sheet_key = getattr(meta, "sheet_key", None)
+		group = ("key", sheet_key) if sheet_key else ("name", getattr(meta, "sheet_name", "default"))
+		groups.setdefault(group, []).append(model)
+
+	return list(groups.values()) + single
+
+
+def load_batch(models: list) -> None:
+	"""Loads models of one spreadsheet together, see :func:`batches`. A model that can't be batched loads alone"""
+	if not all(_batched(model) for model in models):
+		for model in models:
+			model.manager._setup_attrs()
+		return
+
+	meta = getattr(models[0], "Meta")
+	spreadsheet = get_sheet(getattr(meta, "sheet_name", "default"), getattr(meta, "sheet_key", None))
+
+	with ExitStack() as stack:
+		# a model used meanwhile waits for the batch rather than reading its tab on its own. Locks are taken in
+		# the same order by every batch
+		for model in sorted(models, key=id):
+			stack.enter_context(model.manager._lock)
+
+		pending = [model for model in models if not model.manager.setup]
+		if not pending:
+			return
+
+		worksheets = {model: get_worksheet(spreadsheet, getattr(getattr(model, "Meta"), "tab_name")) for model in pending}
+		# probed before the read, so a change made meanwhile shows up on the next refresh
+		snapshots = [model for model in pending if getattr(getattr(model, "Meta"), "snapshot", False)]
+		version = sheet_version(spreadsheet) if snapshots else None
+
+		values = dict()
+		ranges, readers = [], []
+		for model in pending:
+			worksheet, header_index = worksheets[model], getattr(getattr(model, "Meta"), "header_index")
+			if model not in snapshots:
+				ranges.append(absolute(worksheet.title, rows_range(header_index, header_index)))
+				readers.append(model)
+				continue
+
+			if cache_dir():
+				cached = read_snapshot(spreadsheet.id, worksheet.id, header_index, version)
+				cache_lookup("snapshot", cached is not None, sheet=spreadsheet.id, tab=worksheet.title)
+				if cached is not None:
+					values[model] = cached
+					continue
+			ranges.append(whole_tab(worksheet.title))
+			readers.append(model)
+
+		if ranges:
+			with timed("batch_load", sheet=spreadsheet.id, tabs=len(ranges)) as attributes:
+				value_ranges = spreadsheet.values_batch_get(ranges).get("valueRanges", [])
+				attributes["rows"] = sum(len(value_range.get("values", [])) for value_range in value_ranges)
+
+			for model, value_range in zip(readers, value_ranges):
+				tab_values = value_range.get("values", [])
+				if model in snapshots:
+					header_index = getattr(getattr(model, "Meta"), "header_index")
+					write_snapshot(spreadsheet.id, worksheets[model].id, header_index, version, tab_values)
+					values[model] = tab_values
+				else:
+					values[model] = tab_values[0] if tab_values else []
+
+		for model in pending:
+			model.manager._setup_attrs(prefetched=TabValues(spreadsheet, worksheets[model], values[model], version))
+
+
+def load_all(models: list = None) -> list:
+	"""Loads models, every declared model not loaded yet by default. The Google Sheets models sharing a spreadsheet
+	are loaded together: one metadata request for their worksheets and one ``values_batch_get`` for their headers
+	and snapshots, instead of a few requests per model
+
+	Args:
+		models (list, optional): Model classes to load
+
+	Returns:
+		list: The model classes
+	"""
+	if models is None:
+		models = [model for model in list(_models.values()) if not model.manager.setup]
+	models = list(models)
+
+	for batch in batches(models):
+		load_batch(batch)
+	return models
@@ -1,102 +1,454 @@
+import logging
+import threading
+from bisect import bisect_left
+from concurrent.futures import Executor, Future
 from typing import TYPE_CHECKING, Callable
 
 import gspread
 from enum import Enum
 
+from ._a1 import column_letter, rows_range
+from ._cache import cache_dir, sheet_version, write_snapshot
+from ._columns import CellColumns, ColumnStore, build_column, parse_cell
+from ._filter import check_operator, column_mask, combine, parse_lookup, positions, stored_search
+from ._index import REBUILD_RATIO, IndexSet, index_key
+from ._loader import load_batch
+from ._session import current_session
+from ._warmup import background_executor, done_future, load_queued
+from ._writer import TabWrites, WriteBatch
+from .aggregates import GroupBy, aggregate
+from .backends import backend_for
 from .exceptions import FieldException, ModelItemException
+from .field import CustomField
+from .instrumentation import timed
 from .iterator import GIterator
+from .query import QuerySet
 
 if TYPE_CHECKING:
+	from ._loader import TabValues
 	from .field import Field
 	from .model import GModel
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAM_ROWS = 5000
+
+
+def _trimmed(row) -> tuple:
+	"""Row without its trailing empty cells, which the API may or may not return"""
+	row = tuple(row)
+	end = len(row)
+	while end and row[end - 1] == "":
+		end -= 1
+	return row[:end]
+
+
 class LoadPolicy(Enum):
     INIT = "init"
     LAZY = "lazy"
+    BACKGROUND = "background"
 
 class GModelManager(object):
 
 	def __init__(self, model: "GModel", setup_attrs:Callable):
 		model_meta = getattr(model, "Meta")
 		self.load_policy = getattr(model_meta, "load_policy")
+		self.snapshot = getattr(model_meta, "snapshot", False)
+		self.snapshot_ttl = getattr(model_meta, "snapshot_ttl", None)
+		self.refresh_column = getattr(model_meta, "refresh_column", None)
 		self.model = model
 		self.setup = False
 		self.__setup_attrs = setup_attrs
-  
-		print(f"load_policy: {self.load_policy}")
+		# models may be loaded from several threads at once (e.g. by the async manager)
+		self._lock = threading.RLock()
 
-		if self.load_policy == LoadPolicy.INIT:
-			self._setup_attrs()
+		logger.debug("%s load_policy: %s", model.__name__, self.load_policy)
+
+		self.load_future = None
 
-	def _setup_attrs(self, reload = False):
-		if not self.setup or reload:
-			self.__setup_attrs()
-			self.setup = True
+	def _apply_load_policy(self):
+		"""Starts the load the model's load policy asks for. Called once the model holds this manager, as the load
+		reaches it through the model
+		"""
+		if self.load_policy == LoadPolicy.INIT:
+			load_batch([self.model])
+		elif self.load_policy == LoadPolicy.BACKGROUND:
+			self.load_in_background()
+
+	def _setup_attrs(self, reload = False, prefetched: "TabValues" = None):
+		"""Loads the model, once unless reloaded
+
+		Args:
+			reload (bool, optional): Load it again. Defaults to False.
+			prefetched (TabValues, optional): Tab values a batch load already read, see :func:`godm.load_all`
+		"""
+		if self.setup and not reload and not self._snapshot_expired():
+			return
+
+		# while a background load is running this waits on the lock, for this model only
+		with self._lock:
+			if not self.setup or reload:
+				with self._timed("load"):
+					self.__setup_attrs(prefetched)
+				self.setup = True
+			elif self._snapshot_expired():
+				self.refresh(force=True)
+
+	def load_in_background(self, executor: Executor = None) -> Future:
+		"""Starts loading the model on a worker thread. Models queued meanwhile on the same spreadsheet are read
+		with it, in one batch
+
+		Args:
+			executor (Executor, optional): Pool to load on. Defaults to the shared background pool.
+
+		Returns:
+			:class:`concurrent.futures.Future`: resolves once the model is loaded
+		"""
+		if self.setup:
+			return done_future()
+
+		self.load_future = load_queued(self.model, executor)
+		return self.load_future
+
+	def _snapshot_expired(self):
+		snapshot = getattr(self.model, "_snapshot", None)
+		return snapshot is not None and snapshot.is_expired(self.snapshot_ttl)
+
+	def _timed(self, name: str, **attributes):
+		"""Times an operation of the model, see :func:`godm.instrumentation.timed`"""
+		tab_name = getattr(getattr(self.model, "Meta"), "tab_name", None)
+		return timed(name, model=self.model.__name__, tab=tab_name, **attributes)
+
+	def _source(self):
+		"""Returns the in-memory snapshot when the model runs in snapshot mode, else the live worksheet"""
+		snapshot = getattr(self.model, "_snapshot", None)
+		if snapshot is not None:
+			return snapshot
+		return getattr(self.model, "_data")
 
 	def _get_header_index(self):
 		class_meta = getattr(self.model, "Meta")
 		return getattr(class_meta, "header_index")
 
-	def _filter_data_list(self, **kwargs):
+	def _build_column_store(self, incremental: bool = True):
+		"""Parses the snapshot into the column store and builds the indexes over it. With ``incremental`` the
+		indexes of the previous load are patched rather than rebuilt
+		"""
+		model = self.model
+		snapshot = getattr(model, "_snapshot", None)
+		previous_columns = model.__dict__.get("_columns") if incremental else None
+		previous_indexes = model.__dict__.get("_indexes") if incremental else None
+
+		model._columns = None
+		model._indexes = None
+		if snapshot is None:
+			return
+
+		meta = getattr(model, "_meta")
+		model._columns = ColumnStore.build(meta, snapshot, previous=previous_columns)
+		model._indexes = IndexSet.build(
+			meta, model._columns, getattr(getattr(model, "Meta"), "indexes", None),
+			previous=previous_indexes, previous_columns=previous_columns,
+		)
+		model._errors.update(model._indexes.errors)
+
+	def _lookup_fields(self, field_keys: list) -> dict:
+		"""Fields filtered on, by field attribute"""
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+
+		fields = dict()
+		for field_key in field_keys:
+			field = meta.get(field_key)
+			if field is None:
+				raise FieldException(f"Unknown field {field_key} for model {self.model.__name__}")
+			if isinstance(field, CustomField):
+				raise FieldException(f"Filtering on CustomField {field_key} is not supported")
+			fields[field_key] = field
+		return fields
+
+	def _filter_columns(self, field_keys: list, size: int = 0, whole_tab: bool = False) -> tuple:
+		"""Parsed columns to evaluate filters on. They come from the column store in snapshot mode, else all of
+		them are read with one ``batch_get`` request and parsed on first use
+
+		Args:
+			field_keys (list): Field attributes
+			size (int, optional): Rows the read columns cover at least, e.g. the rows matched by an earlier read.
+				Rows past the cells returned are empty cells.
+			whole_tab (bool, optional): Cover every data row of the tab, for filters a blank row can match. The
+				rows are read whole in the same request to find where the data ends. Defaults to False.
+
+		Returns:
+			tuple: (dict of field attribute -> :class:`godm._columns.Column`, number of data rows)
+		"""
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+		fields = self._lookup_fields(field_keys)
+
+		columns = getattr(self.model, "_columns", None)
+		if columns is not None:
+			snapshot = getattr(self.model, "_snapshot")
+			return {field_key: columns.get(field_key) for field_key in fields}, len(snapshot)
+
 		header_index = self._get_header_index()
 		all_data: gspread.Worksheet = getattr(self.model, "_data")
-		headers: list = getattr(self.model, "_headers")
-		meta:dict[str, "Field"] = getattr(self.model, "_meta")
 
-		filter_data_list = []
+		read_fields = fields
+		if not read_fields:
+			# nothing to filter on, but the first field column still tells how many rows there are
+			read_fields = {
+				field_key: field for field_key, field in list(meta.items()) if not isinstance(field, CustomField)
+			}
+			read_fields = dict(list(read_fields.items())[:1])
+			if not read_fields:
+				return dict(), 0
+
+		column_ranges = []
+		for field in read_fields.values():
+			column = column_letter(field._meta.get("index") + 1)
+			column_ranges.append(f"{column}{header_index + 1}:{column}")
+
+		if whole_tab:
+			# the columns read may end before the data does, their trailing empty cells are left out
+			headers = getattr(self.model, "_headers")
+			column_ranges.append(f"A{header_index + 1}:{column_letter(max(len(headers), 1))}")
+
+		value_ranges = all_data.batch_get(column_ranges)
+		if whole_tab:
+			size = max(size, len(value_ranges.pop()))
+		cells_list = [[row[0] if row else "" for row in value_range] for value_range in value_ranges]
+		size = max([size] + [len(cells) for cells in cells_list])
+
+		for cells in cells_list:
+			# trailing empty cells are not returned by the API
+			cells.extend([""] * (size - len(cells)))
+
+		# parsed when first used, a query that stops early may only need a few of the cells
+		return CellColumns(fields, dict(zip(list(fields), cells_list))), size
+
+	def _filter_data_list(self, **kwargs):
+		header_index = self._get_header_index()
 
-		for key, val in list(kwargs.items()):
-			if "__" in key:
-				field_key, operator = key.split("__")
+		lookups = [parse_lookup(key) + (val,) for key, val in list(kwargs.items())]
+		columns, size = self._filter_columns([field_key for field_key, _, _ in lookups])
+
+		indexes = getattr(self.model, "_indexes", None)
+		indexed_positions = None
+		masks = []
+		for field_key, operator, val in lookups:
+			column = columns[field_key]
+			index = indexes.find(field_key, operator) if indexes is not None else None
+			if index is None:
+				masks.append(column_mask(column, operator, val))
+				continue
+
+			check_operator(column, operator)
+			found = index.lookup(operator, stored_search(column, operator, val), val)
+			if indexed_positions is None:
+				indexed_positions = found
 			else:
-				field_key, operator = key, "eq"
-			filter_data_list = []
-			field:Field = meta.get(field_key)
-			key_name = getattr(field, "_meta", {}).get("name")
-			local_index = headers.index(key_name) + 1
+				found = set(found)
+				indexed_positions = [position for position in indexed_positions if position in found]
 
-			godm_column_values = all_data.col_values(local_index)
+		if indexed_positions is None:
+			matched = positions(combine(masks, size))
+		elif masks:
+			mask = combine(masks, size)
+			matched = [position for position in indexed_positions if mask[position]]
+		else:
+			matched = indexed_positions
 
-			for index, column_value in enumerate(godm_column_values[header_index:]):
-				index += header_index
-				if field.match_value(val, column_value, operator):
-					filter_data_list.append(index + 1)
+		return [header_index + 1 + position for position in matched]
 
-		return filter_data_list
+	def _fetch_rows(self, row_indexes: list) -> dict:
+		"""Fetches several rows at once. Contiguous row numbers are coalesced into a single A1 range and all the
+		ranges go out in one ``batch_get`` request
 
-	def _get_data_from_id(self, row_index):
-		all_data = getattr(self.model, "_data")
+		Args:
+			row_indexes (list): Sheet row numbers to fetch
+
+		Returns:
+			dict: row number -> row values
+		"""
+		self._setup_attrs()
+
+		snapshot = getattr(self.model, "_snapshot", None)
+		if snapshot is not None:
+			return {row_index: snapshot.row_values(row_index) for row_index in row_indexes}
+
+		return self._read_rows(row_indexes)
+
+	def _read_rows(self, row_indexes: list) -> dict:
+		"""Reads rows from the worksheet, see :meth:`_fetch_rows`"""
+		row_ranges = []
+		for row_index in sorted(set(row_indexes)):
+			if row_ranges and row_ranges[-1][1] == row_index - 1:
+				row_ranges[-1][1] = row_index
+			else:
+				row_ranges.append([row_index, row_index])
+
+		if not row_ranges:
+			return dict()
+
+		all_data: gspread.Worksheet = getattr(self.model, "_data")
+		value_ranges = all_data.batch_get([rows_range(start, end) for start, end in row_ranges])
+
+		rows = dict()
+		for (start, end), value_range in zip(row_ranges, value_ranges):
+			for offset, row_index in enumerate(range(start, end + 1)):
+				# trailing empty rows are not returned by the API
+				rows[row_index] = value_range[offset] if offset < len(value_range) else []
+
+		return rows
+
+	def get_raw_data(self, row_data) -> dict:
+		"""Row cells keyed by both column index and header name"""
 		headers = getattr(self.model, "_headers")
-		meta = getattr(self.model, "_meta")
 
 		data_keys = dict()
 		data_index = dict()
-		row_data = all_data.row_values(row_index)
 		for index in range(len(headers)):
-			data_keys[index] = row_data[index]
-			data_index[headers[index]] = row_data[index]
+			# row_values() trims trailing empty cells
+			cell_value = row_data[index] if index < len(row_data) else ""
+			data_keys[index] = cell_value
+			data_index[headers[index]] = cell_value
+
+		return {**data_keys, **data_index}
+
+	def decode_field(self, attr: str, row_index, row_data) -> tuple:
+		"""Decodes one field of a row, from the column store when the row still belongs to the current snapshot.
+		Cells decoded here, e.g. on first access to an entity's field, emit a one cell ``decode`` event
+
+		Returns:
+			tuple: (value, error message or None)
+		"""
+		field: "Field" = getattr(self.model, "_meta").get(attr)
+		if field is None or row_data is None:
+			return None, None
+
+		columns = getattr(self.model, "_columns", None)
+		column = columns.get(attr) if columns is not None and row_index is not None else None
+		if column is not None:
+			position = columns.position(row_index)
+			snapshot = getattr(self.model, "_snapshot")
+			if 0 <= position < len(column) and snapshot.rows[position] is row_data:
+				return column.value(position), column.error(position)
+
+		with self._timed("decode", field_type=type(field).__name__, field=field.name, cells=1):
+			decoder = getattr(self.model, "_decoder")
+			if attr in decoder:
+				return decoder.decode(attr, row_data)
 
-		data = {**data_keys, **data_index}
-		errors = dict()
-		fields = dict()
-		for field, field_obj in list(meta.items()):
-			field_val = None
 			try:
-				field_val = field_obj.get_value(data)
-			except FieldException as ex:
-				errors.setdefault(field, str(ex))
+				return field.get_value(self.get_raw_data(row_data)), None
 			# TODO avoid using this Exception catch
 			except Exception as ex:
-				errors.setdefault(field, str(ex))
+				return None, str(ex)
+
+	def refresh(self, force: bool = False) -> int:
+		"""Brings the snapshot up to date, re-parsing and re-indexing only the rows that changed. Expired
+		snapshots are refreshed this way too, forced.
+
+		A spreadsheet whose live version hasn't moved costs one metadata request. Otherwise the rows are compared
+		with the snapshot: with ``Meta.refresh_column`` (a field that changes whenever its row does, e.g. an
+		updated at column) only that column is read and then the rows whose value differs, else, or when rows were
+		inserted or deleted, the whole tab is read. When the header row or too many rows changed, the model is
+		reloaded instead.
+
+		Args:
+			force (bool, optional): Read and compare the whole tab even when the version hasn't moved. Defaults to
+				False.
+
+		Returns:
+			int: number of rows that changed
+		"""
+		with self._timed("refresh") as attributes:
+			attributes["rows"] = self._refresh(force)
+		return attributes["rows"]
+
+	def _refresh(self, force: bool = False) -> int:
+		with self._lock:
+			if not self.setup:
+				self._setup_attrs()
+				return 0
+
+		snapshot = getattr(self.model, "_snapshot", None)
+		if snapshot is None:
+			# without a snapshot only the headers are held
+			self.reload_model()
+			return 0
+
+		with self._lock:
+			worksheet: gspread.Worksheet = getattr(self.model, "_data")
+			header_index = self._get_header_index()
+
+			# only a live version that matches proves nothing changed, a failed probe reads the rows
+			version = sheet_version(worksheet.spreadsheet)
+			if not force and version is not None and version == snapshot.version:
+				snapshot.touch(version)
+				return 0
+
+			by_column = self._changed_rows_by_column(snapshot) if self.refresh_column and not force else None
+			if by_column is not None:
+				changed, size = by_column
+			else:
+				values = worksheet.get_all_values()
+				if _trimmed(values[header_index - 1] if len(values) >= header_index else []) != _trimmed(snapshot.headers):
+					self.reload_model()
+					return len(getattr(self.model, "_snapshot"))
+				rows = values[header_index:]
+				size = len(rows)
+				changed = {
+					position: row for position, row in enumerate(rows)
+					if position >= len(snapshot) or _trimmed(row) != _trimmed(snapshot.rows[position])
+				}
+
+			if len(changed) > REBUILD_RATIO * max(size, 1):
+				self.reload_model()
+				return len(changed)
+
+			for position, row in sorted(changed.items()):
+				if position < len(snapshot):
+					self._set_row(position, row)
+				else:
+					self._append_to_columns(position, snapshot.append_row(row))
+
+			removed = len(snapshot) - size
+			if removed > 0:
+				snapshot.delete_rows(set(range(size, len(snapshot))))
+				self._build_column_store(incremental=False)
+
+			snapshot.touch(version)
+			if cache_dir() and backend_for(getattr(self.model, "Meta")).cached:
+				write_snapshot(worksheet.spreadsheet.id, worksheet.id, header_index, version, snapshot.values())
+
+			return len(changed) + max(removed, 0)
+
+	def _changed_rows_by_column(self, snapshot) -> tuple:
+		"""Rows whose ``refresh_column`` cell differs from the snapshot, read one column and then only those rows.
+		Rows are matched by position, so once the number of rows moved (rows inserted or deleted) nothing is
+		compared and the whole tab has to be
+
+		Returns:
+			tuple: (dict of position -> row values, number of data rows), or None when the number of rows moved
+		"""
+		field: "Field" = getattr(self.model, "_meta").get(self.refresh_column)
+		if field is None or isinstance(field, CustomField):
+			raise FieldException(f"Invalid refresh_column {self.refresh_column} for model {self.model.__name__}")
 
-			fields.setdefault(field, field_val)
+		header_index = self._get_header_index()
+		worksheet: gspread.Worksheet = getattr(self.model, "_data")
 
-		return {
-			"id": row_index + 1,
-			"data": data,
-			"errors": errors,
-			"fields": fields
-		}
+		column_index = field._meta.get("index")
+		column = column_letter(column_index + 1)
+		cells = [row[0] if row else "" for row in worksheet.batch_get([f"{column}{header_index + 1}:{column}"])[0]]
+		if len(cells) != len(snapshot):
+			return None
+
+		changed_positions = [
+			position for position, cell_value in enumerate(cells) if snapshot.rows[position][column_index] != cell_value
+		]
+		rows = self._read_rows([header_index + 1 + position for position in changed_positions])
+
+		return {position: rows[header_index + 1 + position] for position in changed_positions}, len(cells)
 
 	def reload_model(self):
 		self._setup_attrs(reload=True)
@@ -108,24 +460,375 @@ class GModelManager(object):
 	def get(self, **kwargs) -> "GModel":
 		self._setup_attrs()
 
-		filter_data_list = self._filter_data_list(**kwargs)
+		with self._timed("get", lookups=",".join(kwargs)) as attributes:
+			filter_data_list = self._filter_data_list(**kwargs)
+			attributes["rows"] = len(filter_data_list)
+
+			if len(filter_data_list) == 0:
+				raise ModelItemException(f"Unable to find Entity {self.model}, {kwargs}")
+
+			return self.get_entity_from_id(filter_data_list[0])
+
+	def aggregate(self, **aggregates) -> dict:
+		"""Aggregates all the rows, e.g. ``aggregate(total=Sum("age"), n=Count())``. It runs on the typed
+		columns, no entity is created
+
+		Returns:
+			dict: result name -> value
+		"""
+		return aggregate(self, aggregates)
+
+	def group_by(self, *fields: str) -> GroupBy:
+		return GroupBy(self, fields)
+
+	def query(self) -> "QuerySet":
+		"""Lazy query over all the rows, see :class:`godm.query.QuerySet`"""
+		return QuerySet(self)
 
-		if len(filter_data_list) == 0:
-			raise ModelItemException(f"Unable to find Entity {self.model}, {kwargs}")
+	def all(self) -> "QuerySet":
+		return self.query()
 
-		model_data = self._get_data_from_id(filter_data_list[0])
+	def select_related(self, *fields: str) -> "QuerySet":
+		return self.query().select_related(*fields)
 
-		return self.model(model_data)
+	def prefetch_related(self, *related_names: str) -> "QuerySet":
+		return self.query().prefetch_related(*related_names)
 
 	def filter(self, **kwargs):
 		self._setup_attrs()
 
-		filter_data_list = self._filter_data_list(**kwargs)
+		with self._timed("filter", lookups=",".join(kwargs)) as attributes:
+			filter_data_list = self._filter_data_list(**kwargs)
+			attributes["rows"] = len(filter_data_list)
 
 		return GIterator(self, filter_data_list)
 
-	def get_entity_from_id(self, row_index):
+	def stream(self, batch_rows: int = DEFAULT_STREAM_ROWS, prefetch: bool = True, **kwargs):
+		"""Iterates a tab too large to hold, one window of rows at a time. Each window is read with a single
+		range request, filtered on its own and dropped once its entities are yielded. In snapshot mode the
+		snapshot is filtered as usual. The stream ends at the first window without any data, so ``batch_rows`` empty
+		rows in a row end it early
+
+		Args:
+			batch_rows (int, optional): Rows per window. Defaults to 5000.
+			prefetch (bool, optional): Read the next window on a background thread while the current one is
+				consumed, so at most two windows are held. Defaults to True.
+			**kwargs: Filter lookups, as for :meth:`filter`
+
+		Yields:
+			GModel: matching entities, in sheet order
+		"""
+		self._setup_attrs()
+
+		if getattr(self.model, "_snapshot", None) is not None:
+			yield from self.filter(**kwargs)
+			return
+
+		lookups = [parse_lookup(key) + (val,) for key, val in list(kwargs.items())]
+		fields = self._lookup_fields([field_key for field_key, _, _ in lookups])
+
+		worksheet: gspread.Worksheet = getattr(self.model, "_data")
+		read_window = lambda start: worksheet.get(rows_range(start, start + batch_rows - 1))
+
+		start = self._get_header_index() + 1
+		pending = background_executor().submit(read_window, start) if prefetch else None
+		while True:
+			rows = pending.result() if prefetch else read_window(start)
+			# the API leaves out the empty rows at the end of a window, even when more data follows it, so only
+			# an empty window is past the data
+			if not rows:
+				return
+			if prefetch:
+				pending = background_executor().submit(read_window, start + batch_rows)
+
+			masks = []
+			for field_key, operator, val in lookups:
+				column_index = fields[field_key]._meta.get("index")
+				cells = (row[column_index] if column_index < len(row) else "" for row in rows)
+				masks.append(column_mask(build_column(fields[field_key], cells), operator, val))
+
+			for position in positions(combine(masks, len(rows))):
+				yield self.model.from_row(start + position, tuple(rows[position]))
+
+			start += batch_rows
+
+	def get_entity_from_id(self, row_index, row_data: list = None):
+		self._setup_attrs()
+
+		if row_data is None:
+			row_data = self._source().row_values(row_index)
+		# snapshot rows are tuples already and are shared as they are
+		entity = self.model.from_row(row_index, tuple(row_data))
+
+		session = current_session()
+		if session is not None:
+			session.track(entity)
+		return entity
+
+	def _field_cells(self, **values) -> dict:
+		"""Cell texts of field values
+
+		Returns:
+			dict: column number -> cell text
+		"""
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+
+		cells = dict()
+		for attr, value in list(values.items()):
+			field = meta.get(attr)
+			if field is None:
+				raise FieldException(f"Unknown field {attr} for model {self.model.__name__}")
+			if isinstance(field, CustomField):
+				raise FieldException(f"CustomField {attr} can't be written")
+			cells[field._meta.get("index") + 1] = field.to_raw(value)
+		return cells
+
+	def _new_row(self, entity: "GModel") -> list:
+		"""Full row of cell texts for an entity that isn't in the sheet yet"""
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+
+		row = [""] * len(getattr(self.model, "_headers"))
+		for attr, field in list(meta.items()):
+			if not isinstance(field, CustomField):
+				row[field._meta.get("index")] = field.to_raw(getattr(entity, attr))
+		return row
+
+	def _changed_cells(self, entity: "GModel", attrs: list = None) -> dict:
+		"""Cells of the fields that were assigned a value different from the one in the row
+
+		Args:
+			attrs (list, optional): Fields to check. Defaults to all of them.
+
+		Returns:
+			dict: column number -> cell text
+		"""
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+
+		cells = dict()
+		for attr in attrs if attrs is not None else list(meta):
+			field = meta.get(attr)
+			if field is None or isinstance(field, CustomField):
+				continue
+			# fields never read nor assigned can't have changed
+			loaded, value = getattr(type(entity), attr).peek(entity)
+			if not loaded:
+				continue
+			original, _ = self.decode_field(attr, entity._row_id, entity._row)
+			if type(value) is not type(original) or value != original:
+				cells[field._meta.get("index") + 1] = field.to_raw(value)
+		return cells
+
+	def _stage_save(self, batch: WriteBatch, entity: "GModel", keep_staged: bool = False):
+		"""Stages an entity's row: new entities are appended, loaded ones get their changed cells updated
+
+		Args:
+			keep_staged (bool, optional): Leave the cells the batch already holds as they are, they were written
+				after the entity's changes. Defaults to False.
+		"""
+		if entity._row_id is None:
+			batch.append(self, self._new_row(entity), entity)
+			return
+
+		cells = self._changed_cells(entity)
+		if keep_staged:
+			staged = batch.tab(self).cells
+			cells = {
+				col_index: raw for col_index, raw in list(cells.items()) if (entity._row_id, col_index) not in staged
+			}
+		batch.save(self, entity, cells)
+
+	def _stage_field(self, batch: WriteBatch, entity: "GModel", attr: str):
+		"""Stages the cell of a field just assigned on a loaded entity. A value equal to the row's is staged too when
+		the batch holds an earlier write of the cell, which it must override
+		"""
+		field: "Field" = getattr(self.model, "_meta").get(attr)
+		if field is None or isinstance(field, CustomField):
+			return
+
+		cells = self._changed_cells(entity, [attr])
+		col_index = field._meta.get("index") + 1
+		if not cells and (entity._row_id, col_index) in batch.tab(self).cells:
+			cells = {col_index: field.to_raw(getattr(entity, attr))}
+		if cells:
+			batch.save(self, entity, cells)
+
+	def save(self, *entities: "GModel"):
+		"""Writes entities back: new ones are appended, loaded ones get their changed cells updated. All of it
+		goes out in one write batch, or with the session's when one is open
+		"""
+		self._setup_attrs()
+
+		session = current_session()
+		if session is not None:
+			for entity in entities:
+				session.add(entity)
+			return
+
+		batch = WriteBatch()
+		for entity in entities:
+			self._stage_save(batch, entity)
+		batch.flush()
+
+	def bulk_create(self, entities: list) -> list:
+		"""Appends the entities as new rows with a single append request"""
+		self._setup_attrs()
+
+		session = current_session()
+		if session is not None:
+			for entity in entities:
+				session.add(entity)
+			return entities
+
+		batch = WriteBatch()
+		for entity in entities:
+			batch.append(self, self._new_row(entity), entity)
+		batch.flush()
+		return entities
+
+	def update_rows(self, row_indexes: list, **values) -> int:
+		"""Sets the same field values on several rows, all cells in one request
+
+		Returns:
+			int: number of rows updated
+		"""
+		self._setup_attrs()
+
+		cells = self._field_cells(**values)
+		session = current_session()
+		batch = session.batch if session is not None else WriteBatch()
+		for row_index in row_indexes:
+			for col_index, raw in list(cells.items()):
+				batch.update(self, row_index, col_index, raw)
+		if session is None:
+			batch.flush()
+		return len(row_indexes)
+
+	def bulk_delete(self, entities) -> int:
+		"""Deletes rows, contiguous ones in a single range
+
+		Args:
+			entities: Entities, or a :class:`godm.iterator.GIterator` from ``filter()``
+
+		Returns:
+			int: number of rows deleted
+		"""
 		self._setup_attrs()
 
-		model_data = self._get_data_from_id(row_index)
-		return self.model(model_data)
+		session = current_session()
+		batch = session.batch if session is not None else WriteBatch()
+		if isinstance(entities, GIterator):
+			row_indexes, entities = list(entities._filter_list), []
+			for row_index in row_indexes:
+				batch.delete(self, row_index)
+		else:
+			entities = [entity for entity in entities if entity._row_id is not None]
+			row_indexes = [entity._row_id for entity in entities]
+			for entity in entities:
+				if session is not None:
+					session.delete(entity)
+				else:
+					batch.delete(self, entity._row_id)
+
+		if session is None:
+			batch.flush()
+			# deleted entities keep their values, saving one again inserts it as a new row
+			for entity in entities:
+				entity._row_id = None
+		return len(set(row_indexes))
+
+	def _apply_writes(self, tab: TabWrites, appended_from: int = None):
+		"""Brings the snapshot, column store and indexes in line with writes that were just sent, so the next
+		filter sees them without a reload
+
+		Args:
+			tab (TabWrites): The writes of this model
+			appended_from (int, optional): Row number the appended rows landed on, ``None`` when unknown. In
+				snapshot mode they are then taken to follow the snapshot's rows
+		"""
+		with self._lock:
+			snapshot = getattr(self.model, "_snapshot", None)
+			header_index = self._get_header_index()
+
+			rows = dict()
+			for (row_index, col_index), raw in list(tab.cells.items()):
+				rows.setdefault(row_index, dict())[col_index] = raw
+
+			if snapshot is None:
+				for entity in list(tab.saved.values()):
+					entity._row = self._patched_row(entity._row, rows.get(entity._row_id, {}))
+				self._shift_saved(tab)
+				if appended_from is not None:
+					for offset, (row, entity) in enumerate(tab.appends):
+						if entity is not None:
+							entity._row_id, entity._row = appended_from + offset, tuple(row)
+				return
+
+			for row_index, row_cells in list(rows.items()):
+				position = row_index - header_index - 1
+				if 0 <= position < len(snapshot):
+					self._set_row(position, self._patched_row(snapshot.rows[position], row_cells))
+			for entity in list(tab.saved.values()):
+				position = entity._row_id - header_index - 1
+				if 0 <= position < len(snapshot):
+					entity._row = snapshot.rows[position]
+
+			if tab.deletes:
+				snapshot.delete_rows({row_index - header_index - 1 for row_index in tab.deletes})
+				self._shift_saved(tab)
+
+			if tab.appends and appended_from is not None and appended_from != header_index + 1 + len(snapshot):
+				# the sheet holds rows the snapshot doesn't know about
+				for offset, (row, entity) in enumerate(tab.appends):
+					if entity is not None:
+						entity._row_id, entity._row = appended_from + offset, tuple(row)
+				self._setup_attrs(reload=True)
+				return
+
+			for row, entity in tab.appends:
+				row_data = snapshot.append_row(row)
+				if not tab.deletes:
+					self._append_to_columns(len(snapshot) - 1, row_data)
+				if entity is not None:
+					entity._row_id, entity._row = header_index + len(snapshot), row_data
+
+			if tab.deletes:
+				# positions after a deleted row all shift
+				self._build_column_store(incremental=False)
+
+	@staticmethod
+	def _shift_saved(tab: TabWrites):
+		"""Moves the row numbers of saved entities up past the rows deleted above them"""
+		if not tab.deletes:
+			return
+		deleted = sorted(tab.deletes)
+		for entity in list(tab.saved.values()):
+			if entity._row_id is not None:
+				entity._row_id -= bisect_left(deleted, entity._row_id)
+
+	@staticmethod
+	def _patched_row(row_data, row_cells: dict) -> tuple:
+		row = list(row_data or ())
+		for col_index, raw in list(row_cells.items()):
+			if col_index > len(row):
+				row.extend([""] * (col_index - len(row)))
+			row[col_index - 1] = raw
+		return tuple(row)
+
+	def _set_row(self, position: int, row):
+		snapshot = getattr(self.model, "_snapshot")
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+		columns, indexes = getattr(self.model, "_columns"), getattr(self.model, "_indexes")
+
+		row_data = snapshot.set_row(position, row)
+		for attr, column in list(columns.columns.items()):
+			old_key = index_key(column, position)
+			column.set(position, *parse_cell(meta[attr], row_data[meta[attr]._meta.get("index")]))
+			indexes.patch(attr, position, old_key)
+
+	def _append_to_columns(self, position: int, row_data: tuple):
+		meta: dict[str, "Field"] = getattr(self.model, "_meta")
+		columns, indexes = getattr(self.model, "_columns"), getattr(self.model, "_indexes")
+
+		for attr, column in list(columns.columns.items()):
+			column.append(*parse_cell(meta[attr], row_data[meta[attr]._meta.get("index")]))
+			indexes.patch(attr, position)
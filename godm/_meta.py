@@ -1,40 +1,152 @@
-from ._auth import get_sheet
+import logging
+from typing import TYPE_CHECKING
+
+from ._async import AsyncGModelManager
+from ._cache import cache_dir, read_snapshot, sheet_version, write_snapshot
+from ._decoder import RowDecoder
 from ._manager import GModelManager
+from ._relations import register
+from ._session import current_session
+from ._snapshot import Snapshot
+from .backends import backend_for
 from .exceptions import FieldException
 from .field import Field
+from .instrumentation import cache_lookup
+
+if TYPE_CHECKING:
+	from ._loader import TabValues
+
+logger = logging.getLogger(__name__)
+
+
+def _load_values(spreadsheet, worksheet, header_index: int, cached: bool = True) -> tuple:
+	"""Whole tab values for a snapshot, from the disk cache when the spreadsheet hasn't changed since
+
+	Args:
+		cached (bool, optional): Whether the backend is worth caching on disk. Defaults to True.
+
+	Returns:
+		tuple: (values, spreadsheet version they were read at)
+	"""
+	# probed before the read, so a change made meanwhile shows up on the next refresh
+	version = sheet_version(spreadsheet)
+	if not cached or not cache_dir():
+		return worksheet.get_all_values(), version
+
+	values = read_snapshot(spreadsheet.id, worksheet.id, header_index, version)
+	cache_lookup("snapshot", values is not None, sheet=spreadsheet.id, tab=worksheet.title)
+	if values is None:
+		values = worksheet.get_all_values()
+		write_snapshot(spreadsheet.id, worksheet.id, header_index, version, values)
+
+	return values, version
 
 
 class GModelMeta(type):
 
 	def __new__(mcs, *args, **kwargs):
 		(name, bases, attrs) = args
+
+		fields = {attr: obj for attr, obj in list(attrs.items()) if isinstance(obj, Field)}
+		if name != "GModel":
+			# entities are compact records: one slot per declared field plus the row reference from GModel
+			for attr in fields:
+				del attrs[attr]
+			attrs["__slots__"] = tuple(attrs.get("__slots__", ())) + tuple(_value_slot(attr) for attr in fields)
+
 		cls = super().__new__(mcs, *args, **kwargs)
 		if name != "GModel":
-			def _setup_attrs():
+			cls._fields = fields
+			register(cls)
+			for attr in fields:
+				setattr(cls, attr, FieldDescriptor(attr, getattr(cls, _value_slot(attr))))
+
+			def _setup_attrs(prefetched: "TabValues" = None):
 				class_meta = getattr(cls, "Meta")
 
-				spreed_sheet = get_sheet(getattr(class_meta, "sheet_name", "default"))
-				cls._data = spreed_sheet.worksheet(getattr(class_meta, "tab_name"))
-				cls._headers = cls._data.row_values(getattr(class_meta, "header_index"))
+				backend = backend_for(class_meta)
+				if prefetched is None:
+					spreed_sheet, cls._data = backend.open(class_meta)
+				else:
+					spreed_sheet, cls._data = prefetched.spreadsheet, prefetched.worksheet
+				header_index = getattr(class_meta, "header_index")
+
+				if getattr(class_meta, "snapshot", False):
+					if prefetched is None:
+						values, version = _load_values(spreed_sheet, cls._data, header_index, backend.cached)
+					else:
+						values, version = prefetched.values, prefetched.version
+					cls._snapshot = Snapshot(values, header_index, version)
+					cls._headers = cls._snapshot.headers
+				elif prefetched is None:
+					cls._snapshot = None
+					cls._headers = cls._data.row_values(header_index)
+				else:
+					cls._snapshot = None
+					cls._headers = list(prefetched.values)
 
 				cls._meta = {}
 				cls._errors = {}
 				cls_annotations = {}
-				for attr, obj in list(attrs.items()):
-					# if not attr.startswith("__") and attr != "Meta" and not hasattr(obj, "__call__"):
-					if isinstance(obj, Field):
-						delattr(cls, attr)
-						try:
-							obj.validate(cls._headers)
-						except FieldException as ex:
-							cls._errors[attr] = str(ex)
-						except Exception as ex:
-							print(ex)
-						else:
-							cls._meta[attr] = obj
-						cls_annotations[attr] = str
+				for attr, obj in list(cls._fields.items()):
+					try:
+						obj.validate(cls._headers)
+					except FieldException as ex:
+						cls._errors[attr] = str(ex)
+					except Exception as ex:
+						logger.warning("Field %s of %s failed to validate: %s", attr, cls.__name__, ex)
+					else:
+						cls._meta[attr] = obj
+					cls_annotations[attr] = str
 
 				setattr(cls, "__annotations__", cls_annotations)
+				cls._decoder = RowDecoder(cls._meta)
+
+				# parse every column once per snapshot, entities then read the typed values
+				cls.manager._build_column_store()
+
 			setattr(cls, "manager", GModelManager(cls, _setup_attrs))
+			setattr(cls, "amanager", AsyncGModelManager(cls.manager))
+			cls.manager._apply_load_policy()
 
 		return cls
+
+
+def _value_slot(attr: str) -> str:
+	return f"_value_{attr}"
+
+
+class FieldDescriptor(object):
+	"""Decodes a field on first access and memoizes it in the field's slot of the entity"""
+
+	def __init__(self, attr: str, slot):
+		self.attr = attr
+		self.slot = slot
+
+	def __get__(self, instance, owner):
+		if instance is None:
+			return self
+
+		try:
+			return self.slot.__get__(instance, owner)
+		except AttributeError:
+			value, _ = owner.manager.decode_field(self.attr, instance._row_id, instance._row)
+			self.slot.__set__(instance, value)
+			return value
+
+	def peek(self, instance) -> tuple:
+		"""Value held by the entity without decoding it
+
+		Returns:
+			tuple: (whether the field was decoded or assigned, value)
+		"""
+		try:
+			return True, self.slot.__get__(instance, type(instance))
+		except AttributeError:
+			return False, None
+
+	def __set__(self, instance, value):
+		self.slot.__set__(instance, value)
+		session = current_session()
+		if session is not None:
+			session.assigned(instance, self.attr)
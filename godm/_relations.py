@@ -0,0 +1,168 @@
+from typing import TYPE_CHECKING
+
+from ._columns import ListColumn
+from ._index import _UNINDEXED, HashIndex, index_key
+from .exceptions import FieldException
+from .field import ForeignKeyField
+
+if TYPE_CHECKING:
+	from ._columns import Column
+	from .model import GModel
+
+# module.qualname -> model, ForeignKeyField targets given by name are resolved here
+_models = dict()
+
+
+def model_key(model: type) -> str:
+	return f"{model.__module__}.{model.__qualname__}"
+
+
+def register(model: type):
+	# a model declared again under the same module.qualname (a reloaded module) replaces the previous one
+	_models[model_key(model)] = model
+
+
+def model_for(to) -> type:
+	"""Model of a ForeignKeyField target, given as the class, its ``module.qualname`` or its class name when no
+	other model has the same one
+	"""
+	if not isinstance(to, str):
+		return to
+	if to in _models:
+		return _models[to]
+
+	found = [model for model in list(_models.values()) if model.__name__ == to]
+	if not found:
+		raise FieldException(f"Unknown model {to}")
+	if len(found) > 1:
+		keys = ", ".join(sorted(model_key(model) for model in found))
+		raise FieldException(f"Several models are named {to} ({keys}), give the target as a module.qualname")
+	return found[0]
+
+
+def related_cache(entity: "GModel") -> dict:
+	"""Related entities resolved for an entity, by relation name"""
+	try:
+		return entity._related
+	except AttributeError:
+		entity._related = dict()
+		return entity._related
+
+
+def _key_column(model: type, attr: str) -> "Column":
+	manager = model.manager
+	manager._setup_attrs()
+	columns, _ = manager._filter_columns([attr])
+	column = columns[attr]
+	if isinstance(column, ListColumn):
+		raise FieldException(f"ListField {attr} of {model.__name__} can't be a relation key")
+	return column
+
+
+def _normalized(column: "Column", value):
+	"""Lookup value converted to the key the column's rows are hashed under"""
+	if value is None:
+		return None
+	try:
+		return column.to_search(value)
+	except (TypeError, ValueError):
+		return None
+
+
+def _build_side(column: "Column", model: type, attr: str) -> dict:
+	"""Hash table of a key column: key -> positions. The field's hash index is used as it is when there is one"""
+	indexes = getattr(model, "_indexes", None)
+	index = indexes.find(attr, "eq") if indexes is not None else None
+	if isinstance(index, HashIndex) and index.column is column:
+		return index.buckets
+
+	buckets = dict()
+	for position in range(len(column)):
+		key = index_key(column, position)
+		if key is not None and key is not _UNINDEXED:
+			buckets.setdefault(key, []).append(position)
+	return buckets
+
+
+def _entities(model: type, positions: set) -> dict:
+	"""One entity per position, the rows are fetched together"""
+	manager = model.manager
+	first_row = manager._get_header_index() + 1
+	rows = manager._fetch_rows(sorted(first_row + position for position in positions))
+	return {row_index - first_row: manager.get_entity_from_id(row_index, row) for row_index, row in list(rows.items())}
+
+
+def _foreign_key(model: type, attr: str) -> ForeignKeyField:
+	field = getattr(model, "_fields", {}).get(attr)
+	if not isinstance(field, ForeignKeyField):
+		raise FieldException(f"{attr} is not a ForeignKeyField of {model.__name__}")
+	return field
+
+
+def _reverse_relation(model: type, name: str) -> tuple:
+	"""(referencing model, its foreign key attribute, the key attribute of ``model``) of a related_name"""
+	for source in list(_models.values()):
+		for attr, field in list(getattr(source, "_fields", {}).items()):
+			meta = field._meta
+			if isinstance(field, ForeignKeyField) and meta.get("related_name") == name and model_for(meta["to"]) is model:
+				return source, attr, meta["to_field"]
+	raise FieldException(f"{name} is not a relation of {model.__name__}")
+
+
+def select_related(entities: list, attr: str):
+	"""Resolves a foreign key for all the entities with one hash join: the target's key column is the build
+	side, each entity's key probes it, and the matched target rows are fetched together. Entities whose key
+	matches no row get None
+	"""
+	if not entities:
+		return
+	field = _foreign_key(type(entities[0]), attr)
+	target = model_for(field._meta["to"])
+	to_field = field._meta["to_field"]
+
+	column = _key_column(target, to_field)
+	buckets = _build_side(column, target, to_field)
+
+	matches = []
+	for entity in entities:
+		found = buckets.get(_normalized(column, getattr(entity, attr)))
+		matches.append(found[0] if found else None)
+
+	related = _entities(target, {position for position in matches if position is not None})
+	for entity, position in zip(entities, matches):
+		related_cache(entity)[attr] = related.get(position)
+
+
+def prefetch_related(entities: list, name: str):
+	"""Resolves a reverse relation, the entities of another model whose foreign key points at each entity, with
+	one hash join over that model's foreign key column
+	"""
+	if not entities:
+		return
+	model = type(entities[0])
+	source, fk_attr, to_field = _reverse_relation(model, name)
+
+	key_column = _key_column(model, to_field)
+	fk_column = _key_column(source, fk_attr)
+
+	buckets = dict()
+	for position in range(len(fk_column)):
+		key = _normalized(key_column, fk_column.value(position))
+		if key is not None:
+			buckets.setdefault(key, []).append(position)
+
+	matches = [buckets.get(_normalized(key_column, getattr(entity, to_field)), []) for entity in entities]
+
+	related = _entities(source, {position for found in matches for position in found})
+	for entity, found in zip(entities, matches):
+		related_cache(entity)[name] = [related[position] for position in found]
+
+
+def resolve(entities: list, name: str):
+	"""Resolves a foreign key attribute or a related_name for all the entities"""
+	if not entities:
+		return
+	if isinstance(getattr(type(entities[0]), "_fields", {}).get(name), ForeignKeyField):
+		select_related(entities, name)
+	else:
+		prefetch_related(entities, name)
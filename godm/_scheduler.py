@@ -0,0 +1,198 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import unquote
+
+import gspread
+
+from .instrumentation import timed
+
+# Sheets API quotas, requests per minute
+READ_PER_USER = 60
+WRITE_PER_USER = 60
+READ_PER_PROJECT = 300
+WRITE_PER_PROJECT = 300
+
+MAX_RETRIES = 6
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 64.0
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket(object):
+	"""Allows ``rate_per_minute`` requests per minute, in bursts of at most ``capacity``"""
+
+	def __init__(self, rate_per_minute: float, capacity: float = None):
+		self.rate = rate_per_minute / 60.0
+		self.capacity = capacity if capacity is not None else rate_per_minute
+		self.tokens = self.capacity
+		self.updated_at = time.monotonic()
+		self._lock = threading.Lock()
+
+	def _refill(self, now: float):
+		self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+		self.updated_at = now
+
+	def acquire(self):
+		"""Blocks until a token is free and takes it"""
+		while True:
+			with self._lock:
+				self._refill(time.monotonic())
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+				wait = (1 - self.tokens) / self.rate
+			time.sleep(wait)
+
+
+def _status(ex: Exception) -> int:
+	response = getattr(ex, "response", None)
+	return getattr(response, "status_code", None)
+
+
+def backoff(attempt: int) -> float:
+	"""Exponential backoff with full jitter"""
+	return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+
+
+class Scheduler(object):
+	"""Every Sheets request goes through here.
+
+	Reads and writes each take a token of the per-user and the per-project bucket, so requests are held back
+	rather than rejected once the quota is used up. Requests still answered with 429, or with a 5xx for reads,
+	are retried with exponential backoff. A write answered with a 5xx may have been applied, and appends and row
+	deletes must not be repeated, so those are raised. Identical reads made at the same time share one request.
+	"""
+
+	def __init__(self, read_per_user: float = READ_PER_USER, write_per_user: float = WRITE_PER_USER,
+	             read_per_project: float = READ_PER_PROJECT, write_per_project: float = WRITE_PER_PROJECT,
+	             max_retries: int = MAX_RETRIES):
+		self.buckets = {
+			"read": [TokenBucket(read_per_user), TokenBucket(read_per_project)],
+			"write": [TokenBucket(write_per_user), TokenBucket(write_per_project)],
+		}
+		self.max_retries = max_retries
+		self._in_flight = dict()
+		self._lock = threading.Lock()
+
+	def call(self, kind: str, function, key=None):
+		"""Runs one request
+
+		Args:
+			kind (str): ``read`` or ``write``
+			function (callable): Sends the request
+			key (optional): Identifies a read, concurrent reads with the same key share one request
+
+		Returns:
+			The result of ``function``
+		"""
+		if kind != "read" or key is None:
+			return self._call(kind, function)
+
+		with self._lock:
+			future = self._in_flight.get(key)
+			owner = future is None
+			if owner:
+				future = self._in_flight[key] = Future()
+
+		if not owner:
+			return future.result()
+
+		try:
+			result = self._call(kind, function)
+		except BaseException as ex:
+			future.set_exception(ex)
+			raise
+		else:
+			future.set_result(result)
+			return result
+		finally:
+			with self._lock:
+				self._in_flight.pop(key, None)
+
+	def _call(self, kind: str, function):
+		attempt = 0
+		while True:
+			for bucket in self.buckets[kind]:
+				bucket.acquire()
+			try:
+				return function()
+			except gspread.exceptions.APIError as ex:
+				status = _status(ex)
+				retry = status == 429 or (kind == "read" and status in RETRY_STATUSES)
+				if not retry or attempt >= self.max_retries:
+					raise
+			time.sleep(backoff(attempt))
+			attempt += 1
+
+
+_scheduler = Scheduler()
+
+
+def scheduler() -> Scheduler:
+	return _scheduler
+
+
+def set_rate_limits(**limits) -> None:
+	"""Replaces the request scheduler, e.g. for a project with raised quotas
+
+	Args:
+		read_per_user (float, optional): Read requests per minute per user. Defaults to 60.
+		write_per_user (float, optional): Write requests per minute per user. Defaults to 60.
+		read_per_project (float, optional): Read requests per minute per project. Defaults to 300.
+		write_per_project (float, optional): Write requests per minute per project. Defaults to 300.
+		max_retries (int, optional): Retries of a throttled request before it is raised. Defaults to 6.
+	"""
+	global _scheduler
+
+	_scheduler = Scheduler(**limits)
+
+
+def _request_key(method: str, endpoint: str, arguments: list):
+	try:
+		return method, endpoint, json.dumps(arguments, sort_keys=True, default=str)
+	except (TypeError, ValueError):
+		return None
+
+
+def _request_range(endpoint: str, params: dict):
+	"""A1 range(s) a request reads or writes, when the endpoint or its params tell"""
+	ranges = (params or {}).get("ranges")
+	if ranges:
+		return ranges if isinstance(ranges, str) else ",".join(ranges)
+	if "/values/" in endpoint:
+		a1 = unquote(endpoint.split("/values/", 1)[1])
+		for suffix in (":append", ":clear"):
+			if a1.endswith(suffix):
+				a1 = a1[:-len(suffix)]
+		return a1
+	return None
+
+
+class ScheduledClient(gspread.Client):
+	""":class:`gspread.Client` whose requests go through the scheduler. Everything gspread sends, for the
+	spreadsheets and the worksheets opened with it too, passes ``Client.request`` (up to gspread 5, gspread 6 sends
+	through a separate HTTP client)
+	"""
+
+	def _send(self, method, endpoint, *args, **kwargs):
+		"""Sends one attempt of a request, emitting an ``api_call`` event"""
+		range_name = _request_range(endpoint, kwargs.get("params"))
+		with timed("api_call", method=method.lower(), endpoint=endpoint, range=range_name) as attributes:
+			try:
+				response = super(ScheduledClient, self).request(method, endpoint, *args, **kwargs)
+			except gspread.exceptions.APIError as ex:
+				attributes["status"] = _status(ex)
+				raise
+			attributes["status"] = getattr(response, "status_code", None)
+			attributes["bytes"] = len(getattr(response, "content", None) or b"")
+			return response
+
+	def request(self, method, endpoint, *args, **kwargs):
+		request = lambda: self._send(method, endpoint, *args, **kwargs)
+		if method.lower() == "get":
+			return scheduler().call("read", request, _request_key(method, endpoint, [args, kwargs]))
+		return scheduler().call("write", request)
@@ -0,0 +1,109 @@
+import threading
+from typing import TYPE_CHECKING
+
+from ._writer import WriteBatch
+
+if TYPE_CHECKING:
+	from .model import GModel
+
+_local = threading.local()
+
+
+def current_session() -> "Session":
+	"""Session open on this thread, or None"""
+	return getattr(_local, "session", None)
+
+
+class Session(object):
+	"""Unit of work over any number of models and spreadsheets.
+
+	Entities loaded while the session is open are tracked, and on exit the ones with changed fields are saved
+	along with the inserts and deletes made meanwhile. Nothing is sent before that: every spreadsheet then
+	gets a single ``batch_update``, with contiguous cells merged into one range and only the last write of a
+	cell kept. Writes are staged in the order they are made, a field assigned on a tracked entity as soon as it
+	is assigned, so the last write is the one made last. When the block raises, the pending changes are
+	discarded.
+	"""
+
+	def __init__(self):
+		self.batch = WriteBatch(single_request=True)
+		# id() -> entity, in the order they were first seen
+		self._tracked = dict()
+		self._deleted = dict()
+		self._depth = 0
+
+	def __enter__(self):
+		if self._depth == 0:
+			self._outer = current_session()
+			_local.session = self
+		self._depth += 1
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self._depth -= 1
+		if self._depth > 0:
+			return False
+
+		_local.session = self._outer
+		if exc_type is None:
+			self.flush()
+		else:
+			self.clear()
+		return False
+
+	def track(self, entity: "GModel"):
+		self._tracked.setdefault(id(entity), entity)
+
+	def assigned(self, entity: "GModel", attr: str):
+		"""Stages the cell of a field just assigned on a tracked entity"""
+		if entity._row_id is not None and id(entity) in self._tracked:
+			entity.manager._stage_field(self.batch, entity, attr)
+
+	def add(self, entity: "GModel"):
+		"""Saves the entity: loaded ones get their changed cells staged now, new ones are inserted on flush"""
+		self._deleted.pop(id(entity), None)
+		self.track(entity)
+		if entity._row_id is not None:
+			entity.manager._stage_save(self.batch, entity)
+
+	def delete(self, entity: "GModel"):
+		if entity._row_id is not None:
+			self._deleted[id(entity)] = entity
+		else:
+			# never written, so there is nothing to delete
+			self._tracked.pop(id(entity), None)
+
+	def clear(self):
+		self.batch = WriteBatch(single_request=True)
+		self._tracked = dict()
+		self._deleted = dict()
+
+	def flush(self):
+		"""Sends the pending changes now"""
+		tracked, deleted = self._tracked, self._deleted
+		for key, entity in list(tracked.items()):
+			if key not in deleted:
+				# changes made in place, e.g. to a list value, were not staged by an assignment
+				entity.manager._stage_save(self.batch, entity, keep_staged=True)
+		for entity in list(deleted.values()):
+			self.batch.delete(entity.manager, entity._row_id)
+
+		batch = self.batch
+		self.clear()
+		batch.flush()
+
+		for entity in list(deleted.values()):
+			entity._row_id = None
+
+
+def session() -> Session:
+	"""Opens a unit of work, see :class:`Session`
+
+	Usage::
+
+		with godm.session():
+			user = Users.manager.get(name="Anil")
+			user.age = 36
+			Orders(user="Anil", total=10).save()
+	"""
+	return current_session() or Session()
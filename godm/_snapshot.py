@@ -0,0 +1,73 @@
+import time
+
+
+class Snapshot(object):
+	"""In-memory copy of a whole worksheet tab, fetched with a single bulk read.
+
+	It exposes the same 1-based ``row_values`` / ``col_values`` lookups as :class:`gspread.Worksheet`, so the
+	manager can read from either of them without caring which one is behind.
+	"""
+
+	def __init__(self, values: list, header_index: int, version: str = None):
+		self.header_index = header_index
+		# spreadsheet version the values were read at, see :func:`godm._cache.sheet_version`
+		self.version = version
+		self.preamble = [tuple(row) for row in values[:header_index - 1]]
+		self.headers = list(values[header_index - 1]) if len(values) >= header_index else []
+
+		width = len(self.headers)
+		self.rows = [self._pad(row, width) for row in values[header_index:]]
+		self.loaded_at = time.monotonic()
+
+	@staticmethod
+	def _pad(row, width):
+		if len(row) < width:
+			return tuple(row) + ("",) * (width - len(row))
+		return tuple(row)
+
+	def set_row(self, position: int, row) -> tuple:
+		self.rows[position] = self._pad(row, len(self.headers))
+		return self.rows[position]
+
+	def append_row(self, row) -> tuple:
+		self.rows.append(self._pad(row, len(self.headers)))
+		return self.rows[-1]
+
+	def delete_rows(self, positions: set):
+		self.rows = [row for position, row in enumerate(self.rows) if position not in positions]
+
+	def values(self) -> list:
+		"""Whole tab values, as read by ``get_all_values``"""
+		return [list(row) for row in self.preamble] + [list(self.headers)] + [list(row) for row in self.rows]
+
+	def touch(self, version: str = None):
+		"""Marks the snapshot as fresh"""
+		self.version = version
+		self.loaded_at = time.monotonic()
+
+	def __len__(self):
+		return len(self.rows)
+
+	def is_expired(self, ttl) -> bool:
+		if ttl is None:
+			return False
+		return time.monotonic() - self.loaded_at >= ttl
+
+	def row_ids(self):
+		"""Sheet row numbers of all the data rows below the header"""
+		first_row = self.header_index + 1
+		return range(first_row, first_row + len(self.rows))
+
+	def row_values(self, row_index: int) -> tuple:
+		if row_index < self.header_index:
+			return self.preamble[row_index - 1]
+		if row_index == self.header_index:
+			return tuple(self.headers)
+		return self.rows[row_index - self.header_index - 1]
+
+	def col_values(self, col_index: int) -> list:
+		index = col_index - 1
+		values = [row[index] if index < len(row) else "" for row in self.preamble]
+		values.append(self.headers[index] if index < len(self.headers) else "")
+		values.extend(row[index] if index < len(row) else "" for row in self.rows)
+		return values
@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from ._loader import batches, load_batch
+
+BACKGROUND_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# models waiting for a background load, with the future of their load
+_queued = []
+_queued_lock = threading.Lock()
+
+
+def background_executor() -> ThreadPoolExecutor:
+	"""Shared thread pool loading the models declared with ``LoadPolicy.BACKGROUND``"""
+	global _executor
+
+	with _executor_lock:
+		if _executor is None:
+			_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="godm-warmup")
+	return _executor
+
+
+def load_queued(model, executor: Executor = None) -> Future:
+	"""Queues a model for a background load. The queue is loaded by a task of the pool, so the models declared
+	until it starts and sharing a spreadsheet are read together, see :func:`godm.load_all`
+
+	Args:
+		model: Model class
+		executor (Executor, optional): Pool to load on. Defaults to the shared background pool.
+
+	Returns:
+		:class:`concurrent.futures.Future`: resolves once the model is loaded
+	"""
+	future = Future()
+	with _queued_lock:
+		_queued.append((model, future))
+	(executor or background_executor()).submit(_load_queue)
+	return future
+
+
+def _load_queue():
+	with _queued_lock:
+		queued = dict(_queued)
+		_queued.clear()
+
+	for batch in batches(list(queued)):
+		try:
+			load_batch(batch)
+		except BaseException as ex:
+			for model in batch:
+				queued[model].set_exception(ex)
+		else:
+			for model in batch:
+				queued[model].set_result(None)
+
+
+def warmup(models: list, max_workers: int = None, wait: bool = True) -> dict:
+	"""Loads several models concurrently in a thread pool: spreadsheets, worksheets, headers and snapshots.
+	The models sharing a Google spreadsheet are loaded together by one task, see :func:`godm.load_all`.
+
+	A model accessed while it is still loading blocks only until its own load is finished.
+
+	Args:
+		models (list): Model classes to load
+		max_workers (int, optional): Size of the thread pool. Defaults to one thread per load.
+		wait (bool, optional): Wait for all the models to be loaded. Defaults to True.
+
+	Returns:
+		dict: model class -> :class:`concurrent.futures.Future` of its load
+	"""
+	models = list(models)
+	futures = {model: done_future() for model in models if model.manager.setup}
+	loads = batches([model for model in models if model not in futures])
+	if not loads:
+		return futures
+
+	executor = ThreadPoolExecutor(max_workers=max_workers or len(loads), thread_name_prefix="godm-warmup")
+	for batch in loads:
+		future = executor.submit(load_batch, batch)
+		for model in batch:
+			model.manager.load_future = futures[model] = future
+	# already submitted loads still run, the threads exit once they are done
+	executor.shutdown(wait=False)
+
+	if wait:
+		for future in futures.values():
+			future.result()
+
+	return {model: futures[model] for model in models}
+
+
+def done_future() -> Future:
+	future = Future()
+	future.set_result(None)
+	return future
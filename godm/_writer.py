@@ -0,0 +1,303 @@
+import math
+from typing import TYPE_CHECKING
+
+from ._a1 import absolute, cell, range_start_row
+from .field import BooleanField, DecimalField, Field, IntegerField, ListField, StringField
+
+if TYPE_CHECKING:
+	from ._manager import GModelManager
+	from .model import GModel
+
+VALUE_INPUT_OPTION = "USER_ENTERED"
+
+
+def user_entered(raw: str, field: Field = None) -> str:
+	"""Cell text as typed by a user. Cells of text fields are quoted, so Sheets keeps them as they are rather than
+	turning ``0099`` into a number or ``1/2`` into a date. Text that Sheets would turn into a formula is kept as
+	plain text
+	"""
+	if raw and isinstance(field, (StringField, ListField)):
+		return "'" + raw
+	if raw[:1] in ("=", "'"):
+		return "'" + raw
+	if raw[:1] in ("+", "-"):
+		try:
+			float(raw)
+		except ValueError:
+			return "'" + raw
+	return raw
+
+
+def _number(raw: str) -> float:
+	try:
+		number = float(raw)
+	except ValueError:
+		return None
+	return number if math.isfinite(number) else None
+
+
+def extended_value(raw: str, field: Field = None) -> dict:
+	"""``CellData`` of a cell text for ``batch_update`` requests, typed after the field of its column: numbers for
+	numeric fields, booleans for boolean ones and text for the others, so a text like ``000123`` stays text. Cells
+	of columns without a field are typed the way Sheets would type them on input. Text is always sent as a string
+	value, so it can never turn into a formula
+	"""
+	if raw == "":
+		return dict()
+	if isinstance(field, (IntegerField, DecimalField)):
+		number = _number(raw)
+		if number is not None:
+			return {"userEnteredValue": {"numberValue": number}}
+	elif isinstance(field, BooleanField):
+		return {"userEnteredValue": {"boolValue": raw == "TRUE"}}
+	elif field is None:
+		if raw in ("TRUE", "FALSE"):
+			return {"userEnteredValue": {"boolValue": raw == "TRUE"}}
+		number = _number(raw)
+		if number is not None:
+			return {"userEnteredValue": {"numberValue": number}}
+	return {"userEnteredValue": {"stringValue": raw}}
+
+
+def entered_rows(rows: list, fields: dict = None, start_col: int = 1) -> list:
+	"""Rows of cell texts as typed by a user, for ``USER_ENTERED`` writes
+
+	Args:
+		fields (dict, optional): column number -> field, see :attr:`TabWrites.fields`
+		start_col (int, optional): Column number of the first cell of the rows. Defaults to 1.
+	"""
+	fields = fields or dict()
+	return [[user_entered(raw, fields.get(start_col + offset)) for offset, raw in enumerate(row)] for row in rows]
+
+
+def row_data(rows: list, fields: dict = None, start_col: int = 1) -> list:
+	"""``RowData`` of rows of cell texts
+
+	Args:
+		fields (dict, optional): column number -> field, see :attr:`TabWrites.fields`
+		start_col (int, optional): Column number of the first cell of the rows. Defaults to 1.
+	"""
+	fields = fields or dict()
+	return [
+		{"values": [extended_value(raw, fields.get(start_col + offset)) for offset, raw in enumerate(row)]}
+		for row in rows
+	]
+
+
+def row_spans(row_indexes) -> list:
+	"""Contiguous ``(start, end)`` spans of row numbers, in ascending order"""
+	spans = []
+	for row_index in sorted(set(row_indexes)):
+		if spans and spans[-1][1] == row_index - 1:
+			spans[-1][1] = row_index
+		else:
+			spans.append([row_index, row_index])
+	return [tuple(span) for span in spans]
+
+
+def coalesce(cells: dict) -> list:
+	"""Merges single cell writes into as few rectangular blocks as possible. Contiguous cells of a row form a
+	segment, and the same segment on consecutive rows extends the block
+
+	Args:
+		cells (dict): (row number, column number) -> value
+
+	Returns:
+		list: (first row, first column, 2D values) per block
+	"""
+	rows = dict()
+	for (row_index, col_index), value in list(cells.items()):
+		rows.setdefault(row_index, dict())[col_index] = value
+
+	open_blocks = dict()
+	blocks = []
+	for row_index in sorted(rows):
+		row = rows[row_index]
+		segments = []
+		for col_index in sorted(row):
+			if segments and segments[-1][1] == col_index - 1:
+				segments[-1][1] = col_index
+				segments[-1][2].append(row[col_index])
+			else:
+				segments.append([col_index, col_index, [row[col_index]]])
+
+		for start_col, end_col, values in segments:
+			block = open_blocks.get((start_col, end_col))
+			if block is not None and block[0] + len(block[2]) == row_index:
+				block[2].append(values)
+			else:
+				block = (row_index, start_col, [values])
+				open_blocks[(start_col, end_col)] = block
+				blocks.append(block)
+
+	return blocks
+
+
+class TabWrites(object):
+	"""Pending writes of one model's worksheet"""
+
+	def __init__(self, manager: "GModelManager"):
+		self.manager = manager
+		# (row number, column number) -> cell text, the last write of a cell wins
+		self.cells = dict()
+		self.appends = []
+		self.deletes = set()
+		# id() -> saved entity whose raw row is refreshed once the writes are applied
+		self.saved = dict()
+
+	@property
+	def worksheet(self):
+		return getattr(self.manager.model, "_data")
+
+	@property
+	def fields(self) -> dict:
+		"""column number -> field of the model, the cell types of the writes follow them"""
+		meta: dict[str, Field] = getattr(self.manager.model, "_meta")
+		return {field._meta.get("index") + 1: field for field in list(meta.values())}
+
+	def __bool__(self):
+		return bool(self.cells or self.appends or self.deletes)
+
+
+class WriteBatch(object):
+	"""Collects cell updates, row appends and row deletes and sends them coalesced per spreadsheet
+
+	Args:
+		single_request (bool, optional): Send everything of a spreadsheet in a single ``batch_update``, used by
+			sessions. Appends of models without a snapshot still go out on their own, as only the append
+			response tells which rows they landed on
+	"""
+
+	def __init__(self, single_request: bool = False):
+		self.single_request = single_request
+		self.tabs = dict()
+
+	def tab(self, manager: "GModelManager") -> TabWrites:
+		if manager not in self.tabs:
+			self.tabs[manager] = TabWrites(manager)
+		return self.tabs[manager]
+
+	def update(self, manager: "GModelManager", row_index: int, col_index: int, raw: str):
+		self.tab(manager).cells[(row_index, col_index)] = raw
+
+	def save(self, manager: "GModelManager", entity: "GModel", cells: dict):
+		"""Updates the changed cells of an entity
+
+		Args:
+			cells (dict): column number -> cell text
+		"""
+		tab = self.tab(manager)
+		for col_index, raw in list(cells.items()):
+			tab.cells[(entity._row_id, col_index)] = raw
+		tab.saved[id(entity)] = entity
+
+	def append(self, manager: "GModelManager", row: list, entity: "GModel" = None):
+		self.tab(manager).appends.append((row, entity))
+
+	def delete(self, manager: "GModelManager", row_index: int):
+		self.tab(manager).deletes.add(row_index)
+
+	def _by_spreadsheet(self) -> list:
+		groups = dict()
+		for tab in list(self.tabs.values()):
+			if tab:
+				spreadsheet = tab.worksheet.spreadsheet
+				groups.setdefault(spreadsheet.id, (spreadsheet, []))[1].append(tab)
+		return list(groups.values())
+
+	def flush(self):
+		"""Sends everything. By default that is one ``values_batch_update`` for the cell updates and one
+		``batch_update`` for the row deletes per spreadsheet, then one append per worksheet. Snapshots, column
+		stores and indexes of the models are patched afterwards
+		"""
+		for spreadsheet, tabs in self._by_spreadsheet():
+			for tab in tabs:
+				# cells of rows that are deleted anyway are not worth sending
+				for row_index, col_index in [key for key in tab.cells if key[0] in tab.deletes]:
+					del tab.cells[(row_index, col_index)]
+
+			if self.single_request:
+				appended = self._send_single_request(spreadsheet, tabs)
+			else:
+				appended = self._send(spreadsheet, tabs)
+
+			for tab in tabs:
+				tab.manager._apply_writes(tab, appended.get(tab.manager))
+
+		self.tabs = dict()
+
+	@staticmethod
+	def _delete_requests(tabs: list) -> list:
+		requests = []
+		for tab in tabs:
+			for start, end in row_spans(tab.deletes):
+				requests.append({"deleteDimension": {"range": {
+					"sheetId": tab.worksheet.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end,
+				}}})
+		# bottom up, so a delete never shifts the rows of the next one
+		requests.sort(key=lambda request: -request["deleteDimension"]["range"]["startIndex"])
+		return requests
+
+	@staticmethod
+	def _append_rows(tab: TabWrites) -> int:
+		"""Appends the new rows of a worksheet
+
+		Returns:
+			int: row number the first appended row landed on, None when the response doesn't tell
+		"""
+		response = tab.worksheet.append_rows(
+			entered_rows([row for row, _ in tab.appends], tab.fields),
+			value_input_option=VALUE_INPUT_OPTION,
+			table_range=cell(tab.manager._get_header_index(), 1),
+		)
+		updated_range = (response or {}).get("updates", {}).get("updatedRange")
+		return range_start_row(updated_range) if updated_range else None
+
+	def _send(self, spreadsheet, tabs: list) -> dict:
+		data = []
+		for tab in tabs:
+			for start_row, start_col, values in coalesce(tab.cells):
+				data.append({
+					"range": absolute(tab.worksheet.title, cell(start_row, start_col)),
+					"values": entered_rows(values, tab.fields, start_col),
+				})
+		if data:
+			spreadsheet.values_batch_update({"valueInputOption": VALUE_INPUT_OPTION, "data": data})
+
+		requests = self._delete_requests(tabs)
+		if requests:
+			spreadsheet.batch_update({"requests": requests})
+
+		return {tab.manager: self._append_rows(tab) for tab in tabs if tab.appends}
+
+	def _send_single_request(self, spreadsheet, tabs: list) -> dict:
+		requests = []
+		for tab in tabs:
+			for start_row, start_col, values in coalesce(tab.cells):
+				requests.append({"updateCells": {
+					"start": {"sheetId": tab.worksheet.id, "rowIndex": start_row - 1, "columnIndex": start_col - 1},
+					"rows": row_data(values, tab.fields, start_col),
+					"fields": "userEnteredValue",
+				}})
+
+		# cells are addressed by their row numbers before the deletes, so these come after the updates
+		requests.extend(self._delete_requests(tabs))
+
+		appended = dict()
+		for tab in tabs:
+			if tab.appends and getattr(tab.manager.model, "_snapshot", None) is not None:
+				# lands right after the rows the snapshot holds, which _apply_writes takes for granted
+				requests.append({"appendCells": {
+					"sheetId": tab.worksheet.id,
+					"rows": row_data([row for row, _ in tab.appends], tab.fields),
+					"fields": "userEnteredValue",
+				}})
+				appended[tab.manager] = None
+
+		if requests:
+			spreadsheet.batch_update({"requests": requests})
+
+		for tab in tabs:
+			if tab.appends and tab.manager not in appended:
+				appended[tab.manager] = self._append_rows(tab)
+		return appended
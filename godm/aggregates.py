@@ -0,0 +1,242 @@
+from typing import TYPE_CHECKING
+
+from ._columns import CategoricalColumn, ListColumn, NumberColumn
+from ._filter import column_array, null_array, numpy
+from .exceptions import FieldException
+
+if TYPE_CHECKING:
+	from ._columns import Column
+	from ._manager import GModelManager
+
+
+class Aggregate(object):
+	"""Aggregate over the typed values of a field. Empty cells, and values that aren't of the field's type
+	(e.g. a ``default_val`` of another type), are left out.
+
+	Args:
+		field (str, optional): Field attribute, only :class:`Count` works without one
+	"""
+
+	# column types the aggregate is allowed on, None for all of them
+	column_types = None
+
+	def __init__(self, field: str = None):
+		if field is None and not isinstance(self, Count):
+			raise FieldException(f"{type(self).__name__} needs a field")
+		self.field = field
+
+	def __repr__(self):
+		return f"{type(self).__name__}({self.field!r})"
+
+	def check(self, column: "Column"):
+		if self.column_types is not None and not isinstance(column, self.column_types):
+			raise FieldException(f"{type(self).__name__} is not supported on field {column.field.name}")
+
+	def compute(self, values: list):
+		"""Aggregates a list of stored values"""
+		raise NotImplementedError
+
+	def compute_array(self, values):
+		"""Aggregates a NumPy array of stored values"""
+		raise NotImplementedError
+
+	def result(self, column: "Column", value):
+		return value
+
+
+class Count(Aggregate):
+	"""Number of rows, or of rows holding a value of the field's type when a field is given"""
+
+	def compute(self, values: list):
+		return len(values)
+
+	def compute_array(self, values):
+		return int(values.size)
+
+
+class Sum(Aggregate):
+	"""Total of a number field"""
+
+	column_types = (NumberColumn,)
+
+	def compute(self, values: list):
+		return sum(values)
+
+	def compute_array(self, values):
+		return values.sum().item()
+
+
+class Avg(Aggregate):
+	"""Mean of a number field"""
+
+	column_types = (NumberColumn,)
+
+	def compute(self, values: list):
+		return sum(values) / len(values) if values else None
+
+	def compute_array(self, values):
+		return values.mean().item() if values.size else None
+
+
+class Min(Aggregate):
+	"""Smallest value, of a number, date, boolean or text field"""
+
+	def check(self, column: "Column"):
+		if isinstance(column, ListColumn):
+			raise FieldException(f"{type(self).__name__} is not supported on field {column.field.name}")
+
+	def compute(self, values: list):
+		return min(values) if values else None
+
+	def compute_array(self, values):
+		return values.min().item() if values.size else None
+
+	def result(self, column: "Column", value):
+		return column.from_storage(value) if value is not None else None
+
+
+class Max(Min):
+	"""Largest value, of a number, date, boolean or text field"""
+
+	def compute(self, values: list):
+		return max(values) if values else None
+
+	def compute_array(self, values):
+		return values.max().item() if values.size else None
+
+
+def _vectorized(column: "Column") -> bool:
+	return numpy is not None and column.numpy_dtype is not None and len(column) > 0
+
+
+def _aggregate(aggregate: Aggregate, column: "Column", positions) -> object:
+	if column is None:
+		return len(positions)
+
+	if isinstance(column, CategoricalColumn) and isinstance(aggregate, Min):
+		# codes follow the order texts were first seen in, the distinct texts are compared instead
+		codes = {column.values[position] for position in positions if not column.nulls[position]}
+		return aggregate.compute([column.from_storage(code) for code in codes])
+
+	if _vectorized(column):
+		positions = numpy.asarray(positions, dtype=numpy.int64)
+		values = column_array(column)[positions]
+		values = values[~null_array(column)[positions]]
+		return aggregate.result(column, aggregate.compute_array(values))
+
+	values = [column.values[position] for position in positions if not column.nulls[position]]
+	return aggregate.result(column, aggregate.compute(values))
+
+
+def _columns_for(manager: "GModelManager", aggregates: dict, group_attrs: tuple = (), positions: list = None) -> tuple:
+	for name, aggregate in list(aggregates.items()):
+		if not isinstance(aggregate, Aggregate):
+			raise FieldException(f"{name} is not an aggregate")
+
+	attrs = list(group_attrs) + [aggregate.field for aggregate in aggregates.values() if aggregate.field]
+	# rows matched by an earlier read may go past the trailing empty cells of these columns
+	size = max(positions) + 1 if positions else 0
+	columns, size = manager._filter_columns(list(dict.fromkeys(attrs)), size)
+	for aggregate in aggregates.values():
+		if aggregate.field:
+			aggregate.check(columns[aggregate.field])
+	return columns, size
+
+
+def aggregate(manager: "GModelManager", aggregates: dict, row_indexes: list = None) -> dict:
+	"""Runs the aggregates on the typed columns, no entity is created
+
+	Args:
+		manager (GModelManager): Model manager
+		aggregates (dict): result name -> :class:`Aggregate`
+		row_indexes (list, optional): Sheet row numbers to aggregate, all the rows by default
+
+	Returns:
+		dict: result name -> value
+	"""
+	manager._setup_attrs()
+	first_row = manager._get_header_index() + 1
+	positions = None
+	if row_indexes is not None:
+		positions = [row_index - first_row for row_index in row_indexes]
+
+	columns, size = _columns_for(manager, aggregates, positions=positions)
+	if positions is None:
+		positions = range(size)
+
+	return {
+		name: _aggregate(aggregate, columns[aggregate.field] if aggregate.field else None, positions)
+		for name, aggregate in list(aggregates.items())
+	}
+
+
+def _groups(columns: dict, attrs: tuple, positions: list) -> dict:
+	"""Positions per group key, the key being a tuple of the group fields' values"""
+	column = columns[attrs[0]]
+	if len(attrs) == 1 and _vectorized(column) and not column.nulls.any() and positions:
+		positions = numpy.asarray(positions, dtype=numpy.int64)
+		keys, inverse = numpy.unique(column_array(column)[positions], return_inverse=True)
+		order = numpy.argsort(inverse, kind="stable")
+		bounds = numpy.cumsum(numpy.bincount(inverse))[:-1]
+		return {
+			(column.from_storage(key.item()),): group
+			for key, group in zip(keys, numpy.split(positions[order], bounds))
+		}
+
+	groups = dict()
+	for position in positions:
+		key = tuple(columns[attr].value(position) for attr in attrs)
+		try:
+			groups.setdefault(key, []).append(position)
+		except TypeError:
+			# lists can't be dict keys
+			key = tuple(tuple(value) if isinstance(value, list) else value for value in key)
+			groups.setdefault(key, []).append(position)
+	return groups
+
+
+def _group_sort_key(key: tuple):
+	return tuple((value is None, isinstance(value, str), "" if value is None else value) for value in key)
+
+
+class GroupBy(object):
+	"""Rows grouped by the values of one or more fields, see :meth:`aggregate`"""
+
+	def __init__(self, manager: "GModelManager", attrs: tuple, row_indexes: list = None):
+		if not attrs:
+			raise FieldException("group_by needs at least one field")
+		self._manager = manager
+		self._attrs = tuple(attrs)
+		self._row_indexes = row_indexes
+
+	def aggregate(self, **aggregates: Aggregate) -> list:
+		"""Runs the aggregates per group
+
+		Returns:
+			list: one dict per group, holding the group fields and the results, ordered by group
+		"""
+		manager = self._manager
+		manager._setup_attrs()
+		first_row = manager._get_header_index() + 1
+		positions = None
+		if self._row_indexes is not None:
+			positions = [row_index - first_row for row_index in self._row_indexes]
+
+		columns, size = _columns_for(manager, aggregates, self._attrs, positions)
+		if positions is None:
+			positions = list(range(size))
+
+		groups = _groups(columns, self._attrs, positions)
+		try:
+			keys = sorted(groups, key=_group_sort_key)
+		except TypeError:
+			keys = list(groups)
+
+		results = []
+		for key in keys:
+			group = groups[key]
+			result = dict(zip(self._attrs, key))
+			for name, aggregate in list(aggregates.items()):
+				result[name] = _aggregate(aggregate, columns[aggregate.field] if aggregate.field else None, group)
+			results.append(result)
+		return results
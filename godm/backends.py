@@ -0,0 +1,369 @@
+"""Storage backends, selected with ``Meta.backend``. Google Sheets is the default; local CSV, XLSX and Parquet
+files can back the same models for batch jobs without any network access::
+
+	class Users(GModel):
+		...
+
+		class Meta:
+			tab_name = "Users"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+			backend = CSVBackend("exports/users.csv")
+
+A backend opens a model's tab as a spreadsheet and a worksheet exposing the part of the gspread surface godm
+reads through, so the filter, decode and snapshot paths are the same whatever the storage. File backends are
+read-only and their version is the file's modification time, so ``refresh()`` notices a new export.
+"""
+import codecs
+import csv
+import gc
+import mmap
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from itertools import islice
+from operator import itemgetter
+
+from ._a1 import parse_range
+from ._auth import get_sheet, get_worksheet
+from .exceptions import ModelItemException
+from .field import DateField
+
+try:
+	import openpyxl
+except ImportError:
+	openpyxl = None
+
+try:
+	import pyarrow.parquet as parquet
+except ImportError:
+	parquet = None
+
+
+class Backend(object):
+	"""Where the rows of a model are stored"""
+
+	# whether the disk cache is worth it, see godm.set_cache_dir
+	cached = True
+
+	def open(self, meta) -> tuple:
+		"""Opens the tab of a model
+
+		Args:
+			meta: The model's ``Meta`` class
+
+		Returns:
+			tuple: (spreadsheet, worksheet)
+		"""
+		raise NotImplementedError
+
+
+class SheetsBackend(Backend):
+	"""Google Sheets, through gspread. Spreadsheets come from ``Meta.sheet_key`` or ``Meta.sheet_name``"""
+
+	def open(self, meta) -> tuple:
+		spreadsheet = get_sheet(getattr(meta, "sheet_name", "default"), getattr(meta, "sheet_key", None))
+		return spreadsheet, get_worksheet(spreadsheet, getattr(meta, "tab_name"))
+
+
+SHEETS = SheetsBackend()
+
+
+def backend_for(meta) -> Backend:
+	return getattr(meta, "backend", None) or SHEETS
+
+
+def cell_text(value, date_format: str = DateField.MM_DD_YYYY) -> str:
+	"""Text of a typed file value as Sheets would show it, which is what the fields parse"""
+	if value is None:
+		return ""
+	if isinstance(value, str):
+		return value
+	if isinstance(value, bool):
+		return "TRUE" if value else "FALSE"
+	if isinstance(value, float):
+		return str(int(value)) if value.is_integer() else str(value)
+	if isinstance(value, (datetime, date)):
+		return value.strftime(date_format)
+	if isinstance(value, time):
+		return value.isoformat()
+	return str(value)
+
+
+@contextmanager
+def _gc_paused():
+	"""Pauses the cyclic garbage collector while millions of row lists are built. They hold no cycles, but
+	every collection meanwhile would scan all of them again
+	"""
+	enabled = gc.isenabled()
+	gc.disable()
+	try:
+		yield
+	finally:
+		if enabled:
+			gc.enable()
+
+
+def _trimmed(row: list) -> list:
+	end = len(row)
+	while end and row[end - 1] == "":
+		end -= 1
+	return row[:end]
+
+
+class FileSpreadsheet(object):
+	"""Spreadsheet side of a local file, holding its single tab"""
+
+	def __init__(self, path: str):
+		self.path = os.path.abspath(path)
+		self.id = self.path
+		self.title = os.path.basename(path)
+		self.tab = None
+
+	def get_lastUpdateTime(self) -> str:
+		return str(os.stat(self.path).st_mtime_ns)
+
+	def worksheets(self) -> list:
+		return [self.tab]
+
+	def _read_only(self, *args, **kwargs):
+		raise ModelItemException(f"{self.title} is a read-only file backend")
+
+	values_batch_update = _read_only
+	batch_update = _read_only
+
+
+class FileTab(object):
+	"""Worksheet side of a local file. Subclasses yield its rows as lists of cell texts with :meth:`iter_rows`,
+	and every read is a single streaming pass over the file
+	"""
+
+	id = 0
+
+	def __init__(self, spreadsheet: FileSpreadsheet, title: str):
+		self.spreadsheet = spreadsheet
+		self.title = title
+		self.path = spreadsheet.path
+
+	def iter_rows(self, columns: list = None):
+		"""Yields the rows, the header row included
+
+		Args:
+			columns (list, optional): 0-based columns to read, the others are skipped. Defaults to all of them.
+		"""
+		raise NotImplementedError
+
+	def get_all_values(self) -> list:
+		with _gc_paused():
+			rows = list(self.iter_rows())
+		width = max((len(row) for row in rows), default=0)
+		for row in rows:
+			if len(row) < width:
+				row.extend([""] * (width - len(row)))
+		return rows
+
+	def row_values(self, row_index: int) -> list:
+		row = next(islice(self.iter_rows(), row_index - 1, row_index), [])
+		return _trimmed(list(row))
+
+	def col_values(self, col_index: int) -> list:
+		return _trimmed([row[0] for row in self.iter_rows([col_index - 1])])
+
+	def get(self, range_name: str) -> list:
+		return self.batch_get([range_name])[0]
+
+	def batch_get(self, ranges: list, **kwargs) -> list:
+		"""Values of several ranges in one pass, only over the columns they need when they all bound theirs"""
+		bounds = [parse_range(a1) for a1 in ranges]
+		columns = None
+		if all(end_col is not None for _, _, _, end_col in bounds):
+			columns = sorted({col for _, start_col, _, end_col in bounds for col in range(start_col - 1, end_col)})
+		last_row = None if any(end_row is None for _, _, end_row, _ in bounds) else max(end for _, _, end, _ in bounds)
+		slot = {col: position for position, col in enumerate(columns)} if columns is not None else None
+
+		first_row = min(start_row for start_row, _, _, _ in bounds)
+		with _gc_paused():
+			rows = list(islice(self.iter_rows(columns), first_row - 1, last_row))
+			return [self._range_values(rows, first_row, bound, slot) for bound in bounds]
+
+	@staticmethod
+	def _range_values(rows: list, first_row: int, bound: tuple, slot: dict) -> list:
+		"""Values of one range out of the rows read from ``first_row`` on"""
+		start_row, start_col, end_row, end_col = bound
+		selected = rows[start_row - first_row:None if end_row is None else end_row - first_row + 1]
+		if slot is None:
+			found = [_trimmed(row[start_col - 1:end_col]) for row in selected]
+		elif start_col == end_col:
+			position = slot[start_col - 1]
+			found = [[row[position]] if row[position] else [] for row in selected]
+		else:
+			positions = [slot[col] for col in range(start_col - 1, end_col)]
+			found = [_trimmed([row[position] for position in positions]) for row in selected]
+
+		# like the API, trailing empty rows are left out
+		while found and not found[-1]:
+			found.pop()
+		return found
+
+	def _read_only(self, *args, **kwargs):
+		raise ModelItemException(f"{self.spreadsheet.title} is a read-only file backend")
+
+	batch_update = _read_only
+	append_rows = _read_only
+	update = _read_only
+
+
+class FileBackend(Backend):
+	"""Backend over one local file, the tab title is ``Meta.tab_name``"""
+
+	cached = False
+	tab_class = FileTab
+
+	def __init__(self, path: str):
+		self.path = path
+
+	def open(self, meta) -> tuple:
+		spreadsheet = FileSpreadsheet(self.path)
+		spreadsheet.tab = self.tab(spreadsheet, getattr(meta, "tab_name", None) or spreadsheet.title)
+		return spreadsheet, spreadsheet.tab
+
+	def tab(self, spreadsheet: FileSpreadsheet, title: str) -> FileTab:
+		return self.tab_class(spreadsheet, title)
+
+
+class CSVTab(FileTab):
+
+	def __init__(self, spreadsheet: FileSpreadsheet, title: str, encoding: str, dialect: dict):
+		super(CSVTab, self).__init__(spreadsheet, title)
+		self.encoding = encoding
+		self.dialect = dialect
+
+	def iter_rows(self, columns: list = None):
+		with open(self.path, "rb") as file:
+			if os.fstat(file.fileno()).st_size == 0:
+				return
+			with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+				# decoded and parsed line by line, the file is never read as a whole
+				lines = codecs.iterdecode(iter(mapped.readline, b""), self.encoding)
+				rows = csv.reader(lines, **self.dialect)
+				if columns is None:
+					yield from rows
+					return
+
+				pick = itemgetter(*columns)
+				for row in rows:
+					try:
+						picked = pick(row)
+					except IndexError:
+						# a short row, its missing cells are empty
+						picked = tuple(row[col] if col < len(row) else "" for col in columns)
+					yield [picked] if len(columns) == 1 and not isinstance(picked, tuple) else list(picked)
+
+
+class CSVBackend(FileBackend):
+	"""Memory-mapped CSV file, parsed as it is streamed
+
+	Args:
+		path (str): File path
+		encoding (str, optional): Defaults to UTF-8, with or without a byte order mark.
+		**dialect: :func:`csv.reader` options, e.g. ``delimiter=";"``
+	"""
+
+	def __init__(self, path: str, encoding: str = "utf-8-sig", **dialect):
+		super(CSVBackend, self).__init__(path)
+		self.encoding = encoding
+		self.dialect = dialect
+
+	def tab(self, spreadsheet: FileSpreadsheet, title: str) -> FileTab:
+		return CSVTab(spreadsheet, title, self.encoding, self.dialect)
+
+
+class XLSXTab(FileTab):
+
+	def __init__(self, spreadsheet: FileSpreadsheet, title: str, sheet: str, date_format: str):
+		super(XLSXTab, self).__init__(spreadsheet, title)
+		self.sheet = sheet
+		self.date_format = date_format
+
+	def iter_rows(self, columns: list = None):
+		workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+		try:
+			names = workbook.sheetnames
+			worksheet = workbook[self.sheet if self.sheet in names else self.title if self.title in names else names[0]]
+			for values in worksheet.iter_rows(values_only=True):
+				if columns is None:
+					yield [cell_text(value, self.date_format) for value in values]
+				else:
+					yield [cell_text(values[col], self.date_format) if col < len(values) else "" for col in columns]
+		finally:
+			workbook.close()
+
+
+class XLSXBackend(FileBackend):
+	"""Excel workbook, read with openpyxl in read-only mode. Needs ``pip install godm[xlsx]``
+
+	Args:
+		path (str): File path
+		sheet (str, optional): Worksheet name. Defaults to ``Meta.tab_name`` when the workbook has it, else the first one.
+		date_format (str, optional): Format date cells are turned into text with, it should match the DateFields.
+			Defaults to ``DateField.MM_DD_YYYY``.
+	"""
+
+	def __init__(self, path: str, sheet: str = None, date_format: str = DateField.MM_DD_YYYY):
+		if openpyxl is None:
+			raise ImportError("XLSXBackend needs openpyxl, install godm[xlsx]")
+		super(XLSXBackend, self).__init__(path)
+		self.sheet = sheet
+		self.date_format = date_format
+
+	def tab(self, spreadsheet: FileSpreadsheet, title: str) -> FileTab:
+		return XLSXTab(spreadsheet, title, self.sheet, self.date_format)
+
+
+class ParquetTab(FileTab):
+
+	def __init__(self, spreadsheet: FileSpreadsheet, title: str, date_format: str):
+		super(ParquetTab, self).__init__(spreadsheet, title)
+		self.date_format = date_format
+
+	def iter_rows(self, columns: list = None):
+		parquet_file = parquet.ParquetFile(self.path, memory_map=True)
+		names = parquet_file.schema_arrow.names
+		wanted = list(range(len(names))) if columns is None else columns
+		present = [col for col in wanted if col < len(names)]
+
+		# the column names are the header row
+		yield [names[col] if col < len(names) else "" for col in wanted]
+
+		# only the wanted columns are decoded
+		for batch in parquet_file.iter_batches(columns=[names[col] for col in present]):
+			texts = [[cell_text(value, self.date_format) for value in column.to_pylist()] for column in batch.columns]
+			if len(present) == len(wanted):
+				yield from (list(row) for row in zip(*texts))
+				continue
+
+			by_col = dict(zip(present, texts))
+			empty = [""] * batch.num_rows
+			yield from (list(row) for row in zip(*[by_col.get(col, empty) for col in wanted]))
+
+
+class ParquetBackend(FileBackend):
+	"""Parquet file, memory-mapped and read with pyarrow one record batch at a time. Filters read only the
+	columns they need. The column names form the header row, so ``Meta.header_index`` is 1. Needs
+	``pip install godm[parquet]``
+
+	Args:
+		path (str): File path
+		date_format (str, optional): Format date values are turned into text with, it should match the
+			DateFields. Defaults to ``DateField.MM_DD_YYYY``.
+	"""
+
+	def __init__(self, path: str, date_format: str = DateField.MM_DD_YYYY):
+		if parquet is None:
+			raise ImportError("ParquetBackend needs pyarrow, install godm[parquet]")
+		super(ParquetBackend, self).__init__(path)
+		self.date_format = date_format
+
+	def tab(self, spreadsheet: FileSpreadsheet, title: str) -> FileTab:
+		return ParquetTab(spreadsheet, title, self.date_format)
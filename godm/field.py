@@ -1,4 +1,5 @@
 import json
+import logging
 from datetime import datetime
 from functools import update_wrapper, partial
 from typing import Callable
@@ -6,6 +7,8 @@ from typing import Callable
 from .exceptions import FieldException
 from .transformers import transform_invalid_ref_to_none, transform_na_to_none, transform_tags_to_tags
 
+logger = logging.getLogger(__name__)
+
 
 class Field(object):
 	class TransformDecorator(object):
@@ -38,7 +41,8 @@ class Field(object):
 			return partial(self.__call__, obj)
 
 	def __init__(self, name: str = None, index: int = -1, allow_empty_or_null: bool = False, default_val: object = None,
-	             pre_transform: list = None, post_transform: list = None, **others):
+	             pre_transform: list = None, post_transform: list = None, indexed: bool = False, unique: bool = False,
+	             **others):
 
 		if not pre_transform or not isinstance(pre_transform, list):
 			pre_transform = []
@@ -50,8 +54,11 @@ class Field(object):
 			"name": name, "index": index, "allow_empty_or_null": allow_empty_or_null, "default_val": default_val,
 			"pre_transform": [transform_invalid_ref_to_none, transform_na_to_none] + pre_transform,
 			"post_transform": post_transform,
+			"indexed": indexed, "unique": unique,
 			**others
 		})
+		# compiled decoder, see godm._decoder.decoder_for
+		self._decode = None
 
 	@property
 	def name(self):
@@ -67,7 +74,14 @@ class Field(object):
 
 		return return_value
 
+	def to_raw(self, value) -> str:
+		"""Inverse of :meth:`get_value`: the cell text to write for a value. Post transforms are not reversed"""
+		if value is None:
+			return ""
+		return str(value)
+
 	def validate(self, headers):
+		self._decode = None
 		name = self._meta.get("name")
 		index = self._meta.get("index")
 
@@ -109,7 +123,7 @@ class Field(object):
 	def __repr__(self):
 		data = dict()
 		for field_name, field_itself in self._meta.items():
-			field_value = field_itself.__name__ if type(field_itself).__name__ == "type" else field_itself
+			field_value = field_itself.__name__ if isinstance(field_itself, type) else field_itself
 			if isinstance(field_itself, list):
 				field_value = []
 				for transform in field_itself:
@@ -118,15 +132,19 @@ class Field(object):
 
 		return json.dumps(data)
 
-	def match_value(self, search_value, data_value, operator):
-		print(f"No match implementation found. Going default equal check. {self.name}")
-		return search_value == data_value
-
 
 class StringField(Field):
+	"""Text cell
 
-	def __init__(self, **kwargs):
+	Args:
+		categorical (bool, optional): Dictionary-encode the parsed column: each distinct text is kept once and
+			``eq``/``in`` lookups compare int codes, for columns repeating a few values (status, region). None, the
+			default, encodes it when it has few distinct values, False never does.
+	"""
+
+	def __init__(self, categorical: bool = None, **kwargs):
 		kwargs.setdefault("datatype", str)
+		kwargs.setdefault("categorical", categorical)
 
 		super().__init__(**kwargs)
 
@@ -160,13 +178,6 @@ class StringField(Field):
 
 		return str(value)
 
-	def match_value(self, search_value, data_value, operator):
-		if operator == "eq":
-			return search_value == data_value
-		elif operator == "ct":
-			return search_value in data_value
-
-		print(f"Invalid operator passed {operator} for field {self.name}")
 
 class IntegerField(Field):
 
@@ -191,20 +202,10 @@ class IntegerField(Field):
 		else:
 			return int(value)
 
-	def match_value(self, search_value, data_value, operator):
-		data_value = int(data_value)
-		if operator == "eq":
-			return search_value == data_value
-		elif operator == "lt":
-			return search_value < data_value
-		elif operator == "lte":
-			return search_value <= data_value
-		elif operator == "gt":
-			return search_value > data_value
-		elif operator == "gte":
-			return search_value >= data_value
-
-		print(f"Invalid operator passed {operator} for field {self.name}")
+	def to_raw(self, value) -> str:
+		if value is None:
+			return ""
+		return str(int(value))
 
 
 class DecimalField(Field):
@@ -230,20 +231,10 @@ class DecimalField(Field):
 		else:
 			return value
 
-	def match_value(self, search_value, data_value, operator):
-		data_value = float(data_value)
-		if operator == "eq":
-			return search_value == data_value
-		elif operator == "lt":
-			return search_value < data_value
-		elif operator == "lte":
-			return search_value <= data_value
-		elif operator == "gt":
-			return search_value > data_value
-		elif operator == "gte":
-			return search_value >= data_value
-
-		print(f"Invalid operator passed {operator} for field {self.name}")
+	def to_raw(self, value) -> str:
+		if value is None:
+			return ""
+		return str(float(value))
 
 
 class BooleanField(Field):
@@ -261,14 +252,16 @@ class BooleanField(Field):
 				return self._meta.get("default_val")
 			else:
 				FieldException("null or empty was found and no default is set")
-		return isinstance(value, str) and self.convert_to_val(value.lower)
+		return isinstance(value, str) and self.convert_to_val(value.lower())
 
 	def convert_to_val(self, value):
 		return any(key == value for key in ("t", "true", "ok", "yes", "y", "1"))
 
-	def match_value(self, search_value, data_value, operator):
-		data_value = self.convert_to_val(data_value.lower())
-		return search_value == data_value
+	def to_raw(self, value) -> str:
+		if value is None:
+			return ""
+		return "TRUE" if value else "FALSE"
+
 
 class DateField(Field):
 	DD_MM_YYYY = "%d/%m/%Y"
@@ -298,6 +291,11 @@ class DateField(Field):
 		else:
 			return value
 
+	def to_raw(self, value) -> str:
+		if isinstance(value, datetime):
+			return value.strftime(self._meta.get("date_format", DateField.MM_DD_YYYY))
+		return super(DateField, self).to_raw(value)
+
 
 class ListField(Field):
 
@@ -328,6 +326,11 @@ class ListField(Field):
 		final_list = [transform_method(item) for item in value_list]
 		return final_list
 
+	def to_raw(self, value) -> str:
+		if value is None:
+			return ""
+		return self._meta.get("delimiter", ",").join(str(item) for item in value)
+
 	def _to_int(self, val):
 		val = self._to_decimal(val)
 		return int(val)
@@ -346,8 +349,29 @@ class ListField(Field):
 		item_type = self._meta.get("item_type")
 		if item_type not in [int, float, str]:
 			self._meta.setdefault("item_type", str)
-			print(
-				f"Valid item_type options for ListFields are int, float, str, but given: {item_type}. Reset to default: str")
+			logger.warning(
+				"Valid item_type options for ListFields are int, float, str, but given: %s. Reset to default: str", item_type
+			)
+
+
+class ForeignKeyField(StringField):
+	"""Key of a row of another model: the cell holds the value of the target's ``to_field``. The value of the
+	field is the key itself, the target entity is read with ``entity.related(attr)`` or resolved for a whole
+	result set at once with ``select_related``
+
+	Args:
+		to: Target model class, or when it is declared later its class name, its ``module.qualname`` if other
+			models have the same name
+		to_field (str): Field attribute of the target the key refers to
+		related_name (str, optional): Name the referencing entities are prefetched under on the target entities
+	"""
+
+	def __init__(self, to, to_field: str, related_name: str = None, **kwargs):
+		kwargs.setdefault("to", to)
+		kwargs.setdefault("to_field", to_field)
+		kwargs.setdefault("related_name", related_name)
+
+		super(ForeignKeyField, self).__init__(**kwargs)
 
 
 class CustomField(Field):
@@ -0,0 +1,183 @@
+"""Events emitted by godm, with their timings, for logs and metrics.
+
+Listeners are callables getting an :class:`Event`. Nothing is measured while none is registered::
+
+	from godm import instrumentation
+
+	metrics = instrumentation.MetricsRegistry()
+	instrumentation.add_listener(metrics)
+	instrumentation.add_listener(instrumentation.LoggingListener())
+	...
+	print(metrics.render())
+
+Events:
+	``api_call``: every Sheets/Drive request: method, endpoint, range, status, bytes of the response. It also
+	carries the model and tab of the operation that made it
+	``load``: a model loaded, ``refresh``: a snapshot refreshed, ``batch_load``: the tabs of several models read
+	together, with the number of tabs and rows
+	``filter``, ``get``, ``query``: a manager filter/get or a QuerySet run, with the number of rows matched
+	``decode``: a column parsed, or a single cell decoded on first access, with the field type and the number of cells
+	``cache``: a cache lookup, with the cache name and whether it was a hit
+"""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_listeners = []
+_lock = threading.Lock()
+
+# model and tab of the operation running, added to the events emitted meanwhile (e.g. its API calls)
+_scope = contextvars.ContextVar("godm_scope", default=dict())
+
+
+class Event(object):
+	"""Something godm did
+
+	Attributes:
+		name (str): Event name, see the module docs
+		duration (float): Seconds it took, None for events without a duration
+		attributes (dict): Details, e.g. ``model``, ``tab``, ``rows``
+	"""
+
+	__slots__ = ("name", "duration", "attributes")
+
+	def __init__(self, name: str, duration: float = None, attributes: dict = None):
+		self.name = name
+		self.duration = duration
+		self.attributes = attributes or dict()
+
+	def __repr__(self):
+		return f"Event({self.name!r}, {self.duration!r}, {self.attributes!r})"
+
+
+def add_listener(listener) -> None:
+	"""Registers a callable that gets every :class:`Event`"""
+	with _lock:
+		_listeners.append(listener)
+
+
+def remove_listener(listener) -> None:
+	with _lock:
+		if listener in _listeners:
+			_listeners.remove(listener)
+
+
+def enabled() -> bool:
+	return bool(_listeners)
+
+
+def emit(name: str, duration: float = None, **attributes) -> None:
+	if not _listeners:
+		return
+
+	event = Event(name, duration, {**_scope.get(), **attributes})
+	for listener in list(_listeners):
+		try:
+			listener(event)
+		# a broken listener must not break the operation it observes
+		except Exception:
+			logger.exception("godm listener %r failed on %r", listener, event)
+
+
+@contextmanager
+def timed(name: str, **attributes):
+	"""Emits an event once the block is done, with its duration. The block can add attributes to the yielded
+	dict, e.g. the number of rows it matched. ``model`` and ``tab`` are passed on to the events emitted inside
+	"""
+	if not _listeners:
+		yield attributes
+		return
+
+	scope = {key: attributes[key] for key in ("model", "tab") if key in attributes}
+	token = _scope.set({**_scope.get(), **scope}) if scope else None
+	started = time.perf_counter()
+	try:
+		yield attributes
+	finally:
+		duration = time.perf_counter() - started
+		if token is not None:
+			_scope.reset(token)
+		emit(name, duration, **attributes)
+
+
+def cache_lookup(cache: str, hit: bool, **attributes) -> None:
+	emit("cache", cache=cache, hit=hit, **attributes)
+
+
+class LoggingListener(object):
+	"""Logs every event
+
+	Args:
+		logger (logging.Logger, optional): Defaults to the ``godm.instrumentation`` logger.
+		level (int, optional): Defaults to ``logging.DEBUG``.
+	"""
+
+	def __init__(self, logger: logging.Logger = None, level: int = logging.DEBUG):
+		self.logger = logger or logging.getLogger(__name__)
+		self.level = level
+
+	def __call__(self, event: Event):
+		if not self.logger.isEnabledFor(self.level):
+			return
+		details = " ".join(f"{key}={value}" for key, value in list(event.attributes.items()))
+		if event.duration is None:
+			self.logger.log(self.level, "%s %s", event.name, details)
+		else:
+			self.logger.log(self.level, "%s %.1fms %s", event.name, event.duration * 1000, details)
+
+
+class MetricsRegistry(object):
+	"""In-memory Prometheus style counters. Per event name and label set it counts
+	``godm_<event>_total``, sums ``godm_<event>_seconds_total`` and the ``bytes``/``rows``/``cells`` of the events
+	into ``godm_<event>_<attribute>_total``
+	"""
+
+	LABELS = ("model", "tab", "method", "status", "field_type", "cache", "hit")
+	SUMMED = ("bytes", "rows", "cells")
+
+	def __init__(self):
+		# (metric name, sorted label items) -> value
+		self.values = dict()
+		self._lock = threading.Lock()
+
+	def __call__(self, event: Event):
+		labels = tuple(sorted(
+			(key, str(value)) for key, value in list(event.attributes.items()) if key in self.LABELS
+		))
+		with self._lock:
+			self._add(f"godm_{event.name}_total", labels, 1)
+			if event.duration is not None:
+				self._add(f"godm_{event.name}_seconds_total", labels, event.duration)
+			for attr in self.SUMMED:
+				value = event.attributes.get(attr)
+				if isinstance(value, (int, float)):
+					self._add(f"godm_{event.name}_{attr}_total", labels, value)
+
+	def _add(self, metric: str, labels: tuple, value: float):
+		self.values[(metric, labels)] = self.values.get((metric, labels), 0) + value
+
+	def get(self, metric: str, **labels) -> float:
+		"""Value of a metric, summed over the label sets matching the given labels"""
+		labels = {key: str(value) for key, value in list(labels.items())}
+		return sum(
+			value for (name, label_items), value in list(self.values.items())
+			if name == metric and labels.items() <= dict(label_items).items()
+		)
+
+	def reset(self):
+		with self._lock:
+			self.values = dict()
+
+	def render(self) -> str:
+		"""Metrics in the Prometheus text exposition format"""
+		lines = []
+		for (metric, labels), value in sorted(self.values.items()):
+			label_text = ",".join(
+				'{}="{}"'.format(key, value.replace("\\", "\\\\").replace('"', '\\"')) for key, value in labels
+			)
+			lines.append(f"{metric}{{{label_text}}} {value}" if labels else f"{metric} {value}")
+		return "\n".join(lines) + "\n"
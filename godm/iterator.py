@@ -1,17 +1,24 @@
 from typing import TYPE_CHECKING
 
+from ._async import run_blocking
+from .aggregates import GroupBy, aggregate
 from .exceptions import InvalidIndexException
 
 if TYPE_CHECKING:
 	from ._manager import GModelManager
 
 
+DEFAULT_PREFETCH_SIZE = 100
+
+
 class GIterator:
 
-	def __init__(self, manager: "GModelManager", filter_list: list):
+	def __init__(self, manager: "GModelManager", filter_list: list, prefetch_size: int = DEFAULT_PREFETCH_SIZE):
 		self._manager = manager
 		self._filter_list = filter_list
 		self._start_index = 0
+		self._prefetch_size = prefetch_size
+		self._buffer = dict()
 
 	def __repr__(self):
 		return f"Model: <{self._manager.model.__name__}>. Items to iterate: {self._filter_list}. Current Position: {self._start_index}"
@@ -21,15 +28,66 @@ class GIterator:
 
 	def __next__(self):
 		if self._start_index < len(self._filter_list):
-			entity_obj = self._manager.get_entity_from_id(self._filter_list[self._start_index])
+			entity_obj = self._get_entity(self._start_index)
 			self._start_index += 1
 			return entity_obj
 		raise StopIteration
 
+	def __aiter__(self):
+		return self
+
+	async def __anext__(self):
+		if self._start_index >= len(self._filter_list):
+			raise StopAsyncIteration
+		return await run_blocking(self.__next__)
+
 	def __getitem__(self, index):
 		if not isinstance(index, int)or index < 0 or index >= len(self._filter_list):
 			raise InvalidIndexException()
-		return self._manager.get_entity_from_id(self._filter_list[index])
+		return self._get_entity(index)
+
+	def _get_entity(self, position):
+		row_index = self._filter_list[position]
+
+		if row_index not in self._buffer and self._prefetch_size > 1:
+			# keep only one chunk resident, the next one replaces it
+			chunk = self._filter_list[position:position + self._prefetch_size]
+			self._buffer = self._manager._fetch_rows(chunk)
+
+		return self._manager.get_entity_from_id(row_index, self._buffer.get(row_index))
+
+	def prefetch(self, size: int):
+		"""Sets how many matched rows are fetched together in one request while iterating
+
+		Args:
+			size (int): Rows per request. ``0`` or ``1`` fetches every row on its own
+
+		Returns:
+			GIterator: self, so it can be chained as ``filter(...).prefetch(200)``
+		"""
+		self._prefetch_size = size
+		self._buffer = dict()
+		return self
+
+	def update(self, **values) -> int:
+		"""Sets the field values on every matched row, with a single write request
+
+		Returns:
+			int: number of rows updated
+		"""
+		return self._manager.update_rows(self._filter_list, **values)
+
+	def aggregate(self, **aggregates) -> dict:
+		"""Aggregates the matched rows, e.g. ``aggregate(total=Sum("age"), n=Count())``
+
+		Returns:
+			dict: result name -> value
+		"""
+		return aggregate(self._manager, aggregates, self._filter_list)
+
+	def group_by(self, *fields: str) -> GroupBy:
+		"""Groups the matched rows, e.g. ``group_by("is_family").aggregate(n=Count())``"""
+		return GroupBy(self._manager, fields, self._filter_list)
 
 	def first(self):
 		return self.__getitem__(0)
@@ -2,18 +2,49 @@ import json
 import datetime
 from ._manager import GModelManager
 from ._meta import GModelMeta
+from ._relations import related_cache, resolve
 
 
 class GModel(object, metaclass=GModelMeta):
+	# _related holds the entities resolved through relations, it is only set once one is
+	__slots__ = ("_row_id", "_row", "_related")
+
 	manager = GModelManager
 
-	def __init__(self, data):
-		fields = data.get("fields", {})
+	def __init__(self, data: dict = None, **fields):
+		"""Creates an entity from field values, e.g. ``Users(name="Anil", age=35)``
+
+		Args:
+			data (dict, optional): Entity as a dict, the way entities used to be built: field values under
+				``fields``, the entity ``id`` and the raw row from :meth:`get_raw_data` under ``data``. Errors are
+				found from the row again
+			**fields: Field values, they take precedence over the ones in ``data``
+		"""
+		self._row_id = None
+		self._row = None
+		if data is not None:
+			if data.get("id") is not None:
+				self._row_id = data["id"] - 1
+			raw_data = data.get("data")
+			if raw_data:
+				self._row = tuple(raw_data[index] for index in sorted(key for key in raw_data if isinstance(key, int)))
+			fields = {**data.get("fields", {}), **fields}
+
 		for field, field_val in list(fields.items()):
 			setattr(self, field, field_val)
-		setattr(self, "id", data.get("id"))
-		setattr(self, "_data", data.get("data"))
-		setattr(self, "_errors", data.get("errors"))
+
+	@classmethod
+	def from_row(cls, row_id: int, row: tuple) -> "GModel":
+		"""Creates an entity over a sheet row. Field values are decoded from it on first access
+
+		Args:
+			row_id (int): Sheet row number
+			row (tuple): Raw cell values, shared as it is with the snapshot
+		"""
+		instance = cls.__new__(cls)
+		instance._row_id = row_id
+		instance._row = row
+		return instance
 
 	def __init_subclass__(cls, **kwargs):
 		return super(GModel).__init_subclass__(**kwargs)
@@ -21,6 +52,30 @@ class GModel(object, metaclass=GModelMeta):
 	def __repr__(self):
 		return json.dumps(self.to_json())
 
+	@property
+	def id(self):
+		if self._row_id is None:
+			return None
+		return self._row_id + 1
+
+	def save(self):
+		"""Appends the entity as a new row, or writes its changed fields back to its row"""
+		self.manager.save(self)
+		return self
+
+	def delete(self):
+		"""Deletes the entity's row. The entity keeps its values"""
+		self.manager.bulk_delete([self])
+
+	def related(self, name: str):
+		"""Entity a ForeignKeyField points at, or the list of entities pointing at this one for a
+		``related_name``. Resolved on first access unless ``select_related``/``prefetch_related`` did already
+		"""
+		cache = related_cache(self)
+		if name not in cache:
+			resolve([self], name)
+		return cache[name]
+
 	def to_json(self):
 		data = dict()
 		_meta = getattr(self, "_meta", {})
@@ -34,10 +89,18 @@ class GModel(object, metaclass=GModelMeta):
 		return data
 
 	def get_errors(self):
-		return getattr(self, "_errors", None)
+		errors = dict()
+		for field in getattr(self, "_meta", {}):
+			_, error = self.manager.decode_field(field, self._row_id, self._row)
+			if error is not None:
+				errors[field] = error
+
+		return errors
 
 	def get_raw_data(self):
-		return getattr(self, "_data")
+		if self._row is None:
+			return None
+		return self.manager.get_raw_data(self._row)
 
 	def get_raw_value(self, field):
 		all_fields = getattr(self, "_meta", {})
@@ -45,4 +108,4 @@ class GModel(object, metaclass=GModelMeta):
 		field_obj_meta = getattr(field_obj, "_meta", {})
 		field_column_name = field_obj_meta.get("name")
 
-		return self.get_raw_data().get(field_column_name)
+		return (self.get_raw_data() or {}).get(field_column_name)
@@ -0,0 +1,392 @@
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from ._columns import CellColumns, build_column, column_for
+from ._filter import (
+	cell_predicate, check_operator, column_mask, combine, negate, parse_lookup, positions, row_predicate, stored_search,
+	union,
+)
+from ._relations import resolve
+from .aggregates import GroupBy, aggregate
+from .exceptions import InvalidIndexException, ModelItemException
+from .field import CustomField
+from .iterator import GIterator
+
+if TYPE_CHECKING:
+	from ._columns import Column
+	from ._manager import GModelManager
+
+# below one candidate row in this many, the next lookups are checked row by row instead of over the whole column
+SCAN_RATIO = 8
+
+
+class Q(object):
+	"""Filter lookups that can be combined with ``&``, ``|`` and ``~``
+
+	Usage::
+
+		Users.manager.query().filter(Q(age__lt=18) | Q(is_family=True), ~Q(name="Anil"))
+	"""
+
+	AND = "and"
+	OR = "or"
+
+	def __init__(self, *children, **lookups):
+		self.connector = Q.AND
+		self.negated = False
+		# Q nodes and (lookup keyword, value) leaves
+		self.children = list(children) + list(lookups.items())
+
+	def _combine(self, other: "Q", connector: str) -> "Q":
+		node = Q(self, other)
+		node.connector = connector
+		return node
+
+	def __and__(self, other: "Q") -> "Q":
+		return self._combine(other, Q.AND)
+
+	def __or__(self, other: "Q") -> "Q":
+		return self._combine(other, Q.OR)
+
+	def __invert__(self) -> "Q":
+		node = Q(self)
+		node.negated = True
+		return node
+
+	def lookups(self) -> list:
+		"""Every (field attribute, operator, value) in the tree"""
+		found = []
+		for child in self.children:
+			if isinstance(child, Q):
+				found.extend(child.lookups())
+			else:
+				found.append(parse_lookup(child[0]) + (child[1],))
+		return found
+
+	def conjuncts(self) -> list:
+		"""Parts that must all match: the leaves and sub-trees of the top level AND nodes"""
+		if self.negated or self.connector != Q.AND:
+			return [self]
+
+		parts = []
+		for child in self.children:
+			if isinstance(child, Q):
+				parts.extend(child.conjuncts())
+			else:
+				parts.append(child)
+		return parts
+
+	def __repr__(self):
+		children = ", ".join(repr(child) for child in self.children)
+		return f"{'~' if self.negated else ''}Q({self.connector}: {children})"
+
+
+def _sort_tier(value) -> int:
+	# missing values go last, values kept aside as text (e.g. a default_val) after the typed ones, in both
+	# directions: only the values inside a tier are reversed
+	if value is None:
+		return 2
+	return 1 if isinstance(value, str) else 0
+
+
+class QuerySet(object):
+	"""Lazy query over a model. Filters, ordering and slicing only build the query, it runs when the results
+	are iterated, counted or indexed.
+
+	The planner starts from the indexes that fit the lookups, then evaluates the remaining lookups cheapest
+	column first. Once few rows are left, the next lookups are checked only on those rows. Without an ordering,
+	a slice or ``exists()`` scans row by row and stops as soon as enough rows matched.
+	"""
+
+	def __init__(self, manager: "GModelManager"):
+		self._manager = manager
+		self._where = Q()
+		self._ordering = ()
+		self._offset = 0
+		self._limit = None
+		self._fields = None
+		self._relations = ()
+
+	def _clone(self, **changes) -> "QuerySet":
+		query_set = QuerySet.__new__(QuerySet)
+		query_set.__dict__.update(self.__dict__)
+		query_set.__dict__.update(changes)
+		return query_set
+
+	def filter(self, *args: Q, **kwargs) -> "QuerySet":
+		return self._clone(_where=self._where & Q(*args, **kwargs))
+
+	def exclude(self, *args: Q, **kwargs) -> "QuerySet":
+		return self._clone(_where=self._where & ~Q(*args, **kwargs))
+
+	def order_by(self, *fields: str) -> "QuerySet":
+		"""Orders by the given fields, ``-`` in front of a field sorts it descending"""
+		return self._clone(_ordering=tuple(fields))
+
+	def values(self, *fields: str) -> "QuerySet":
+		"""Yields dicts of the given fields (all of them by default) instead of entities. Only those fields are
+		decoded
+		"""
+		return self._clone(_fields=tuple(fields) or tuple(getattr(self._manager.model, "_meta")))
+
+	def select_related(self, *fields: str) -> "QuerySet":
+		"""Resolves the given ForeignKeyFields of all the results at once, with one hash join per relation
+		against the target model, instead of one lookup per entity
+		"""
+		return self._clone(_relations=self._relations + tuple(fields))
+
+	def prefetch_related(self, *related_names: str) -> "QuerySet":
+		"""Resolves the entities of other models pointing at the results, by the ``related_name`` of their
+		ForeignKeyField, with one hash join per relation
+		"""
+		return self._clone(_relations=self._relations + tuple(related_names))
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			if (index.start or 0) < 0 or (index.stop is not None and index.stop < 0) or index.step not in (None, 1):
+				raise InvalidIndexException()
+
+			start = index.start or 0
+			offset = self._offset + start
+			limit = self._limit - start if self._limit is not None else None
+			if index.stop is not None:
+				stop_limit = max(index.stop - start, 0)
+				limit = stop_limit if limit is None else min(limit, stop_limit)
+			return self._clone(_offset=offset, _limit=max(limit, 0) if limit is not None else None)
+
+		if not isinstance(index, int) or index < 0:
+			raise InvalidIndexException()
+		results = list(self[index:index + 1])
+		if not results:
+			raise InvalidIndexException()
+		return results[0]
+
+	def __iter__(self):
+		return iter(self._results(*self._execute()))
+
+	def __len__(self):
+		return self.count()
+
+	def __repr__(self):
+		return f"<QuerySet {self._manager.model.__name__}: {self._where!r}>"
+
+	def count(self) -> int:
+		"""Number of matched rows, no entity is created"""
+		return len(self._row_ids())
+
+	def exists(self) -> bool:
+		"""Whether any row matches, the scan stops at the first one"""
+		return len(self[:1]._row_ids()) > 0
+
+	def first(self):
+		results = list(self[:1])
+		return results[0] if results else None
+
+	def last(self):
+		# missing values stay last in both directions, so the first of the reversed ordering isn't this one
+		row_ids, columns = self._execute()
+		if not row_ids:
+			return None
+		return list(self._results(row_ids[-1:], columns))[0]
+
+	def get(self, **kwargs):
+		results = list(self.filter(**kwargs)[:1])
+		if not results:
+			raise ModelItemException(f"Unable to find Entity {self._manager.model}, {kwargs}")
+		return results[0]
+
+	def aggregate(self, **aggregates) -> dict:
+		return aggregate(self._manager, aggregates, self._row_ids())
+
+	def group_by(self, *fields: str) -> GroupBy:
+		return GroupBy(self._manager, fields, self._row_ids())
+
+	def update(self, **values) -> int:
+		return self._manager.update_rows(self._row_ids(), **values)
+
+	def delete(self) -> int:
+		return self._manager.bulk_delete(GIterator(self._manager, self._row_ids()))
+
+	def _results(self, row_ids: list, columns: dict):
+		if self._fields is not None:
+			return self._project(row_ids, columns)
+		if not self._relations:
+			return GIterator(self._manager, row_ids)
+
+		entities = list(GIterator(self._manager, row_ids))
+		for name in self._relations:
+			resolve(entities, name)
+		return entities
+
+	def _order_attrs(self) -> list:
+		return [(field[1:], True) if field.startswith("-") else (field, False) for field in self._ordering]
+
+	def _columns(self, attrs: list, whole_tab: bool = False) -> tuple:
+		"""Columns for the attributes, see :meth:`godm._manager.GModelManager._filter_columns`"""
+		return self._manager._filter_columns(list(dict.fromkeys(attrs)), whole_tab=whole_tab)
+
+	def _blank_match(self) -> bool:
+		"""Whether a row of empty cells matches the filters, e.g. with ``exclude`` or ``~Q``. Such rows may lie past
+		the cells read for the filtered columns
+		"""
+		lookups = self._where.lookups()
+		if not lookups:
+			return False
+		fields = self._manager._lookup_fields([attr for attr, _, _ in lookups])
+		blank = {attr: build_column(field, [""]) for attr, field in list(fields.items())}
+		return bool(self._mask(self._where, blank, 1)[0])
+
+	def _row_ids(self) -> list:
+		return self._execute()[0]
+
+	def _execute(self) -> tuple:
+		"""Runs the query
+
+		Returns:
+			tuple: (matched row numbers, columns read for the query)
+		"""
+		manager = self._manager
+		manager._setup_attrs()
+
+		with manager._timed("query", lookups=",".join(attr for attr, _, _ in self._where.lookups())) as attributes:
+			row_ids, columns = self._run()
+			attributes["rows"] = len(row_ids)
+		return row_ids, columns
+
+	def _run(self) -> tuple:
+		manager = self._manager
+		meta = getattr(manager.model, "_meta")
+		attrs = [attr for attr, _, _ in self._where.lookups()] + [attr for attr, _ in self._order_attrs()]
+		if self._fields is not None:
+			# projected columns are read with the filtered ones in the same request
+			attrs += [attr for attr in self._fields if not isinstance(meta.get(attr), CustomField)]
+		columns, size = self._columns(attrs, whole_tab=self._blank_match())
+
+		matched = self._match(columns, size)
+		if self._ordering:
+			matched = self._order(list(matched), columns)
+			matched = matched[self._offset:None if self._limit is None else self._offset + self._limit]
+		elif self._limit is not None:
+			# limit pushdown, the lazy scan stops once enough rows matched
+			matched = list(islice(matched, self._offset, self._offset + self._limit))
+		else:
+			matched = list(matched)[self._offset:]
+
+		first_row = manager._get_header_index() + 1
+		return [first_row + position for position in matched], columns
+
+	def _part_attr(self, part) -> str:
+		return parse_lookup(part[0])[0] if not isinstance(part, Q) else None
+
+	def _cost(self, part, columns: dict) -> int:
+		if isinstance(part, Q):
+			# sub-trees are evaluated over whole columns
+			return 10
+		attr = self._part_attr(part)
+		if isinstance(columns, CellColumns) and not columns.parsed(attr):
+			return column_for(columns.fields[attr]).scan_cost
+		return columns[attr].scan_cost
+
+	def _match(self, columns: dict, size: int):
+		"""Matching positions, a lazy iterator when the query has a limit but no ordering"""
+		indexes = getattr(self._manager.model, "_indexes", None)
+
+		candidates = None
+		remaining = []
+		for part in self._where.conjuncts():
+			if isinstance(part, Q) or indexes is None:
+				remaining.append(part)
+				continue
+
+			attr, operator = parse_lookup(part[0])
+			index = indexes.find(attr, operator)
+			if index is None:
+				remaining.append(part)
+				continue
+
+			column = columns[attr]
+			check_operator(column, operator)
+			found = index.lookup(operator, stored_search(column, operator, part[1]), part[1])
+			if candidates is None:
+				candidates = found
+			else:
+				found = set(found)
+				candidates = [position for position in candidates if position in found]
+
+		remaining.sort(key=lambda part: self._cost(part, columns))
+
+		if self._limit is not None and not self._ordering:
+			checks = [self._row_check(part, columns, size) for part in remaining]
+			rows = candidates if candidates is not None else range(size)
+			return (position for position in rows if all(check(position) for check in checks))
+
+		for part in remaining:
+			if candidates is None or len(candidates) * SCAN_RATIO >= size:
+				mask = self._mask(part, columns, size)
+				if candidates is None:
+					candidates = positions(mask)
+				else:
+					candidates = [position for position in candidates if mask[position]]
+			else:
+				check = self._row_check(part, columns, size)
+				candidates = [position for position in candidates if check(position)]
+
+		return candidates if candidates is not None else range(size)
+
+	def _mask(self, part, columns: dict, size: int):
+		if not isinstance(part, Q):
+			attr, operator = parse_lookup(part[0])
+			return column_mask(columns[attr], operator, part[1])
+
+		masks = [self._mask(child, columns, size) for child in part.children]
+		mask = combine(masks, size) if part.connector == Q.AND else union(masks, size)
+		return negate(mask) if part.negated else mask
+
+	def _row_check(self, part, columns: dict, size: int):
+		if not isinstance(part, Q):
+			attr, operator = parse_lookup(part[0])
+			if isinstance(columns, CellColumns) and not columns.parsed(attr):
+				return cell_predicate(columns.fields[attr], columns.cells[attr], operator, part[1])
+			return row_predicate(columns[attr], operator, part[1])
+
+		mask = self._mask(part, columns, size)
+		return lambda position: bool(mask[position])
+
+	def _order(self, matched: list, columns: dict) -> list:
+		# one stable sort per field, the last field first
+		for attr, descending in reversed(self._order_attrs()):
+			column: "Column" = columns[attr]
+			tiers = ([], [], [])
+			for position in matched:
+				value = column.value(position)
+				tiers[_sort_tier(value)].append((value, position))
+
+			matched = []
+			for tier in tiers[:2]:
+				tier.sort(key=itemgetter(0), reverse=descending)
+				matched.extend(position for _, position in tier)
+			matched.extend(position for _, position in tiers[2])
+		return matched
+
+	def _project(self, row_ids: list, columns: dict) -> list:
+		manager = self._manager
+		meta = getattr(manager.model, "_meta")
+
+		first_row = manager._get_header_index() + 1
+		custom_attrs = [attr for attr in self._fields if isinstance(meta[attr], CustomField)]
+		rows = manager._fetch_rows(row_ids) if custom_attrs else dict()
+
+		results = []
+		for row_index in row_ids:
+			position = row_index - first_row
+			values = dict()
+			for attr in self._fields:
+				if attr in custom_attrs:
+					values[attr], _ = manager.decode_field(attr, row_index, rows.get(row_index))
+				elif isinstance(columns, CellColumns):
+					values[attr] = columns.value(attr, position)
+				else:
+					values[attr] = columns[attr].value(position)
+			results.append(values)
+		return results
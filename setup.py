@@ -27,6 +27,11 @@ setup(
 	author_email="dps.manit@gmail.com",
 	keywords=["spreadsheets", "google-spreadsheets", "object-data-model"],
 	install_requires=get_requirements(),
+	extras_require={
+		"numpy": ["numpy"],
+		"xlsx": ["openpyxl"],
+		"parquet": ["pyarrow"],
+	},
 	python_requires=">=3.4",
 	license="MIT",
 	packages=find_packages(),
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmark"))
+
+from fake_sheets import FakeSheets, install  # noqa: E402
+from godm import LoadPolicy, _relations  # noqa: E402
+from godm.field import BooleanField, DateField, IntegerField, StringField  # noqa: E402
+from godm.model import GModel  # noqa: E402
+
+USERS = [
+	["Name", "Age", "City", "Family", "Joined"],
+	["Devendra", "29", "Pune", "TRUE", "01/02/2020"],
+	["Anil", "35", "Delhi", "FALSE", "03/04/2019"],
+	["Sunita", "27", "Pune", "TRUE", "05/06/2021"],
+	["Ravi", "NA", "Agra", "FALSE", ""],
+	["Meena", "41", "Delhi", "TRUE", "07/08/2018"],
+]
+
+
+@pytest.fixture
+def registry():
+	"""Models declared by the test don't leak into the model registry of the next one"""
+	registered = dict(_relations._models)
+	yield
+	_relations._models.clear()
+	_relations._models.update(registered)
+
+
+@pytest.fixture
+def sheets(registry):
+	"""In-process fake Google Sheets holding a ``Test Sheet`` spreadsheet with a ``Users`` tab"""
+	fake = FakeSheets()
+	fake.add_spreadsheet("Test Sheet", {"Users": [list(row) for row in USERS]})
+	install(fake)
+	return fake
+
+
+def declare_users(**meta) -> type:
+	"""Model of the ``Users`` tab, loaded lazily. ``meta`` adds to or overrides its Meta attributes"""
+
+	class Users(GModel):
+		name = StringField(name="Name")
+		age = IntegerField(name="Age", allow_empty_or_null=True)
+		city = StringField(name="City")
+		is_family = BooleanField(name="Family")
+		joined = DateField(name="Joined", allow_empty_or_null=True)
+
+		Meta = type("Meta", (), dict(
+			dict(sheet_name="Test Sheet", tab_name="Users", header_index=1, load_policy=LoadPolicy.LAZY), **meta
+		))
+
+	return Users
+
+
+@pytest.fixture
+def users_model(sheets):
+	"""Declares a ``Users`` model over the fake spreadsheet, see :func:`declare_users`"""
+	return declare_users
+
+
+class InFlight(object):
+	"""Wraps the fake's call log to measure how many requests run at the same time"""
+
+	def __init__(self, sheets, latency: float = 0.02):
+		self.record, self.latency = sheets.calls.record, latency
+		self.running = self.most = 0
+		self.lock = threading.Lock()
+		sheets.calls.record = self
+
+	def __call__(self, name: str):
+		with self.lock:
+			self.running += 1
+			self.most = max(self.most, self.running)
+		time.sleep(self.latency)
+		self.record(name)
+		with self.lock:
+			self.running -= 1
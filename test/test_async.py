@@ -0,0 +1,49 @@
+import asyncio
+
+import godm
+from conftest import InFlight
+from godm.iterator import GIterator
+
+
+def test_aload_batches_tabs_of_a_spreadsheet(sheets, users_model):
+	sheets.add_spreadsheet("Shop", {"Users": [["Name"], ["Asha"]], "Orders": [["Name"], ["Kiran"]]})
+	Users = users_model(sheet_name="Shop", snapshot=True)
+	Orders = users_model(sheet_name="Shop", tab_name="Orders", snapshot=True)
+	sheets.calls.reset()
+
+	asyncio.run(godm.aload(Users, Orders))
+
+	assert Users.manager.setup and Orders.manager.setup
+	assert sheets.calls.counts["values_batch_get"] == 1
+
+
+def test_aload_loads_spreadsheets_concurrently(sheets, users_model):
+	sheets.add_spreadsheet("Other", {"Users": [["Name"], ["Asha"]]})
+	models = [users_model(), users_model(sheet_name="Other")]
+	in_flight = InFlight(sheets)
+
+	asyncio.run(godm.aload(*models))
+
+	assert all(model.manager.setup for model in models)
+	assert in_flight.most == 2
+
+
+def test_amanager(sheets, users_model):
+	Users = users_model(snapshot=True)
+
+	async def main():
+		await Users.amanager.load()
+		user = await Users.amanager.get(name="Sunita")
+		users = await Users.amanager.filter(city="Delhi")
+		return user, [user.name async for user in users]
+
+	user, names = asyncio.run(main())
+
+	assert user.age == 27
+	assert names == ["Anil", "Meena"]
+
+
+def test_amanager_filter_returns_an_iterator(sheets, users_model):
+	Users = users_model()
+
+	assert isinstance(asyncio.run(Users.amanager.filter(age__lt=30)), GIterator)
@@ -0,0 +1,42 @@
+import threading
+
+from google.auth.credentials import AnonymousCredentials
+
+from godm import _auth
+from godm._auth import PooledClient
+
+
+def in_thread(method):
+	result = []
+	thread = threading.Thread(target=lambda: result.append(method()))
+	thread.start()
+	thread.join()
+	return result[0]
+
+
+def test_every_thread_gets_its_own_session():
+	client = PooledClient(auth=AnonymousCredentials())
+	session = client.session
+
+	assert client.session is session
+	other = in_thread(lambda: client.session)
+	assert other is not session
+	assert in_thread(lambda: client.session) is not other
+
+
+def test_sessions_keep_a_connection_pool(monkeypatch):
+	monkeypatch.setattr(_auth, "_pool_size", 4)
+	client = PooledClient(auth=AnonymousCredentials())
+
+	adapter = in_thread(lambda: client.session).get_adapter("https://sheets.googleapis.com")
+	assert adapter._pool_maxsize == 4
+
+
+def test_spreadsheets_and_worksheets_are_opened_once(sheets):
+	spreadsheets = [in_thread(lambda: _auth.get_sheet("Test Sheet")) for _ in range(3)]
+	worksheets = [_auth.get_worksheet(spreadsheets[0], "Users") for _ in range(3)]
+
+	assert all(spreadsheet is spreadsheets[0] for spreadsheet in spreadsheets)
+	assert all(worksheet is worksheets[0] for worksheet in worksheets)
+	assert sheets.calls.counts["open"] == 1
+	assert sheets.calls.counts["worksheets"] == 1
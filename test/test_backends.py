@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from conftest import USERS, declare_users
+from godm.backends import CSVBackend, ParquetBackend, XLSXBackend
+from godm.exceptions import ModelItemException
+
+pytestmark = pytest.mark.usefixtures("registry")
+
+
+def write_csv(path, rows):
+	path.write_text("".join(",".join(row) + "\n" for row in rows))
+
+
+def write_xlsx(path, rows):
+	openpyxl = pytest.importorskip("openpyxl")
+	workbook = openpyxl.Workbook()
+	sheet = workbook.active
+	sheet.title = "Users"
+	for row in rows:
+		sheet.append(row)
+	workbook.save(path)
+
+
+def write_parquet(path, rows):
+	pa = pytest.importorskip("pyarrow")
+	pq = pytest.importorskip("pyarrow.parquet")
+	pq.write_table(pa.table({header: [row[index] for row in rows[1:]] for index, header in enumerate(rows[0])}), path)
+
+
+BACKENDS = [
+	pytest.param(write_csv, CSVBackend, "users.csv", id="csv"),
+	pytest.param(write_xlsx, XLSXBackend, "users.xlsx", id="xlsx"),
+	pytest.param(write_parquet, ParquetBackend, "users.parquet", id="parquet"),
+]
+
+
+@pytest.mark.parametrize("write, backend, file_name", BACKENDS)
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_file_backend_reads_like_a_sheet(tmp_path, write, backend, file_name, snapshot):
+	path = tmp_path / file_name
+	write(path, USERS)
+	Users = declare_users(backend=backend(str(path)), snapshot=snapshot)
+
+	assert [user.name for user in Users.manager.filter(city="Pune")] == ["Devendra", "Sunita"]
+	assert Users.manager.get(name="Anil").age == 35
+	assert Users.manager.get(name="Ravi").age is None
+	assert Users.manager.query().filter(age__gte=35).count() == 2
+
+
+@pytest.mark.parametrize("write, backend, file_name", BACKENDS)
+def test_file_backend_is_read_only(tmp_path, write, backend, file_name):
+	path = tmp_path / file_name
+	write(path, USERS)
+	Users = declare_users(backend=backend(str(path)), snapshot=True)
+	user = Users.manager.get(name="Anil")
+	user.age = 36
+
+	with pytest.raises(ModelItemException):
+		user.save()
+	with pytest.raises(ModelItemException):
+		user.delete()
+
+
+def test_csv_refresh_follows_the_file(tmp_path):
+	path = tmp_path / "users.csv"
+	write_csv(path, USERS)
+	Users = declare_users(backend=CSVBackend(str(path)), snapshot=True)
+	Users.manager.initialise_model()
+
+	assert Users.manager.refresh() == 0
+
+	stat = path.stat()
+	write_csv(path, USERS + [["Kiran", "31", "Goa", "TRUE", ""]])
+	os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+	assert Users.manager.refresh() == 1
+	assert Users.manager.get(name="Kiran").city == "Goa"
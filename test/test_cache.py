@@ -0,0 +1,84 @@
+import os
+import pickle
+
+import pytest
+from fake_sheets import install
+
+from godm import LoadPolicy, _cache
+from godm.backends import FileSpreadsheet
+from godm.field import StringField
+from godm.model import GModel
+
+
+def test_sheet_version_sees_edits_made_after_open(sheets):
+	spreadsheet = sheets.open("Test Sheet")
+	version = _cache.sheet_version(spreadsheet)
+
+	spreadsheet.tabs[0]._write(2, 2, [["30"]])
+
+	assert spreadsheet.lastUpdateTime == version
+	assert _cache.sheet_version(spreadsheet) != version
+	assert sheets.calls.counts["drive_files_get"] == 2
+
+
+def test_sheet_version_of_a_file_follows_its_modified_time(tmp_path):
+	path = tmp_path / "users.csv"
+	path.write_text("Name\nAnil\n")
+	spreadsheet = FileSpreadsheet(str(path))
+	version = _cache.sheet_version(spreadsheet)
+
+	stat = path.stat()
+	path.write_text("Name\nRavi\n")
+	os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+	assert _cache.sheet_version(spreadsheet) != version
+
+
+@pytest.fixture
+def cache(tmp_path):
+	_cache.set_cache_dir(str(tmp_path))
+	yield tmp_path
+	_cache.set_cache_dir(None)
+
+
+def test_snapshot_round_trip(cache):
+	values = [["Name", "Age"], ["Anil", "35"]]
+	_cache.write_snapshot("sheet", 0, 1, "7", values)
+
+	assert _cache.read_snapshot("sheet", 0, 1, "7") == values
+	assert _cache.read_snapshot("sheet", 0, 1, "8") is None
+	assert _cache.read_snapshot("sheet", 1, 1, "7") is None
+
+
+def test_snapshot_of_an_unknown_layout_is_ignored(cache):
+	with open(_cache._snapshot_path(str(cache), "sheet", 0, 1), "wb") as cache_file:
+		pickle.dump({"version": "7", "values": []}, cache_file)
+
+	assert _cache.read_snapshot("sheet", 0, 1, "7") is None
+
+
+def test_model_load_reuses_the_disk_cache(sheets, cache):
+	class Users(GModel):
+		name = StringField(name="Name")
+
+		class Meta:
+			sheet_name = "Test Sheet"
+			tab_name = "Users"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	Users.manager.initialise_model()
+	assert sheets.calls.counts["get_all_values"] == 1
+
+	# a restarted process
+	install(sheets)
+	Users.manager.reload_model()
+	assert sheets.calls.counts["get_all_values"] == 1
+	assert Users.manager.get(name="Anil").name == "Anil"
+
+	sheets.open("Test Sheet").tabs[0]._write(3, 1, [["Anil Kumar"]])
+	install(sheets)
+	Users.manager.reload_model()
+	assert sheets.calls.counts["get_all_values"] == 2
+	assert Users.manager.get(name="Anil Kumar").name == "Anil Kumar"
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from godm import LoadPolicy
+from godm._columns import CategoricalColumn
+from godm.field import DecimalField, ListField, StringField
+from godm.model import GModel
+
+TAGS = [["Name", "Tags", "Score"], ["a", "x, y", "1.5"], ["b", "", "2"], ["c", "y", "bad"]]
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_entities_decode_their_fields(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+
+	anil = Users.manager.get(name="Anil")
+	ravi = Users.manager.get(name="Ravi")
+
+	assert (anil.age, anil.is_family, anil.joined) == (35, False, datetime(2019, 3, 4))
+	assert (ravi.age, ravi.joined) == (None, None)
+
+
+def test_list_and_decimal_columns(sheets):
+	sheets.add_spreadsheet("Tags", {"Tags": [list(row) for row in TAGS]})
+
+	class Tagged(GModel):
+		name = StringField(name="Name")
+		tags = ListField(name="Tags", allow_empty_or_null=True)
+		score = DecimalField(name="Score")
+
+		class Meta:
+			sheet_name = "Tags"
+			tab_name = "Tags"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	assert Tagged.manager.get(name="a").tags == ["x", "y"]
+	assert [item.name for item in Tagged.manager.filter(tags__ct="y")] == ["a", "c"]
+	assert [item.name for item in Tagged.manager.filter(score__gt=1.6)] == ["b"]
+	assert "score" in Tagged.manager.get(name="c").get_errors()
+
+
+def test_categorical_column(sheets, users_model):
+	Users = users_model(snapshot=True)
+
+	class Cities(GModel):
+		name = StringField(name="Name")
+		city = StringField(name="City", categorical=True)
+
+		Meta = Users.Meta
+
+	Cities.manager.initialise_model()
+	column = Cities._columns.get("city")
+	assert isinstance(column, CategoricalColumn)
+	assert column.cardinality() == 3
+
+	assert [user.name for user in Cities.manager.filter(city="Pune")] == ["Devendra", "Sunita"]
+	assert [user.name for user in Cities.manager.filter(city__in=["Agra", "Goa"])] == ["Ravi"]
+	assert [user.name for user in Cities.manager.filter(city__ct="elh")] == ["Anil", "Meena"]
+	assert list(Cities.manager.filter(city="Goa")) == []
+
+	user = Cities.manager.get(name="Ravi")
+	user.city = "Goa"
+	user.save()
+	assert [user.name for user in Cities.manager.filter(city="Goa")] == ["Ravi"]
@@ -0,0 +1,16 @@
+from conftest import USERS
+
+
+def test_row_decoder_matches_the_field_getters(users_model):
+	Users = users_model()
+	Users.manager.initialise_model()
+	decoder, manager = Users._decoder, Users.manager
+
+	for row in USERS[1:]:
+		for attr, field in Users._meta.items():
+			try:
+				expected = field.get_value(manager.get_raw_data(row)), None
+			except Exception as ex:
+				expected = None, str(ex)
+			value, error = decoder.decode(attr, row)
+			assert (value, error is None) == (expected[0], expected[1] is None)
@@ -0,0 +1,35 @@
+from godm import LoadPolicy
+from godm.field import StringField
+from godm.model import GModel
+
+
+def test_indexes(sheets, users_model):
+	Users = users_model(snapshot=True, indexes=["age", "city"])
+	Users.manager.initialise_model()
+
+	assert Users._indexes.find("age", "gt") is not None
+	assert [user.name for user in Users.manager.filter(age__gt=30)] == ["Anil", "Meena"]
+	assert [user.name for user in Users.manager.filter(city="Delhi")] == ["Anil", "Meena"]
+
+	user = Users.manager.get(name="Anil")
+	user.city = "Pune"
+	user.save()
+	assert [user.name for user in Users.manager.filter(city="Pune")] == ["Devendra", "Anil", "Sunita"]
+
+
+def test_unique_index_reports_duplicates(sheets):
+	sheets.add_spreadsheet("Dupes", {"Items": [["Name"], ["a"], ["b"], ["a"]]})
+
+	class Items(GModel):
+		name = StringField(name="Name", unique=True)
+
+		class Meta:
+			sheet_name = "Dupes"
+			tab_name = "Items"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	Items.manager.initialise_model()
+
+	assert "name" in Items._errors
@@ -0,0 +1,48 @@
+import pytest
+
+from godm import instrumentation
+
+
+@pytest.fixture
+def metrics():
+	registry = instrumentation.MetricsRegistry()
+	instrumentation.add_listener(registry)
+	yield registry
+	instrumentation.remove_listener(registry)
+
+
+def test_manager_operations_are_measured(metrics, users_model):
+	Users = users_model(snapshot=True)
+
+	list(Users.manager.filter(city="Pune"))
+	Users.manager.get(name="Anil")
+	Users.manager.refresh()
+
+	assert metrics.get("godm_load_total", model="Users") == 1
+	assert metrics.get("godm_filter_rows_total", model="Users") == 2
+	assert metrics.get("godm_get_total", model="Users") == 1
+	assert metrics.get("godm_refresh_total", model="Users") == 1
+	assert metrics.get("godm_decode_total") > 0
+	assert 'godm_load_total{model="Users",tab="Users"} 1' in metrics.render()
+
+
+def test_lazy_field_decodes_are_measured(metrics, users_model):
+	user = users_model().manager.get(name="Anil")
+	metrics.reset()
+
+	assert (user.age, user.age) == (35, 35)
+
+	assert metrics.get("godm_decode_total", model="Users", field_type="IntegerField") == 1
+	assert metrics.get("godm_decode_cells_total", model="Users") == 1
+	assert metrics.get("godm_decode_seconds_total", model="Users") > 0
+
+
+def test_nothing_is_emitted_without_listeners(users_model):
+	events = []
+	instrumentation.add_listener(events.append)
+	instrumentation.remove_listener(events.append)
+
+	users_model(snapshot=True).manager.get(name="Anil")
+
+	assert not instrumentation.enabled()
+	assert events == []
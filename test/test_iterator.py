@@ -0,0 +1,39 @@
+import pytest
+
+from godm.exceptions import InvalidIndexException
+
+
+def test_rows_are_fetched_in_chunks(sheets, users_model):
+	Users = users_model()
+	users = Users.manager.filter(age__gte=0)
+	sheets.calls.reset()
+
+	assert [user.name for user in users.prefetch(2)] == ["Devendra", "Anil", "Sunita", "Meena"]
+	assert sheets.calls.counts == {"batch_get": 2}
+
+
+def test_default_chunk_fetches_all_matched_rows_at_once(sheets, users_model):
+	Users = users_model()
+	users = Users.manager.filter(city__in=["Pune", "Agra"])
+	sheets.calls.reset()
+
+	assert [user.name for user in users] == ["Devendra", "Sunita", "Ravi"]
+	assert sheets.calls.counts == {"batch_get": 1}
+
+
+def test_prefetch_off_fetches_row_by_row(sheets, users_model):
+	Users = users_model()
+	users = Users.manager.filter(city="Delhi").prefetch(1)
+	sheets.calls.reset()
+
+	assert [user.name for user in users] == ["Anil", "Meena"]
+	assert sheets.calls.total() == 2
+
+
+def test_indexing(users_model):
+	Users = users_model()
+	users = Users.manager.filter(city="Pune")
+
+	assert (users.first().name, users.last().name, users.nth(1).name, users.size()) == ("Devendra", "Sunita", "Sunita", 2)
+	with pytest.raises(InvalidIndexException):
+		users[2]
@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import godm
+from conftest import USERS, InFlight
+from godm import LoadPolicy, _warmup
+from godm.field import IntegerField, StringField
+from godm.model import GModel
+
+ORDERS = [["User", "Total"], ["Anil", "120"], ["Meena", "40"]]
+
+
+@pytest.fixture
+def shop(sheets, users_model):
+	"""Users and Orders models on two tabs of the ``Shop`` spreadsheet"""
+	sheets.add_spreadsheet("Shop", {"Users": [list(row) for row in USERS], "Orders": [list(row) for row in ORDERS]})
+	Users = users_model(sheet_name="Shop", snapshot=True)
+
+	class Orders(GModel):
+		user = StringField(name="User")
+		total = IntegerField(name="Total")
+
+		class Meta:
+			sheet_name = "Shop"
+			tab_name = "Orders"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	sheets.calls.reset()
+	return Users, Orders
+
+
+def test_load_all_reads_a_spreadsheet_with_one_batch_get(sheets, shop):
+	Users, Orders = shop
+
+	assert set(godm.load_all()) == {Users, Orders}
+
+	assert Users.manager.setup and Orders.manager.setup
+	assert sheets.calls.counts["values_batch_get"] == 1
+	assert sheets.calls.counts["get_all_values"] == 0
+	assert sheets.calls.counts["row_values"] == 0
+	assert Users.manager.get(name="Anil").age == 35
+	assert len(Orders.manager.all()) == 2
+
+
+def test_warmup_loads_spreadsheets_concurrently(sheets, users_model):
+	sheets.add_spreadsheet("Other", {"Users": [["Name"], ["Asha"]]})
+	models = [users_model(snapshot=True), users_model(sheet_name="Other", snapshot=True)]
+	in_flight = InFlight(sheets)
+
+	futures = godm.warmup(models)
+
+	assert all(future.done() for future in futures.values())
+	assert all(model.manager.setup for model in models)
+	assert in_flight.most == 2
+
+
+def test_init_load_policy(sheets, users_model):
+	Users = users_model(load_policy=LoadPolicy.INIT, snapshot=True)
+
+	assert Users.manager.setup
+	assert sheets.calls.counts["values_batch_get"] == 1
+	assert sheets.calls.counts["get_all_values"] == 0
+
+
+def test_background_load_policy(sheets, users_model):
+	Users = users_model(load_policy=LoadPolicy.BACKGROUND)
+
+	Users.manager.load_future.result(timeout=5)
+
+	assert Users.manager.setup
+	assert sheets.calls.counts["values_batch_get"] == 1
+	assert sheets.calls.counts["row_values"] == 0
+	assert Users.manager.get(name="Ravi").city == "Agra"
+
+
+def test_background_loads_of_a_spreadsheet_are_batched(sheets, users_model, monkeypatch):
+	sheets.add_spreadsheet("Staff", {"Users": [list(row) for row in USERS], "Former": [list(row) for row in USERS]})
+	# a busy pool, so both models are queued before their load starts
+	executor = ThreadPoolExecutor(max_workers=1)
+	started = threading.Event()
+	executor.submit(started.wait, 5)
+	monkeypatch.setattr(_warmup, "_executor", executor)
+
+	Users = users_model(sheet_name="Staff", load_policy=LoadPolicy.BACKGROUND, snapshot=True)
+	Former = users_model(sheet_name="Staff", tab_name="Former", load_policy=LoadPolicy.BACKGROUND, snapshot=True)
+	started.set()
+	Users.manager.load_future.result(timeout=5)
+	Former.manager.load_future.result(timeout=5)
+	executor.shutdown()
+
+	assert Users.manager.setup and Former.manager.setup
+	assert sheets.calls.counts["values_batch_get"] == 1
+	assert Former.manager.get(name="Anil").age == 35
@@ -0,0 +1,63 @@
+import pytest
+
+
+def test_fields_are_decoded_on_first_access(users_model):
+	Users = users_model(snapshot=True)
+	user = Users.manager.get(name="Anil")
+	descriptor = type(user).age
+
+	assert descriptor.peek(user) == (False, None)
+	assert user.age == 35
+	assert descriptor.peek(user) == (True, 35)
+
+
+def test_decoded_values_are_memoized(users_model, monkeypatch):
+	Users = users_model()
+	user = Users.manager.get(name="Anil")
+	decodes = []
+	decode_field = Users.manager.decode_field
+	monkeypatch.setattr(Users.manager, "decode_field", lambda *args: decodes.append(args[0]) or decode_field(*args))
+
+	assert (user.city, user.city, user.age) == ("Delhi", "Delhi", 35)
+	assert decodes == ["city", "age"]
+
+
+def test_assigned_values_are_not_decoded(users_model):
+	Users = users_model()
+	user = Users.manager.get(name="Anil")
+	user.age = 50
+
+	assert user.age == 50
+	assert Users(name="Kiran").name == "Kiran"
+	assert Users(name="Kiran").age is None
+
+
+def test_entities_can_still_be_built_from_a_dict(sheets, users_model):
+	Users = users_model(snapshot=True)
+	anil = Users.manager.get(name="Anil")
+
+	user = Users({"fields": {"city": "Goa"}, "id": anil.id, "data": anil.get_raw_data()})
+	assert (user.name, user.age, user.city) == ("Anil", 35, "Goa")
+	user.save()
+
+	assert sheets.open("Test Sheet").tabs[0].rows[2][:3] == ["Anil", "35", "Goa"]
+	assert Users({"fields": {"name": "Kiran"}}, age=31).save().id is not None
+	assert Users.manager.get(name="Kiran").age == 31
+
+
+def test_entities_are_slotted_records(users_model):
+	Users = users_model(snapshot=True)
+	user = Users.manager.get(name="Anil")
+
+	assert not hasattr(user, "__dict__")
+	assert "_value_age" in Users.__slots__
+	with pytest.raises(AttributeError):
+		user.nickname = "A"
+
+
+def test_entities_share_the_snapshot_rows(users_model):
+	Users = users_model(snapshot=True)
+	user = Users.manager.get(name="Anil")
+
+	assert user._row is Users._snapshot.rows[1]
+	assert user._row_id == 3
@@ -0,0 +1,118 @@
+import pytest
+
+from godm import Q
+from godm.aggregates import Avg, Count, Max, Min, Sum
+
+MODES = [pytest.param(False, id="live"), pytest.param(True, id="snapshot")]
+
+
+def names(entities) -> list:
+	return [entity.name for entity in entities]
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+@pytest.mark.parametrize("lookups, expected", [
+	({"city": "Pune"}, ["Devendra", "Sunita"]),
+	({"age__lt": 30}, ["Devendra", "Sunita"]),
+	({"age__gte": 35}, ["Anil", "Meena"]),
+	({"age__range": (28, 40)}, ["Devendra", "Anil"]),
+	({"city__in": ["Agra", "Delhi"]}, ["Anil", "Ravi", "Meena"]),
+	({"name__ct": "ni"}, ["Anil", "Sunita"]),
+	({"is_family": True, "city": "Delhi"}, ["Meena"]),
+])
+def test_filter_lookups(users_model, snapshot, lookups, expected):
+	Users = users_model(snapshot=snapshot)
+
+	assert names(Users.manager.filter(**lookups)) == expected
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_query_composition(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+	query = Users.manager.query()
+
+	assert names(query.filter(Q(city="Pune") | Q(age__gt=40))) == ["Devendra", "Sunita", "Meena"]
+	assert names(query.filter(~Q(city="Pune")).exclude(name="Ravi")) == ["Anil", "Meena"]
+	assert query.filter(is_family=True).count() == 3
+	assert query.filter(city="Goa").exists() is False
+	assert names(query.order_by("name")[1:3]) == ["Devendra", "Meena"]
+	assert list(query.filter(city="Agra").values("name", "age")) == [{"name": "Ravi", "age": None}]
+	assert query.order_by("name").first().name == "Anil"
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_negations_reach_rows_past_trailing_blank_cells(sheets, users_model, snapshot):
+	for row in sheets.open("Test Sheet").tabs[0].rows[4:]:
+		row[2] = ""
+	Users = users_model(snapshot=snapshot)
+	query = Users.manager.query()
+
+	assert names(query.exclude(city="Pune")) == ["Anil", "Ravi", "Meena"]
+	assert names(query.filter(~Q(city="Pune"), age__gte=0)) == ["Anil", "Meena"]
+	assert query.exclude(city="Pune").count() == 3
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_missing_values_sort_last_in_both_directions(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+	query = Users.manager.query()
+
+	assert names(query.order_by("age")) == ["Sunita", "Devendra", "Anil", "Meena", "Ravi"]
+	assert names(query.order_by("-age")) == ["Meena", "Anil", "Devendra", "Sunita", "Ravi"]
+	assert query.order_by("-age").last().name == "Ravi"
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_order_by_several_fields(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+
+	assert names(Users.manager.query().order_by("city", "-age")) == ["Ravi", "Meena", "Anil", "Devendra", "Sunita"]
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_aggregates(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+
+	assert Users.manager.aggregate(total=Sum("age"), n=Count(), ages=Count("age"), oldest=Max("age")) == {
+		"total": 132, "n": 5, "ages": 4, "oldest": 41,
+	}
+	assert Users.manager.filter(city="Pune").aggregate(avg=Avg("age"), first=Min("name")) == {
+		"avg": 28.0, "first": "Devendra",
+	}
+
+
+@pytest.mark.parametrize("snapshot", MODES)
+def test_group_by(users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+
+	assert Users.manager.query().group_by("is_family").aggregate(n=Count(), oldest=Max("age")) == [
+		{"is_family": False, "n": 2, "oldest": 35},
+		{"is_family": True, "n": 3, "oldest": 41},
+	]
+
+
+def test_stream(sheets, users_model):
+	Users = users_model()
+	Users.manager.initialise_model()
+	sheets.calls.reset()
+
+	assert names(Users.manager.stream(batch_rows=2, age__gte=29)) == ["Devendra", "Anil", "Meena"]
+	# the last window comes back empty
+	assert sheets.calls.counts == {"get": 4}
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_stream_goes_past_a_window_ending_in_blank_rows(sheets, users_model, prefetch):
+	sheets.open("Test Sheet").tabs[0].rows.insert(3, [])
+	Users = users_model()
+
+	assert names(Users.manager.stream(batch_rows=3, prefetch=prefetch, age__gte=29)) == ["Devendra", "Anil", "Meena"]
+
+
+def test_stream_filters_the_snapshot(sheets, users_model):
+	Users = users_model(snapshot=True)
+	Users.manager.initialise_model()
+	sheets.calls.reset()
+
+	assert names(Users.manager.stream(batch_rows=2, city="Delhi")) == ["Anil", "Meena"]
+	assert sheets.calls.total() == 0
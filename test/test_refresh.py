@@ -0,0 +1,88 @@
+from godm import LoadPolicy
+from godm.field import StringField
+from godm.model import GModel
+
+
+def test_refresh_sees_a_remote_edit(sheets, users_model):
+	Users = users_model(snapshot=True)
+	assert Users.manager.get(name="Anil").city == "Delhi"
+
+	sheets.open("Test Sheet").tabs[0]._write(3, 3, [["Agra"]])
+
+	assert Users.manager.refresh() == 1
+	assert Users.manager.get(name="Anil").city == "Agra"
+
+
+def test_refresh_skips_the_read_when_the_live_version_matches(sheets, users_model):
+	Users = users_model(snapshot=True)
+	Users.manager.initialise_model()
+	sheets.calls.reset()
+
+	assert Users.manager.refresh() == 0
+	assert sheets.calls.counts == {"drive_files_get": 1}
+
+
+def test_expired_snapshot_reads_the_tab_again(sheets, users_model):
+	Users = users_model(snapshot=True, snapshot_ttl=0)
+	Users.manager.initialise_model()
+
+	# an edit the version doesn't reflect yet
+	sheets.open("Test Sheet").tabs[0].rows[2][2] = "Agra"
+
+	assert Users.manager.refresh() == 0
+	assert Users.manager.get(name="Anil").city == "Agra"
+
+
+def stamped_model(sheets):
+	sheets.add_spreadsheet("Stamped", {"Items": [["Name", "Updated"]] + [[name, "1"] for name in "ABCDEFGH"]})
+
+	class Items(GModel):
+		name = StringField(name="Name")
+		updated = StringField(name="Updated")
+
+		class Meta:
+			sheet_name = "Stamped"
+			tab_name = "Items"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+			refresh_column = "updated"
+
+	Items.manager.initialise_model()
+	return Items
+
+
+def test_refresh_column_sees_deleted_rows(sheets):
+	Items = stamped_model(sheets)
+	spreadsheet = sheets.open("Stamped")
+	del spreadsheet.tabs[0].rows[1]
+	spreadsheet.touch()
+
+	Items.manager.refresh()
+
+	assert [item.name for item in Items.manager.all()] == list("BCDEFGH")
+
+
+def test_refresh_column_sees_inserted_rows(sheets):
+	Items = stamped_model(sheets)
+	spreadsheet = sheets.open("Stamped")
+	spreadsheet.tabs[0].rows.insert(1, ["Z", "2"])
+	spreadsheet.touch()
+
+	Items.manager.refresh()
+
+	assert [item.name for item in Items.manager.all()] == list("ZABCDEFGH")
+
+
+def test_refresh_column_reads_only_the_changed_rows(sheets):
+	Items = stamped_model(sheets)
+	spreadsheet = sheets.open("Stamped")
+	spreadsheet.tabs[0].rows[3] = ["C2", "2"]
+	spreadsheet.touch()
+	sheets.calls.reset()
+
+	assert Items.manager.refresh() == 1
+
+	assert sheets.calls.counts["get_all_values"] == 0
+	assert [item.name for item in Items.manager.all()] == ["A", "B", "C2", "D", "E", "F", "G", "H"]
+	assert Items.manager.get(updated="2").name == "C2"
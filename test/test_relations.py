@@ -0,0 +1,87 @@
+import pytest
+
+from godm import LoadPolicy, _relations
+from godm.exceptions import FieldException
+from godm.field import ForeignKeyField, IntegerField, StringField
+from godm.model import GModel
+
+ORDERS = [["User", "Total"], ["Anil", "120"], ["Meena", "40"], ["Anil", "15"], ["Nobody", "5"]]
+
+
+def users_model():
+	class Users(GModel):
+		name = StringField(name="Name")
+		city = StringField(name="City")
+
+		class Meta:
+			sheet_name = "Test Sheet"
+			tab_name = "Users"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	return Users
+
+
+def orders_model(to="Users"):
+	class Orders(GModel):
+		user = ForeignKeyField(to, "name", related_name="orders", name="User")
+		total = IntegerField(name="Total")
+
+		class Meta:
+			sheet_name = "Orders"
+			tab_name = "Orders"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+			snapshot = True
+
+	return Orders
+
+
+@pytest.fixture
+def orders(sheets):
+	sheets.add_spreadsheet("Orders", {"Orders": [list(row) for row in ORDERS]})
+	return sheets
+
+
+def test_select_related(orders):
+	users_model()
+	Orders = orders_model()
+
+	related = [order.related("user") for order in Orders.manager.query().select_related("user")]
+
+	assert [user.city if user else None for user in related] == ["Delhi", "Delhi", "Delhi", None]
+
+
+def test_prefetch_related(orders):
+	Users = users_model()
+	orders_model()
+
+	totals = {
+		user.name: [order.total for order in user.related("orders")]
+		for user in Users.manager.query().prefetch_related("orders")
+	}
+
+	assert totals["Anil"] == [120, 15]
+	assert totals["Meena"] == [40]
+	assert totals["Ravi"] == []
+
+
+def test_models_of_the_same_name_are_kept_apart(orders):
+	users_model()
+
+	class Users(GModel):
+		name = StringField(name="User")
+
+		class Meta:
+			sheet_name = "Orders"
+			tab_name = "Orders"
+			header_index = 1
+			load_policy = LoadPolicy.LAZY
+
+	assert _relations.model_for(_relations.model_key(Users)) is Users
+	with pytest.raises(FieldException):
+		_relations.model_for("Users")
+
+	Orders = orders_model(to="test_relations.users_model.<locals>.Users")
+	assert Orders.manager.get(total=40).related("user").city == "Delhi"
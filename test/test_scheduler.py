@@ -0,0 +1,105 @@
+import gspread
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from godm import _auth, _scheduler
+from godm._auth import PooledClient
+from godm._scheduler import ScheduledClient, Scheduler
+
+
+class FakeResponse(object):
+
+	def __init__(self, status_code: int, body: dict = None):
+		self.status_code = status_code
+		self.body = body or dict()
+		self.content = b"{}"
+		self.text = "{}"
+
+	@property
+	def ok(self):
+		return self.status_code < 400
+
+	def json(self):
+		if self.ok:
+			return self.body
+		return {"error": {"code": self.status_code, "message": "failed", "status": "FAILED"}}
+
+
+class FakeSession(object):
+	"""HTTP session answering with the queued status codes, then 200"""
+
+	def __init__(self, *statuses: int):
+		self.statuses = list(statuses)
+		self.sent = []
+
+	def mount(self, prefix, adapter):
+		pass
+
+	def _send(self, method, url, **kwargs):
+		self.sent.append((method, url))
+		return FakeResponse(self.statuses.pop(0) if self.statuses else 200)
+
+	def get(self, url, **kwargs):
+		return self._send("get", url, **kwargs)
+
+	def post(self, url, **kwargs):
+		return self._send("post", url, **kwargs)
+
+
+class RecordingScheduler(Scheduler):
+
+	def __init__(self, **limits):
+		super().__init__(**limits)
+		self.kinds = []
+
+	def _call(self, kind, function):
+		self.kinds.append(kind)
+		return super()._call(kind, function)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+	recording = RecordingScheduler()
+	monkeypatch.setattr(_scheduler, "_scheduler", recording)
+	monkeypatch.setattr(_scheduler, "backoff", lambda attempt: 0)
+	return recording
+
+
+def test_authenticate_builds_a_scheduled_client(monkeypatch):
+	monkeypatch.setattr(_auth, "_g_sheet", None)
+	monkeypatch.setattr(_auth.Credentials, "from_service_account_info", lambda info, scopes: AnonymousCredentials())
+
+	_auth.authenticate(key_object={"type": "service_account"})
+
+	assert isinstance(_auth._g_sheet, PooledClient)
+	assert isinstance(_auth._g_sheet, ScheduledClient)
+
+
+def test_requests_go_through_the_scheduler(scheduler):
+	session = FakeSession()
+	client = PooledClient(auth=None, session=session)
+
+	client.request("get", "https://sheets.googleapis.com/v4/spreadsheets/key")
+	client.request("post", "https://sheets.googleapis.com/v4/spreadsheets/key:batchUpdate", json={})
+
+	assert scheduler.kinds == ["read", "write"]
+	assert [method for method, _ in session.sent] == ["get", "post"]
+
+
+def test_throttled_read_is_retried(scheduler):
+	session = FakeSession(429, 503)
+	client = PooledClient(auth=None, session=session)
+
+	response = client.request("get", "https://sheets.googleapis.com/v4/spreadsheets/key")
+
+	assert response.status_code == 200
+	assert len(session.sent) == 3
+
+
+def test_failed_write_is_not_retried(scheduler):
+	session = FakeSession(500)
+	client = PooledClient(auth=None, session=session)
+
+	with pytest.raises(gspread.exceptions.APIError):
+		client.request("post", "https://sheets.googleapis.com/v4/spreadsheets/key:batchUpdate", json={})
+	assert len(session.sent) == 1
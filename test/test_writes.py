@@ -0,0 +1,141 @@
+import pytest
+
+import godm
+
+
+def tab_rows(sheets) -> list:
+	return sheets.open("Test Sheet").tabs[0].rows
+
+
+def test_session_types_cells_after_their_field(sheets, users_model):
+	Users = users_model(snapshot=True)
+	user = Users.manager.get(name="Anil")
+
+	with godm.session():
+		user.city = "000123"
+		user.age = 36
+		user.is_family = True
+		user.save()
+
+	assert tab_rows(sheets)[2][:4] == ["Anil", "36", "000123", "TRUE"]
+	assert sheets.calls.counts["batch_update"] == 1
+
+
+def test_save_keeps_number_like_text(sheets, users_model):
+	Users = users_model(snapshot=False)
+	user = Users.manager.get(name="Anil")
+	user.city = "0099"
+	user.age = 36
+	user.save()
+
+	Users.manager.bulk_create([Users(name="1/2", age=20, city="007", is_family=False)])
+
+	rows = tab_rows(sheets)
+	assert rows[2][:3] == ["Anil", "36", "0099"]
+	assert rows[-1][:3] == ["1/2", "20", "007"]
+	assert Users.manager.get(name="Anil").city == "0099"
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_save_round_trip(sheets, users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+	user = Users.manager.get(name="Sunita")
+	user.age = 28
+	user.save()
+
+	assert tab_rows(sheets)[3][1] == "28"
+	assert Users.manager.get(name="Sunita").age == 28
+	assert [user.name for user in Users.manager.filter(age=28)] == ["Sunita"]
+	assert Users.manager.refresh() == 0
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_bulk_create_and_delete_round_trip(sheets, users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+	created = Users.manager.bulk_create([
+		Users(name="Kiran", age=31, city="Pune", is_family=True),
+		Users(name="Asha", age=22, city="Agra", is_family=False),
+	])
+
+	assert [row[0] for row in tab_rows(sheets)[-2:]] == ["Kiran", "Asha"]
+	assert sheets.calls.counts["append_rows"] == 1
+	assert created[0].id is not None
+	assert Users.manager.get(name="Asha").city == "Agra"
+
+	Users.manager.get(name="Anil").delete()
+
+	assert "Anil" not in [row[0] for row in tab_rows(sheets)]
+	assert sorted(user.name for user in Users.manager.filter(city="Delhi")) == ["Meena"]
+	assert Users.manager.get(name="Asha").city == "Agra"
+
+
+def test_updates_are_coalesced(sheets, users_model):
+	Users = users_model(snapshot=True)
+	Users.manager.initialise_model()
+	sheets.calls.reset()
+
+	assert Users.manager.update_rows([2, 3, 4], city="Goa") == 3
+
+	assert sheets.calls.counts == {"values_batch_update": 1}
+	assert [row[2] for row in tab_rows(sheets)[1:4]] == ["Goa", "Goa", "Goa"]
+	assert Users.manager.query().filter(city="Goa").count() == 3
+
+
+def test_session_sends_everything_in_one_request(sheets, users_model):
+	Users = users_model(snapshot=True)
+	Users.manager.initialise_model()
+	sheets.calls.reset()
+
+	with godm.session():
+		for user in Users.manager.filter(city="Pune"):
+			user.age = user.age + 1
+		Users(name="Kiran", age=31, city="Agra", is_family=True).save()
+		Users.manager.get(name="Meena").delete()
+
+	assert sheets.calls.counts == {"batch_update": 1}
+	names = [row[0] for row in tab_rows(sheets)]
+	assert "Meena" not in names and names[-1] == "Kiran"
+	assert [user.age for user in Users.manager.filter(city="Pune")] == [30, 28]
+	assert Users.manager.get(name="Kiran").city == "Agra"
+
+
+def test_session_discards_writes_on_error(sheets, users_model):
+	Users = users_model(snapshot=True)
+	user = Users.manager.get(name="Anil")
+
+	with pytest.raises(RuntimeError):
+		with godm.session():
+			user.city = "Goa"
+			user.save()
+			raise RuntimeError
+
+	assert tab_rows(sheets)[2][2] == "Delhi"
+	assert sheets.calls.counts["batch_update"] == 0
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_session_keeps_the_last_write_made(sheets, users_model, snapshot):
+	Users = users_model(snapshot=snapshot)
+
+	with godm.session():
+		anil = Users.manager.get(name="Anil")
+		anil.age = 40
+		Users.manager.query().filter(name="Anil").update(age=50)
+		meena = Users.manager.get(name="Meena")
+		Users.manager.query().filter(name="Meena").update(age=50)
+		meena.age = 40
+
+	assert [tab_rows(sheets)[2][1], tab_rows(sheets)[5][1]] == ["50", "40"]
+	assert sheets.calls.counts["batch_update"] == 1
+
+
+def test_session_assignment_back_overrides_an_update(sheets, users_model):
+	Users = users_model(snapshot=True)
+
+	with godm.session():
+		user = Users.manager.get(name="Anil")
+		Users.manager.query().filter(name="Anil").update(age=50)
+		user.age = 35
+
+	assert tab_rows(sheets)[2][1] == "35"
+	assert Users.manager.get(name="Anil").age == 35